@@ -9,6 +9,9 @@ from pms.models import (
     CreditLimit,
     CreditLimitDetail,
     EbsCollectionDetail,
+    EbsCollectionSnapshot,
+    EbsCreditSnapshot,
+    EbsSyncWatermark,
     ExtraAttachment,
     Guarantee,
     Party,
@@ -16,6 +19,7 @@ from pms.models import (
     PartyDealing,
     SecurityCheque,
     ShipLocation,
+    Tombstone,
 )
 from recommendation_engine.models import ApprovalQueue
 
@@ -54,6 +58,11 @@ class EbsCollectionDetailInline(admin.TabularInline):
     extra = 0
 
 
+class EbsCollectionSnapshotInline(admin.TabularInline):
+    model = EbsCollectionSnapshot
+    extra = 0
+
+
 class AttachmentInline(admin.TabularInline):
     verbose_name_plural = "Attachments"
     show_change_link = True
@@ -163,12 +172,14 @@ class CreditLimitAdmin(admin.ModelAdmin):
         "updated_at",
         "stage",
         "status",
+        "ebs_pull_failed_at",
     )
     list_filter = ("status", "stage")
     search_fields = (
         "party_name",
         "witp_code",
     )
+    actions = ("retry_ebs_post_process",)
     inlines = (
         CreditLimitDetailInline,
         EbsCollectionDetailInline,
@@ -180,6 +191,15 @@ class CreditLimitAdmin(admin.ModelAdmin):
             obj.created_by = request.user
         return super().save_model(request, obj, form, change)
 
+    @admin.action(description="Retry the EBS post process")
+    def retry_ebs_post_process(self, request, queryset):
+        from .tasks import run_credit_limit_post_process
+
+        failed = queryset.filter(ebs_pull_failed_at__isnull=False)
+        for crl in failed:
+            run_credit_limit_post_process.delay(crl_id=crl.id)
+        self.message_user(request, f"Re-queued {len(failed)} application(s).")
+
 
 @admin.register(ShipLocation)
 class ShipLocationAdmin(admin.ModelAdmin):
@@ -208,3 +228,32 @@ class ShipLocationAdmin(admin.ModelAdmin):
         if not change:
             obj.created_by = request.user
         return super().save_model(request, obj, form, change)
+
+
+@admin.register(EbsCreditSnapshot)
+class EbsCreditSnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "witp_code",
+        "party_name",
+        "grade",
+        "customer_status",
+        "max_due_days",
+        "synced_at",
+    )
+    list_filter = ("grade", "customer_status")
+    search_fields = (
+        "witp_code",
+        "party_name",
+    )
+    inlines = (EbsCollectionSnapshotInline,)
+
+
+@admin.register(EbsSyncWatermark)
+class EbsSyncWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_update_date", "synced_at")
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ("content_type", "object_id", "deleted_at")
+    list_filter = ("content_type",)
@@ -0,0 +1,241 @@
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from itertools import product
+from typing import Any, Callable, Dict, List, Tuple
+
+import oracledb
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services.oracle_client import init_oracle_client
+
+from ...services import ebs_fetch
+from ...services.credit_limit_services import (
+    PARTY_STATUS_WINDOW_DAYS,
+    CreditLimitService,
+)
+from ...services.sql_query import (
+    max_invoice_day_count_sql,
+    party_addresses_sql,
+    party_collections_sql,
+    party_default_addr_sql,
+    party_grading_sql,
+    party_master_sql,
+    party_status_sql,
+)
+from ...views.ebs_collection_query import COLLECTION_QUERY_STR
+from ...views.ebs_party import PARY_BASIC_INFORMATION_QUERY
+
+ROUND_TRIPS_SQL = """
+SELECT MS.VALUE
+  FROM V$MYSTAT MS, V$STATNAME SN
+ WHERE MS.STATISTIC# = SN.STATISTIC#
+   AND SN.NAME = 'SQL*Net roundtrips to/from client'
+"""
+
+
+def _witp_code(options) -> Dict[str, Any]:
+    return {"witp_code": options["witp_code"]}
+
+
+def _party_id(options) -> Dict[str, Any]:
+    return {"party_id": options["party_id"]}
+
+
+def _party_status(options) -> Dict[str, Any]:
+    end_date = timezone.localdate()
+    start_date = end_date - timedelta(days=PARTY_STATUS_WINDOW_DAYS)
+    return {
+        "WITP_CODE": options["witp_code"],
+        "P_START_DATE": CreditLimitService.get_orcl_date_format(start_date),
+        "P_END_DATE": CreditLimitService.get_orcl_date_format(end_date),
+    }
+
+
+# the named single party queries, with the binds they are replayed with
+QUERIES: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+    "party_grading": (party_grading_sql, _witp_code),
+    "max_inv_due_count": (max_invoice_day_count_sql, _witp_code),
+    "party_status": (party_status_sql, _party_status),
+    "party_default_addr": (party_default_addr_sql, _witp_code),
+    "basic_party": (PARY_BASIC_INFORMATION_QUERY, _witp_code),
+    "party_master": (party_master_sql, _party_id),
+    "party_addresses": (party_addresses_sql, _witp_code),
+    "party_collections": (party_collections_sql, _witp_code),
+    "party_collection_ledger": (COLLECTION_QUERY_STR, _witp_code),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the named EBS queries with different fetch settings and report the "
+        "round trips, latency & python memory of each, to tune EBS_FETCH_PROFILES. "
+        "Runs against EBS_CONN_PARAMS, or against a local stand-in with --dsn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            choices=sorted(QUERIES),
+            help="query to replay, repeat it for more (all by default)",
+        )
+        parser.add_argument("--witp-code", default="")
+        parser.add_argument("--party-id", type=int, default=0)
+        parser.add_argument(
+            "--arraysize",
+            type=int,
+            nargs="+",
+            help="values to try (the configured profile by default)",
+        )
+        parser.add_argument(
+            "--prefetchrows",
+            type=int,
+            nargs="+",
+            help="values to try (the configured profile by default)",
+        )
+        parser.add_argument(
+            "--stmtcachesize",
+            type=int,
+            nargs="+",
+            help="values to try (EBS_POOL_STMT_CACHE_SIZE by default)",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="warm runs after the first one"
+        )
+        parser.add_argument("--dsn", help="local stand-in, e.g. localhost/FREEPDB1")
+        parser.add_argument("--user")
+        parser.add_argument("--password")
+
+    def connect(self, options, stmtcachesize: int) -> oracledb.Connection:
+        init_oracle_client()
+        if options["dsn"]:
+            return oracledb.connect(
+                user=options["user"],
+                password=options["password"],
+                dsn=options["dsn"],
+                stmtcachesize=stmtcachesize,
+            )
+        return oracledb.connect(
+            **settings.EBS_CONN_PARAMS, stmtcachesize=stmtcachesize
+        )
+
+    @staticmethod
+    def round_trips(connection: oracledb.Connection) -> int | None:
+        """round trips of the session so far, ``None`` without access to V$MYSTAT"""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(ROUND_TRIPS_SQL)
+                return int(cursor.fetchone()[0])
+        except oracledb.DatabaseError:
+            return None
+
+    def run_once(
+        self,
+        connection: oracledb.Connection,
+        sql: str,
+        binds: Dict[str, Any],
+        profile: Dict[str, int],
+        overhead: int,
+    ) -> Dict[str, Any]:
+        before = self.round_trips(connection)
+        tracemalloc.start()
+        started = time.perf_counter()
+        with ebs_fetch.tune(connection.cursor(), profile) as cursor:
+            cursor.execute(sql, **binds)
+            rows = len(cursor.fetchall())
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        after = self.round_trips(connection)
+        round_trips = None
+        if before is not None and after is not None:
+            round_trips = after - before - overhead
+        return {
+            "rows": rows,
+            "ms": elapsed_ms,
+            "peak_kb": peak / 1024,
+            "round_trips": round_trips,
+        }
+
+    def measure(
+        self,
+        options,
+        name: str,
+        profile: Dict[str, int],
+        stmtcachesize: int,
+    ) -> Dict[str, Any]:
+        sql, get_binds = QUERIES[name]
+        binds = get_binds(options)
+        with self.connect(options, stmtcachesize) as connection:
+            # round trips of reading the statistic itself
+            first_read = self.round_trips(connection)
+            second_read = self.round_trips(connection)
+            overhead = 0
+            if first_read is not None and second_read is not None:
+                overhead = second_read - first_read
+
+            cold = self.run_once(connection, sql, binds, profile, overhead)
+            warm = [
+                self.run_once(connection, sql, binds, profile, overhead)
+                for _ in range(options["repeat"])
+            ]
+        return {"cold": cold, "warm": warm}
+
+    def report(self, name: str, profile, stmtcachesize: int, result) -> None:
+        cold, warm = result["cold"], result["warm"] or [result["cold"]]
+        round_trips = warm[-1]["round_trips"]
+        self.stdout.write(
+            f"{name:<24} {profile['arraysize']:>9} {profile['prefetchrows']:>12} "
+            f"{stmtcachesize:>13} {cold['rows']:>7} "
+            f"{'n/a' if round_trips is None else round_trips:>11} "
+            f"{cold['ms']:>9.1f} {statistics.median(r['ms'] for r in warm):>9.1f} "
+            f"{max(r['peak_kb'] for r in warm):>9.1f}"
+        )
+
+    def profiles(self, name: str, options) -> List[Dict[str, int]]:
+        configured = ebs_fetch.get_profile(name)
+        arraysizes = options["arraysize"] or [configured["arraysize"]]
+        prefetchrows = options["prefetchrows"] or [configured["prefetchrows"]]
+        return [
+            {"arraysize": arraysize, "prefetchrows": prefetch}
+            for arraysize, prefetch in product(arraysizes, prefetchrows)
+        ]
+
+    def handle(self, *args, **options):
+        names = options["query"] or list(QUERIES)
+        if not options["witp_code"] and any(
+            QUERIES[name][1] is not _party_id for name in names
+        ):
+            raise CommandError("--witp-code is required by the selected queries.")
+        if not options["party_id"] and "party_master" in names:
+            raise CommandError("--party-id is required by party_master.")
+        if options["dsn"] and not options["user"]:
+            raise CommandError("--user is required with --dsn.")
+
+        stmtcachesizes = options["stmtcachesize"] or [
+            settings.EBS_POOL_STMT_CACHE_SIZE
+        ]
+        self.stdout.write(
+            f"{'query':<24} {'arraysize':>9} {'prefetchrows':>12} "
+            f"{'stmtcachesize':>13} {'rows':>7} {'round trips':>11} "
+            f"{'cold ms':>9} {'warm ms':>9} {'peak KiB':>9}"
+        )
+        for name in names:
+            for profile in self.profiles(name, options):
+                for stmtcachesize in stmtcachesizes:
+                    try:
+                        result = self.measure(options, name, profile, stmtcachesize)
+                    except oracledb.Error as exc:
+                        self.stderr.write(f"{name}: {exc}")
+                        continue
+                    self.report(name, profile, stmtcachesize, result)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "round trips are per warm run, warm ms the median of --repeat runs; "
+                "peak KiB only counts python allocations (thin mode)."
+            )
+        )
@@ -0,0 +1,152 @@
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.renderer import CustomRenderer
+from core.services import fast_json
+from core.services.streaming import JSON, streaming_page_response
+
+from ...models import Party
+from ...serializers.party import PartySerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Render a page of serialized parties with the default and the fast (orjson) "
+        "path of CustomRenderer, check both produce the same bytes and report the "
+        "render time of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, default=5000, help="parties in the rendered page"
+        )
+        parser.add_argument("--rounds", type=int, default=10)
+        parser.add_argument(
+            "--memory",
+            action="store_true",
+            help="compare the peak memory of a rendered page & of a streamed one",
+        )
+
+    def page(self, size: int) -> Dict[str, Any]:
+        parties = list(Party.objects.order_by("-id")[:size])
+        if not parties:
+            raise CommandError("No party to serialize.")
+        results = PartySerializer(parties, many=True).data
+        # repeat the rows up to the requested size
+        results = [results[index % len(results)] for index in range(size)]
+        return {
+            "page_size": size,
+            "total_objects": size,
+            "total_pages": 1,
+            "current_page": 1,
+            "next": None,
+            "previous": None,
+            "results": results,
+        }
+
+    @staticmethod
+    def measure(render: Callable[[], bytes], rounds: int) -> List[float]:
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def parties(self, size: int) -> List[Party]:
+        parties = list(Party.objects.order_by("-id")[:size])
+        if not parties:
+            raise CommandError("No party to serialize.")
+        return [parties[index % len(parties)] for index in range(size)]
+
+    @staticmethod
+    def peak_mb(run: Callable[[], Any]) -> float:
+        tracemalloc.start()
+        try:
+            run()
+            return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
+
+    def compare_memory(self, size: int) -> None:
+        parties = self.parties(size)
+        context = {"response": Response(status=status.HTTP_200_OK)}
+        chunk_size = settings.LIST_STREAM_CHUNK_SIZE
+
+        def _rendered():
+            results = PartySerializer(parties, many=True).data
+            CustomRenderer().render({"results": results}, renderer_context=context)
+
+        def _streamed():
+            serializer = PartySerializer()
+
+            def batches():
+                for start in range(0, len(parties), chunk_size):
+                    chunk = parties[start : start + chunk_size]
+                    yield [serializer.to_representation(party) for party in chunk]
+
+            response = streaming_page_response(batches(), JSON, lambda: {})
+            for _ in response.streaming_content:
+                pass
+            response.close()
+
+        self.stdout.write(f"{'page':<10} {'peak mb':>9}")
+        for name, run in (("rendered", _rendered), ("streamed", _streamed)):
+            self.stdout.write(f"{name:<10} {self.peak_mb(run):>9.1f}")
+
+    def handle(self, *args, **options):
+        if options["memory"]:
+            self.compare_memory(options["size"])
+            return
+        if not fast_json.is_available():
+            raise CommandError("orjson is not installed.")
+
+        data = self.page(options["size"])
+        context = {"response": Response(status=status.HTTP_200_OK)}
+        renderers = {
+            "default": CustomRenderer(),
+            "fast": CustomRenderer(),
+        }
+        renderers["default"].fast = False
+        renderers["fast"].fast = True
+
+        outputs = {
+            name: renderer.render(data, renderer_context=context)
+            for name, renderer in renderers.items()
+        }
+        if outputs["default"] != outputs["fast"]:
+            raise CommandError("The fast path renders different bytes.")
+
+        self.stdout.write(
+            f"{'renderer':<10} {'median ms':>10} {'max ms':>10} {'size kb':>9}"
+        )
+        medians = {}
+        for name, renderer in renderers.items():
+            timings = self.measure(
+                lambda: renderer.render(data, renderer_context=context),
+                options["rounds"],
+            )
+            medians[name] = statistics.median(timings)
+            self.stdout.write(
+                f"{name:<10} {medians[name]:>10.1f} {max(timings):>10.1f} "
+                f"{len(outputs[name]) / 1024:>9.0f}"
+            )
+
+        cache_info = fast_json.camelize_key.cache_info()
+        self.stdout.write(
+            f"\ncamelCase keys memo: {cache_info.currsize} keys, {cache_info.hits} "
+            f"hits, {cache_info.misses} misses."
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Same output, fast path {medians['default'] / medians['fast']:.1f}x "
+                "faster."
+            )
+        )
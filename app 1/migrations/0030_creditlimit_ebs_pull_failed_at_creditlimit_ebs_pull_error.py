@@ -0,0 +1,22 @@
+# Generated by Django 5.1 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pms", "0029_alter_creditlimit_status_alter_party_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="creditlimit",
+            name="ebs_pull_failed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="creditlimit",
+            name="ebs_pull_error",
+            field=models.CharField(blank=True, max_length=500, null=True),
+        ),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 5.1 on 2026-10-18 11:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pms", "0030_creditlimit_ebs_pull_failed_at_creditlimit_ebs_pull_error"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EbsCreditSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("witp_code", models.CharField(max_length=255, unique=True)),
+                (
+                    "party_name",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "is_all_doc_up",
+                    models.CharField(blank=True, max_length=88, null=True),
+                ),
+                (
+                    "rating_certificate",
+                    models.CharField(blank=True, max_length=88, null=True),
+                ),
+                (
+                    "party_status",
+                    models.CharField(blank=True, max_length=88, null=True),
+                ),
+                (
+                    "cus_category",
+                    models.CharField(blank=True, max_length=88, null=True),
+                ),
+                (
+                    "closing_balance",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                ("average_collection_ratio", models.FloatField(default=0.0)),
+                ("grade", models.CharField(blank=True, max_length=88, null=True)),
+                ("max_due_days", models.IntegerField(default=0)),
+                ("customer_status", models.CharField(max_length=88)),
+                ("default_addr", models.CharField(max_length=500)),
+                ("status_start_date", models.DateField()),
+                ("status_end_date", models.DateField()),
+                ("synced_at", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "EBS Credit Snapshot",
+                "verbose_name_plural": "📤 EBS Credit Snapshots",
+                "db_table": "pms_ebs_credit_snapshot",
+            },
+        ),
+        migrations.CreateModel(
+            name="EbsCollectionSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("org_id", models.CharField(max_length=88)),
+                ("party_id", models.CharField(max_length=88)),
+                ("account_number", models.CharField(max_length=88)),
+                ("org_type", models.CharField(max_length=88)),
+                ("average_coll_ratio", models.FloatField(default=0.0)),
+                (
+                    "avg_receipt_amount",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                (
+                    "avg_sale_amount",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                ("last_sale_date", models.DateTimeField(blank=True, null=True)),
+                ("last_receipt_date", models.DateTimeField(blank=True, null=True)),
+                (
+                    "opening_amount",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                (
+                    "closing_balance",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                (
+                    "total_sales_amount",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                (
+                    "total_receipt_amount",
+                    models.DecimalField(decimal_places=2, default=0.0, max_digits=34),
+                ),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="collections",
+                        to="pms.ebscreditsnapshot",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "EBS Collection Snapshot",
+                "verbose_name_plural": "📤 EBS Collection Snapshots",
+                "db_table": "pms_ebs_collection_snapshot",
+            },
+        ),
+    ]
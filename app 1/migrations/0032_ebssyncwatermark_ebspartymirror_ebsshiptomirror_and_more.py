@@ -0,0 +1,171 @@
+# Generated by Django 5.1 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pms", "0031_ebscreditsnapshot_ebscollectionsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EbsSyncWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=88, unique=True)),
+                ("last_update_date", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "EBS Sync Watermark",
+                "verbose_name_plural": "📤 EBS Sync Watermarks",
+                "db_table": "pms_ebs_sync_watermark",
+            },
+        ),
+        migrations.CreateModel(
+            name="EbsPartyMirror",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("party_id", models.BigIntegerField(db_index=True)),
+                (
+                    "account_number",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "account_name",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("party_name", models.CharField(blank=True, max_length=360, null=True)),
+                (
+                    "party_present_addr",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("ph_address", models.CharField(blank=True, max_length=560, null=True)),
+                (
+                    "customer_category",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("creation_date", models.DateField(blank=True, null=True)),
+                ("division", models.CharField(blank=True, max_length=255, null=True)),
+                ("district", models.CharField(blank=True, max_length=255, null=True)),
+                (
+                    "police_station",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("last_name", models.CharField(blank=True, max_length=255, null=True)),
+                ("ph_contact", models.CharField(blank=True, max_length=255, null=True)),
+                ("zone", models.CharField(blank=True, max_length=255, null=True)),
+                ("area", models.CharField(blank=True, max_length=255, null=True)),
+                (
+                    "party_category",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("nid", models.CharField(blank=True, max_length=255, null=True)),
+                ("tin", models.CharField(blank=True, max_length=255, null=True)),
+                ("bin", models.CharField(blank=True, max_length=255, null=True)),
+                ("birth_day", models.CharField(blank=True, max_length=255, null=True)),
+                ("primary_invest", models.BigIntegerField(blank=True, null=True)),
+                ("present_size", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "commitment_size",
+                    models.CharField(blank=True, max_length=2000, null=True),
+                ),
+                (
+                    "email_address",
+                    models.CharField(blank=True, max_length=2000, null=True),
+                ),
+                (
+                    "sales_person",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+            ],
+            options={
+                "verbose_name": "EBS Party Mirror",
+                "verbose_name_plural": "📤 EBS Party Mirror",
+                "db_table": "pms_ebs_party_mirror",
+            },
+        ),
+        migrations.CreateModel(
+            name="EbsShipToMirror",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("party_id", models.BigIntegerField(db_index=True)),
+                (
+                    "party_number",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("party_name", models.CharField(blank=True, max_length=360, null=True)),
+                ("witp_code", models.CharField(db_index=True, max_length=255)),
+                ("address", models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                "verbose_name": "EBS Ship To Mirror",
+                "verbose_name_plural": "📤 EBS Ship To Mirror",
+                "db_table": "pms_ebs_ship_to_mirror",
+            },
+        ),
+        migrations.CreateModel(
+            name="EbsPartyAddressMirror",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("party_id", models.BigIntegerField(db_index=True)),
+                ("party_name", models.CharField(blank=True, max_length=360, null=True)),
+                ("witp_code", models.CharField(db_index=True, max_length=255)),
+                ("org_id", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "default_address",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "all_address",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "contact_person",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "mobile_number",
+                    models.CharField(blank=True, max_length=560, null=True),
+                ),
+            ],
+            options={
+                "verbose_name": "EBS Party Address Mirror",
+                "verbose_name_plural": "📤 EBS Party Address Mirror",
+                "db_table": "pms_ebs_party_address_mirror",
+            },
+        ),
+    ]
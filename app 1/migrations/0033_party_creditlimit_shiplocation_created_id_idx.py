@@ -0,0 +1,30 @@
+# Generated by Django 5.1 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pms", "0032_ebssyncwatermark_ebspartymirror_ebsshiptomirror_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="party",
+            index=models.Index(
+                fields=["created_at", "id"], name="pms_party_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="creditlimit",
+            index=models.Index(
+                fields=["created_at", "id"], name="pms_credit_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shiplocation",
+            index=models.Index(
+                fields=["created_at", "id"], name="pms_shiploc_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1 on 2026-10-18 16:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("pms", "0033_party_creditlimit_shiplocation_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=88)),
+                (
+                    "deleted_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tombstone",
+                "verbose_name_plural": "🪦 Tombstones",
+                "db_table": "pms_tombstone",
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "deleted_at"],
+                        name="pms_tombstone_deleted_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="party",
+            index=models.Index(
+                fields=["updated_at", "id"], name="pms_party_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="creditlimit",
+            index=models.Index(
+                fields=["updated_at", "id"], name="pms_credit_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="shiplocation",
+            index=models.Index(
+                fields=["updated_at", "id"], name="pms_shiploc_updated_id_idx"
+            ),
+        ),
+    ]
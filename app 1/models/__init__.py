@@ -5,3 +5,6 @@ from .party_attachment import *  # noqa: F403, I001
 from .contact_person import *  # noqa: F403, I001
 from .credit_limit import *  # noqa: F403, I001
 from .ship_location import *  # noqa: F403, I001
+from .ebs_snapshot import *  # noqa: F403, I001
+from .ebs_mirror import *  # noqa: F403, I001
+from .tombstone import *  # noqa: F403, I001
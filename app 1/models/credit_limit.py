@@ -126,6 +126,9 @@ class CreditLimit(AuditLogMixin):
     )
 
     ebs_info_pulled = models.BooleanField(default=False)
+    # set when the EBS post process gave up after all of its retries
+    ebs_pull_failed_at = models.DateTimeField(null=True, blank=True)
+    ebs_pull_error = models.CharField(null=True, blank=True, max_length=500)
 
     stage = models.CharField(
         max_length=255,
@@ -250,6 +253,11 @@ class CreditLimit(AuditLogMixin):
         db_table = "pms_credit_limit_application"
         verbose_name = "Credit Limit Application"
         verbose_name_plural = "📤 Credit Limit Applications"
+        # keyset pagination & delta sync of the lists
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="pms_credit_created_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="pms_credit_updated_id_idx"),
+        ]
 
 
 class CreditLimitDetail(models.Model):
@@ -283,7 +291,7 @@ class CreditLimitDetail(models.Model):
         verbose_name_plural = "📤 Credit Limit Application Details"
 
 
-class EbsCollectionDetail(models.Model):
+class BaseEbsCollection(models.Model):
     org_id = models.CharField(max_length=88)
     party_id = models.CharField(max_length=88)
     account_number = models.CharField(max_length=88)
@@ -304,6 +312,11 @@ class EbsCollectionDetail(models.Model):
         max_digits=34, decimal_places=2, default=0.0
     )
 
+    class Meta:
+        abstract = True
+
+
+class EbsCollectionDetail(BaseEbsCollection):
     credit_limit = models.ForeignKey(
         CreditLimit, on_delete=models.CASCADE, related_name="collection_details"
     )
@@ -0,0 +1,103 @@
+from django.db import models
+
+__all__ = [
+    "EbsSyncWatermark",
+    "EbsPartyMirror",
+    "EbsShipToMirror",
+    "EbsPartyAddressMirror",
+]
+
+
+class EbsSyncWatermark(models.Model):
+    """latest EBS ``LAST_UPDATE_DATE`` pulled by an incremental sync"""
+
+    name = models.CharField(max_length=88, unique=True)
+    last_update_date = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} - {self.last_update_date}"
+
+    class Meta:
+        db_table = "pms_ebs_sync_watermark"
+        verbose_name = "EBS Sync Watermark"
+        verbose_name_plural = "📤 EBS Sync Watermarks"
+
+
+class EbsPartyMirror(models.Model):
+    """party master rows, one for each account, contact & site of the party.
+    the fields follow the column order of ``party_master_sql``.
+    """
+
+    party_id = models.BigIntegerField(db_index=True)
+    account_number = models.CharField(max_length=255, null=True, blank=True)
+    account_name = models.CharField(max_length=255, null=True, blank=True)
+    party_name = models.CharField(max_length=360, null=True, blank=True)
+    party_present_addr = models.CharField(max_length=255, null=True, blank=True)
+    ph_address = models.CharField(max_length=560, null=True, blank=True)
+    customer_category = models.CharField(max_length=255, null=True, blank=True)
+    creation_date = models.DateField(null=True, blank=True)
+    division = models.CharField(max_length=255, null=True, blank=True)
+    district = models.CharField(max_length=255, null=True, blank=True)
+    police_station = models.CharField(max_length=255, null=True, blank=True)
+    last_name = models.CharField(max_length=255, null=True, blank=True)
+    ph_contact = models.CharField(max_length=255, null=True, blank=True)
+    zone = models.CharField(max_length=255, null=True, blank=True)
+    area = models.CharField(max_length=255, null=True, blank=True)
+    party_category = models.CharField(max_length=255, null=True, blank=True)
+    nid = models.CharField(max_length=255, null=True, blank=True)
+    tin = models.CharField(max_length=255, null=True, blank=True)
+    bin = models.CharField(max_length=255, null=True, blank=True)
+    birth_day = models.CharField(max_length=255, null=True, blank=True)
+    primary_invest = models.BigIntegerField(null=True, blank=True)
+    present_size = models.BigIntegerField(null=True, blank=True)
+    commitment_size = models.CharField(max_length=2000, null=True, blank=True)
+    email_address = models.CharField(max_length=2000, null=True, blank=True)
+    sales_person = models.CharField(max_length=255, null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.party_id} - {self.party_name}"
+
+    class Meta:
+        db_table = "pms_ebs_party_mirror"
+        verbose_name = "EBS Party Mirror"
+        verbose_name_plural = "📤 EBS Party Mirror"
+
+
+class EbsShipToMirror(models.Model):
+    """active WITP ship to sites of the EBS customer accounts"""
+
+    party_id = models.BigIntegerField(db_index=True)
+    party_number = models.CharField(max_length=255, null=True, blank=True)
+    party_name = models.CharField(max_length=360, null=True, blank=True)
+    witp_code = models.CharField(max_length=255, db_index=True)
+    address = models.CharField(max_length=255, null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.witp_code} - {self.party_name}"
+
+    class Meta:
+        db_table = "pms_ebs_ship_to_mirror"
+        verbose_name = "EBS Ship To Mirror"
+        verbose_name_plural = "📤 EBS Ship To Mirror"
+
+
+class EbsPartyAddressMirror(models.Model):
+    """default & other ship to addresses of the EBS customer accounts"""
+
+    party_id = models.BigIntegerField(db_index=True)
+    party_name = models.CharField(max_length=360, null=True, blank=True)
+    witp_code = models.CharField(max_length=255, db_index=True)
+    org_id = models.BigIntegerField(null=True, blank=True)
+    default_address = models.CharField(max_length=255, null=True, blank=True)
+    all_address = models.CharField(max_length=255, null=True, blank=True)
+    contact_person = models.CharField(max_length=255, null=True, blank=True)
+    mobile_number = models.CharField(max_length=560, null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.witp_code} - {self.all_address}"
+
+    class Meta:
+        db_table = "pms_ebs_party_address_mirror"
+        verbose_name = "EBS Party Address Mirror"
+        verbose_name_plural = "📤 EBS Party Address Mirror"
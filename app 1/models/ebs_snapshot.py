@@ -0,0 +1,53 @@
+from django.db import models
+
+from .credit_limit import BaseEbsCollection
+
+__all__ = ["EbsCreditSnapshot", "EbsCollectionSnapshot"]
+
+
+class EbsCreditSnapshot(models.Model):
+    """credit metrics of a WITP party as pulled from EBS by the nightly sync"""
+
+    witp_code = models.CharField(max_length=255, unique=True)
+
+    # party grading
+    party_name = models.CharField(max_length=255, null=True, blank=True)
+    is_all_doc_up = models.CharField(max_length=88, null=True, blank=True)
+    rating_certificate = models.CharField(max_length=88, null=True, blank=True)
+    party_status = models.CharField(max_length=88, null=True, blank=True)
+    cus_category = models.CharField(max_length=88, null=True, blank=True)
+    closing_balance = models.DecimalField(max_digits=34, decimal_places=2, default=0.0)
+    average_collection_ratio = models.FloatField(default=0.0)
+    grade = models.CharField(max_length=88, null=True, blank=True)
+
+    max_due_days = models.IntegerField(default=0)
+    customer_status = models.CharField(max_length=88)
+    default_addr = models.CharField(max_length=500)
+
+    # window the customer status was computed on
+    status_start_date = models.DateField()
+    status_end_date = models.DateField()
+
+    synced_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"{self.witp_code} - {self.party_name}"
+
+    class Meta:
+        db_table = "pms_ebs_credit_snapshot"
+        verbose_name = "EBS Credit Snapshot"
+        verbose_name_plural = "📤 EBS Credit Snapshots"
+
+
+class EbsCollectionSnapshot(BaseEbsCollection):
+    snapshot = models.ForeignKey(
+        EbsCreditSnapshot, on_delete=models.CASCADE, related_name="collections"
+    )
+
+    def __str__(self) -> str:
+        return f"{self.pk} - {self.org_type}"
+
+    class Meta:
+        db_table = "pms_ebs_collection_snapshot"
+        verbose_name = "EBS Collection Snapshot"
+        verbose_name_plural = "📤 EBS Collection Snapshots"
@@ -20,6 +20,7 @@ from django.db.models import (
     EmailField,
     FileField,
     ForeignKey,
+    Index,
     IntegerField,
     QuerySet,
     TextChoices,
@@ -297,3 +298,8 @@ class Party(BaseParty):
         db_table = "pms_party"
         verbose_name = "Party"
         verbose_name_plural = "🏫 Parties"
+        # keyset pagination & delta sync of the lists
+        indexes = [
+            Index(fields=["created_at", "id"], name="pms_party_created_id_idx"),
+            Index(fields=["updated_at", "id"], name="pms_party_updated_id_idx"),
+        ]
@@ -86,3 +86,12 @@ class ShipLocation(AuditLogMixin):
         db_table = "pms_ship_location_application"
         verbose_name = "Ship Location Application"
         verbose_name_plural = "🚢 Ship Location Applications"
+        # keyset pagination & delta sync of the lists
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="pms_shiploc_created_id_idx"
+            ),
+            models.Index(
+                fields=["updated_at", "id"], name="pms_shiploc_updated_id_idx"
+            ),
+        ]
@@ -0,0 +1,26 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+__all__ = ["Tombstone"]
+
+
+class Tombstone(models.Model):
+    """a deleted row, sent to the clients syncing its list (see delta_sync)"""
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=88)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"{self.content_type} {self.object_id} - {self.deleted_at}"
+
+    class Meta:
+        db_table = "pms_tombstone"
+        verbose_name = "Tombstone"
+        verbose_name_plural = "🪦 Tombstones"
+        indexes = [
+            models.Index(
+                fields=["content_type", "deleted_at"], name="pms_tombstone_deleted_idx"
+            )
+        ]
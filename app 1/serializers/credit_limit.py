@@ -1,6 +1,7 @@
 from rest_framework import serializers as sz
 
 from auth_users.serializers import UserSerializer
+from core.mixins import SparseFieldsMixin
 from recommendation_engine.serializers import ApprovalQueueSerializer
 
 from ..models import CreditLimit, CreditLimitDetail, EbsCollectionDetail
@@ -13,9 +14,11 @@ __all__ = [
 ]
 
 
-class CreditLimitSerializer(sz.ModelSerializer):
+class CreditLimitSerializer(SparseFieldsMixin, sz.ModelSerializer):
     approval_queues = ApprovalQueueSerializer(many=True, read_only=True)
 
+    expandable_fields = ("approval_queues", "limit_details", "collections")
+
     class Meta:
         model = CreditLimit
         fields = "__all__"
@@ -25,31 +28,35 @@ class CreditLimitSerializer(sz.ModelSerializer):
         request = self.context.get("request")
         if request:
             # Get the URI for the attachment field without the domain
-            if instance.wo_po_mou:
+            if instance.wo_po_mou and "wo_po_mou" in representation:
                 url = instance.wo_po_mou.url
                 domain = request.build_absolute_uri("/")[:-1]
                 representation["wo_po_mou"] = url.replace(domain, "")
-            if instance.rating_certificate:
+            if instance.rating_certificate and "rating_certificate" in representation:
                 url = instance.wo_po_mou.url
                 domain = request.build_absolute_uri("/")[:-1]
                 representation["rating_certificate"] = url.replace(domain, "")
-            if instance.updated_ledger_wdc:
+            if instance.updated_ledger_wdc and "updated_ledger_wdc" in representation:
                 url = instance.updated_ledger_wdc.url
                 domain = request.build_absolute_uri("/")[:-1]
                 representation["updated_ledger_wdc"] = url.replace(domain, "")
-            if instance.updated_ledger_wcl:
+            if instance.updated_ledger_wcl and "updated_ledger_wcl" in representation:
                 url = instance.updated_ledger_wcl.url
                 domain = request.build_absolute_uri("/")[:-1]
                 representation["updated_ledger_wcl"] = url.replace(domain, "")
 
-        representation["limit_details"] = CreditLimitDetailSerializer(
-            instance.creditlimitdetail_set.all(), many=True
-        ).data
-        representation["collections"] = EbsCollectionDetailSerializer(
-            instance.collection_details.all(), many=True
-        ).data
-        representation["created_by"] = UserSerializer(instance=instance.created_by).data
-        representation["updated_by"] = UserSerializer(instance=instance.updated_by).data
+        if self.is_requested("limit_details"):
+            representation["limit_details"] = CreditLimitDetailSerializer(
+                instance.creditlimitdetail_set.all(), many=True
+            ).data
+        if self.is_requested("collections"):
+            representation["collections"] = EbsCollectionDetailSerializer(
+                instance.collection_details.all(), many=True
+            ).data
+        for key in ("created_by", "updated_by"):
+            if key in representation:
+                user = getattr(instance, key)
+                representation[key] = UserSerializer(instance=user).data
         return representation
 
 
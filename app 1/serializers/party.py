@@ -10,6 +10,7 @@ from rest_framework.serializers import (
 
 from auth_users.serializers import UserSerializer
 from core.constants import StatusChoices
+from core.mixins import SparseFieldsMixin
 from dropdown_repository.pms.serializers.district import DistrictSerializer
 from dropdown_repository.pms.serializers.division import DivisionSerializer
 from dropdown_repository.pms.serializers.party_category import PartyCategorySerializer
@@ -29,7 +30,7 @@ __all__ = ["PartySerializer", "PartyTrailSerializer"]
 _logger = getLogger(__name__)
 
 
-class PartySerializer(ModelSerializer):
+class PartySerializer(SparseFieldsMixin, ModelSerializer):
     dealing = DealingSerializer(read_only=True)
     attachments = SerializerMethodField(read_only=True)
     security_cheques = SecurityChequeSerializer(many=True, read_only=True)
@@ -41,6 +42,19 @@ class PartySerializer(ModelSerializer):
     pending_count = SerializerMethodField()
     doc_expired = SerializerMethodField()
 
+    expandable_fields = (
+        "dealing",
+        "attachments",
+        "security_cheques",
+        "guarantee_collections",
+        "contacts",
+        "approval_queues",
+        "has_history",
+        "pending_count",
+        "doc_expired",
+        "extras",
+    )
+
     @extend_schema_field(AttachmentSerializer)
     def get_attachments(self, obj: Party):
         return AttachmentSerializer(instance=obj.attachments.first()).data
@@ -48,19 +62,24 @@ class PartySerializer(ModelSerializer):
     def to_representation(self, instance: Party):
         response = super().to_representation(instance)
 
-        serialized_keys: Dict[str, Serializer] = {
-            "division": DivisionSerializer(instance=instance.division),
-            "district": DistrictSerializer(instance=instance.district),
-            "party_category": PartyCategorySerializer(instance=instance.party_category),
-            "police_station": PoliceStationserializer(instance=instance.police_station),
-            "sales_person": UserSerializer(instance=instance.sales_person),
-            "created_by": UserSerializer(instance=instance.created_by),
-            "updated_by": UserSerializer(instance=instance.updated_by),
+        serialized_keys: Dict[str, type[Serializer]] = {
+            "division": DivisionSerializer,
+            "district": DistrictSerializer,
+            "party_category": PartyCategorySerializer,
+            "police_station": PoliceStationserializer,
+            "sales_person": UserSerializer,
+            "created_by": UserSerializer,
+            "updated_by": UserSerializer,
         }
-        for key, value in serialized_keys.items():
-            response[key] = value.data
-
-        response["extras"] = ExtraSerializer(instance=instance.extras, many=True).data
+        for key, serializer_class in serialized_keys.items():
+            # left out with ?fields=, never fetched then
+            if key in response:
+                response[key] = serializer_class(instance=getattr(instance, key)).data
+
+        if self.is_requested("extras"):
+            response["extras"] = ExtraSerializer(
+                instance=instance.extras, many=True
+            ).data
         return response
 
     def get_has_history(self, instance: Party):
@@ -1,19 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from decimal import Decimal
-from functools import lru_cache
 from logging import getLogger
-from typing import List
+from typing import Any, Callable, Dict, List, Tuple
 
 import oracledb
-from django.conf import settings
 from django.db.models import Sum
-from oracledb.exceptions import DatabaseError
+from django.utils import timezone
 from rest_framework import exceptions, status
 
 from recommendation_engine.models import ApprovalUser, RecommendationProcess
 
 from ..models import CreditLimit, EbsCollectionDetail
+from . import ebs_cache, ebs_fetch, ebs_limiter, ebs_pool
 from .sql_query import (
     max_invoice_day_count_sql,
     party_collections_sql,
@@ -28,20 +29,36 @@ limit_ratio_a_category = 5_00_000
 limit_ratio_b_category = 3_00_000
 limit_ratio_c_category = 1_50_000
 MAX_DUE_DAYS = 30
+PARTY_STATUS_WINDOW_DAYS = 30
 
 
-def _fetch_row(conn: oracledb.Connection, sql: str, witp_code: str):
-    with conn.cursor() as cur:
+def _fetch_row(conn: oracledb.Connection, query: str, sql: str, witp_code: str):
+    with ebs_fetch.cursor(conn, query) as cur:
         cur.execute(sql, witp_code=str(witp_code))
         return cur.fetchone()
 
 
-def _fetch_rows(conn: oracledb.Connection, sql, witp_code):
-    with conn.cursor() as cur:
+def _fetch_rows(conn: oracledb.Connection, query: str, sql, witp_code):
+    with ebs_fetch.cursor(conn, query) as cur:
         cur.execute(sql, witp_code=str(witp_code))
         return cur.fetchall()
 
 
+def _run_on_ebs(query: str, connection: oracledb.Connection | None, fetch: Callable):
+    """run ``fetch(connection)`` on the given connection or on a pooled one, within
+    the concurrency limit of ``query``.
+    """
+    try:
+        if connection:
+            with ebs_limiter.slot(query):
+                return fetch(connection)
+        with ebs_pool.session(query) as con:
+            return fetch(con)
+    except oracledb.DatabaseError as exc:
+        _logger.exception(exc)
+        raise OracleServiceException from exc
+
+
 class OracleServiceException(exceptions.APIException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     default_detail = "Oracle Database Connection Failed."
@@ -61,12 +78,68 @@ class PartyGradeRow:
     grade: str | None = None
 
 
-class CreditLimitService:
-    start_date = datetime.now()
-    end_date = start_date - timedelta(days=30)
+@ebs_cache.cached_query("party_grading")
+def _fetch_party_grading(witp_code: str, connection=None):
+    return _run_on_ebs(
+        "party_grading",
+        connection,
+        lambda con: _fetch_row(con, "party_grading", party_grading_sql, witp_code),
+    )
+
+
+@ebs_cache.cached_query("max_inv_due_count")
+def _fetch_max_inv_due_count(witp_code: str, connection=None):
+    return _run_on_ebs(
+        "max_inv_due_count",
+        connection,
+        lambda con: _fetch_row(
+            con, "max_inv_due_count", max_invoice_day_count_sql, witp_code
+        ),
+    )
+
+
+@ebs_cache.cached_query("party_status")
+def _fetch_party_status(
+    witp_code: str, start_date: str, end_date: str, connection=None
+):
+    def _get_data(con: oracledb.Connection):
+        with ebs_fetch.cursor(con, "party_status") as cursor:
+            cursor.execute(
+                party_status_sql,
+                WITP_CODE=witp_code,
+                P_START_DATE=start_date,
+                P_END_DATE=end_date,
+            )
+            return cursor.fetchone()
+
+    return _run_on_ebs("party_status", connection, _get_data)
+
+
+@ebs_cache.cached_query("party_default_addr")
+def _fetch_party_default_addr(witp_code: str, connection=None):
+    return _run_on_ebs(
+        "party_default_addr",
+        connection,
+        lambda con: _fetch_row(
+            con, "party_default_addr", party_default_addr_sql, witp_code
+        ),
+    )
+
 
+@ebs_cache.cached_query("party_collections")
+def _fetch_party_collections(witp_code: str, connection=None):
+    def _get_data(con: oracledb.Connection):
+        with ebs_fetch.cursor(con, "party_collections") as cursor:
+            cursor.execute(party_collections_sql, witp_code=witp_code)
+            cursor.rowfactory = CreditLimitService.dict_provider(cursor)
+            return cursor.fetchall()
+
+    return _run_on_ebs("party_collections", connection, _get_data)
+
+
+class CreditLimitService:
     @classmethod
-    def get_orcl_date_format(cls, date: datetime) -> str:
+    def get_orcl_date_format(cls, date: date) -> str:
         return date.strftime("%d-%b-%Y")
 
     @classmethod
@@ -80,22 +153,13 @@ class CreditLimitService:
         return create_row
 
     @staticmethod
-    @lru_cache(maxsize=48)
     def get_party_grading(
         witp_code: str, connection: oracledb.Connection | None = None
     ) -> PartyGradeRow:
         """party category/grading/rating query. based on this return the approval path
         is going to have one more step added.
         """
-        try:
-            if connection:
-                row = _fetch_row(connection, party_grading_sql, witp_code)
-            else:
-                with oracledb.connect(params=settings.EBS_CONN_PARAMS) as con:
-                    row = _fetch_row(con, party_grading_sql, witp_code)
-        except oracledb.DatabaseError as exc:
-            _logger.exception(exc)
-            raise OracleServiceException from exc
+        row = _fetch_party_grading(witp_code, connection=connection)
 
         if not row:
             return PartyGradeRow()
@@ -108,49 +172,31 @@ class CreditLimitService:
     def get_max_inv_due_count(
         witp_code: str, connection: oracledb.Connection | None = None
     ):
-        try:
-            if connection:
-                row = _fetch_row(connection, max_invoice_day_count_sql, witp_code)
-            else:
-                with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                    row = _fetch_row(connection, max_invoice_day_count_sql, witp_code)
-        except oracledb.DatabaseError as exc:
-            _logger.exception(exc)
-            raise OracleServiceException from exc
+        row = _fetch_max_inv_due_count(witp_code, connection=connection)
+        if not row:
+            return 0
         return row[-1] if row[-1] else 0
 
     @classmethod
-    @lru_cache(maxsize=48)
     def get_party_status(
         cls,
         witp_code: str,
-        start_date: datetime = start_date,
-        end_date: datetime = end_date,
+        start_date: date | None = None,
+        end_date: date | None = None,
         connection: oracledb.Connection | None = None,
     ) -> str:
-        """party status according to last 6 months of transaction of a party"""
-
-        def _get_data():
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    party_status_sql,
-                    WITP_CODE=witp_code,
-                    P_START_DATE=cls.get_orcl_date_format(end_date),
-                    P_END_DATE=cls.get_orcl_date_format(start_date),
-                )
-                return cursor.fetchone()
-
-        try:
-            if connection:
-                row = _get_data()
-            else:
-                with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                    row = _get_data()
-        except oracledb.DatabaseError as exc:
-            _logger.exception(exc)
-            _logger.error(cls.get_orcl_date_format(start_date))
-            _logger.error(cls.get_orcl_date_format(end_date))
-            raise OracleServiceException from exc
+        """party status according to the transactions of a party in the given window,
+        defaults to the last 30 days.
+        """
+        end_date = end_date or timezone.localdate()
+        start_date = start_date or end_date - timedelta(days=PARTY_STATUS_WINDOW_DAYS)
+
+        row = _fetch_party_status(
+            witp_code,
+            cls.get_orcl_date_format(start_date),
+            cls.get_orcl_date_format(end_date),
+            connection=connection,
+        )
 
         if not row:
             return "WATCHFUL"
@@ -158,20 +204,11 @@ class CreditLimitService:
         return row[-1]
 
     @staticmethod
-    @lru_cache(maxsize=48)
     def get_party_default_addr(
         witp_code: str, connection: oracledb.Connection | None = None
     ) -> str:
-        """party status according to last 6 months of transaction of a party"""
-        try:
-            if connection:
-                queryset = _fetch_row(connection, party_default_addr_sql, witp_code)
-            else:
-                with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                    queryset = _fetch_row(connection, party_default_addr_sql, witp_code)
-        except oracledb.DatabaseError as exc:
-            _logger.exception(exc)
-            raise OracleServiceException from exc
+        """default ship to address of a party"""
+        queryset = _fetch_party_default_addr(witp_code, connection=connection)
         if not queryset:
             _logger.warning(
                 f"Party default address not found with WITP({witp_code!r})."
@@ -183,22 +220,10 @@ class CreditLimitService:
     def get_party_collections(
         cls, witp_code: str, connection: oracledb.Connection | None = None
     ) -> List:
-        """party status according to last 6 months of transaction of a party"""
-
-        def _get_data():
-            with connection.cursor() as cursor:
-                cursor.execute(party_collections_sql, witp_code=witp_code)
-                cursor.rowfactory = cls.dict_provider(cursor)
-                return cursor.fetchall()
-
+        """collection details of a party"""
         try:
-            if connection:
-                queryset = _get_data()
-            else:
-                with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                    queryset = _get_data()
-        except DatabaseError as exc:
-            _logger.exception(exc)
+            queryset = _fetch_party_collections(witp_code, connection=connection)
+        except OracleServiceException:
             _logger.error("Collection details fetch error due to oracle exception.")
         else:
             if not queryset:
@@ -208,6 +233,72 @@ class CreditLimitService:
 
             return queryset
 
+    @classmethod
+    def collect_ebs_details(
+        cls,
+        witp_code: str,
+        collected: Dict[str, Any] | None = None,
+        time_budget: float | None = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """run the independent EBS queries of a credit limit application concurrently,
+        each one on its own pooled session, within ``time_budget`` seconds.
+
+        the ones already present in ``collected`` or in a fresh nightly snapshot of
+        the party are skipped. returns the collected results and the errors of the
+        queries that failed or ran out of time.
+        """
+        from .credit_snapshot_services import CreditSnapshotService
+
+        fetchers: Dict[str, Callable[[str], Any]] = {
+            "grade_row": cls.get_party_grading,
+            "max_due_count": cls.get_max_inv_due_count,
+            "party_status": cls.get_party_status,
+            "default_addr": cls.get_party_default_addr,
+            # get_party_collections hides a failed query behind a None, the
+            # other loaders raise and may return a NULL column as is
+            "collections": _fetch_party_collections,
+        }
+        collected = {
+            **CreditSnapshotService.get_ebs_details(witp_code),
+            **(collected or {}),
+        }
+        errors: Dict[str, Exception] = {}
+        pending = {
+            name: fetcher
+            for name, fetcher in fetchers.items()
+            if name not in collected
+        }
+        if not pending:
+            return collected, errors
+
+        executor = ThreadPoolExecutor(
+            max_workers=len(pending), thread_name_prefix="ebs-credit-limit"
+        )
+        # the sessions of the workers inherit the deadline through their context,
+        # a late query is broken off by the driver instead of running on
+        with ebs_pool.deadline(time_budget):
+            futures = {
+                executor.submit(copy_context().run, fetcher, witp_code): name
+                for name, fetcher in pending.items()
+            }
+        done, not_done = wait(futures, timeout=time_budget)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in done:
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                errors[name] = exc
+                continue
+            collected[name] = result
+
+        for future in not_done:
+            name = futures[future]
+            errors[name] = TimeoutError(f"{name} exceeded {time_budget}s budget.")
+
+        return collected, errors
+
     @staticmethod
     def create_party_collections(instance, collections):
         instance.collection_details.all().delete()
@@ -0,0 +1,270 @@
+"""
+Nightly snapshot of the EBS credit metrics of every active WITP party.
+
+The credit limit queries are run for a whole batch of WITP codes at once, the codes
+being bound as a single oracle collection, and the results are stored locally so
+the credit limit applications read them from the database instead of waiting on
+EBS (see ``CreditLimitService.collect_ebs_details``).
+"""
+from datetime import date, timedelta
+from logging import getLogger
+from typing import Any, Dict, List, Sequence
+
+import oracledb
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.constants import StatusChoices
+
+from ..models import (
+    CreditLimit,
+    EbsCollectionSnapshot,
+    EbsCreditSnapshot,
+    Party,
+)
+from ..models.credit_limit import BaseEbsCollection
+from . import ebs_fetch, ebs_pool
+from .credit_limit_services import (
+    PARTY_STATUS_WINDOW_DAYS,
+    CreditLimitService,
+    PartyGradeRow,
+)
+from .ebs_batch import array_bind, as_batch_query
+from .sql_query import (
+    max_invoice_day_count_sql,
+    party_collections_sql,
+    party_default_addr_sql,
+    party_grading_sql,
+    party_status_sql,
+)
+
+_logger = getLogger(__name__)
+
+__all__ = ["CreditSnapshotService"]
+
+COLLECTION_FIELDS = [field.name for field in BaseEbsCollection._meta.local_fields]
+
+party_grading_batch_sql = as_batch_query(party_grading_sql)
+party_status_batch_sql = as_batch_query(party_status_sql)
+party_default_addr_batch_sql = as_batch_query(party_default_addr_sql)
+party_collections_batch_sql = as_batch_query(party_collections_sql)
+# the single party query only returns the maximum, group it by party instead
+max_invoice_day_count_batch_sql = (
+    as_batch_query(max_invoice_day_count_sql).replace(
+        "MAX (DAY_COUNT) AS DAY_COUNT",
+        "CUSTOMER_NUMBER AS WITP_CODE,\n\tMAX (DAY_COUNT) AS DAY_COUNT",
+        1,
+    )
+    + "GROUP BY\n\tCUSTOMER_NUMBER\n"
+)
+
+
+class CreditSnapshotService:
+    @staticmethod
+    def active_witp_codes() -> List[str]:
+        """WITP codes of the approved parties and of the credit limit applicants"""
+        parties = Party.objects.filter(
+            status=StatusChoices.APPROVED, witp_code__isnull=False
+        ).values_list("witp_code", flat=True)
+        applicants = (
+            CreditLimit.objects.exclude(status=StatusChoices.ARCHIVED)
+            .filter(witp_code__isnull=False)
+            .values_list("witp_code", flat=True)
+        )
+        codes = {str(code).strip() for code in (*parties, *applicants)}
+        codes.discard("")
+        return sorted(codes)
+
+    @staticmethod
+    def _execute(
+        connection: oracledb.Connection,
+        sql: str,
+        witp_codes: Sequence[str],
+        as_dict: bool = False,
+        **binds,
+    ) -> List:
+        with ebs_fetch.cursor(connection, "credit_snapshot") as cursor:
+            cursor.execute(sql, witp_codes=array_bind(connection, witp_codes), **binds)
+            if as_dict:
+                cursor.rowfactory = CreditLimitService.dict_provider(cursor)
+            return cursor.fetchall()
+
+    @classmethod
+    def pull_batch(
+        cls,
+        connection: oracledb.Connection,
+        witp_codes: Sequence[str],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, Dict[str, Any]]:
+        """EBS credit metrics of the given parties, keyed by WITP code. the parties
+        unknown to EBS get the same defaults as the single party queries.
+        """
+        details: Dict[str, Dict[str, Any]] = {
+            code: {
+                "grade_row": PartyGradeRow(witp_code=code),
+                "max_due_count": 0,
+                "party_status": "WATCHFUL",
+                "default_addr": "NOT FOUND",
+                "collections": [],
+            }
+            for code in witp_codes
+        }
+
+        def _get(witp_code) -> Dict[str, Any] | None:
+            return details.get(str(witp_code))
+
+        for row in cls._execute(connection, party_grading_batch_sql, witp_codes):
+            if (detail := _get(row[0])) is not None:
+                detail["grade_row"] = PartyGradeRow(*row)
+
+        for row in cls._execute(
+            connection, max_invoice_day_count_batch_sql, witp_codes
+        ):
+            if (detail := _get(row[0])) is not None:
+                detail["max_due_count"] = row[-1] or 0
+
+        for row in cls._execute(
+            connection,
+            party_status_batch_sql,
+            witp_codes,
+            P_START_DATE=CreditLimitService.get_orcl_date_format(start_date),
+            P_END_DATE=CreditLimitService.get_orcl_date_format(end_date),
+        ):
+            if (detail := _get(row[0])) is not None:
+                detail["party_status"] = row[-1]
+
+        seen_addr = set()
+        for row in cls._execute(connection, party_default_addr_batch_sql, witp_codes):
+            # a party may have many ship to sites, keep the first one like fetchone
+            witp_code = str(row[3])
+            if witp_code in seen_addr or (detail := _get(witp_code)) is None:
+                continue
+            seen_addr.add(witp_code)
+            detail["default_addr"] = row[-1]
+
+        for row in cls._execute(
+            connection, party_collections_batch_sql, witp_codes, as_dict=True
+        ):
+            if (detail := _get(row["account_number"])) is not None:
+                detail["collections"].append(row)
+
+        return details
+
+    @staticmethod
+    def store_batch(
+        details: Dict[str, Dict[str, Any]],
+        start_date: date,
+        end_date: date,
+        synced_at,
+    ) -> None:
+        with transaction.atomic():
+            for witp_code, detail in details.items():
+                row: PartyGradeRow = detail["grade_row"]
+                snapshot, _ = EbsCreditSnapshot.objects.update_or_create(
+                    witp_code=witp_code,
+                    defaults={
+                        "party_name": row.party_name,
+                        "is_all_doc_up": row.is_all_doc_up,
+                        "rating_certificate": row.rating_certificate,
+                        "party_status": row.party_status,
+                        "cus_category": row.cus_category,
+                        "closing_balance": row.closing_balance or 0,
+                        "average_collection_ratio": row.average_collection_ratio or 0,
+                        "grade": row.grade,
+                        "max_due_days": detail["max_due_count"],
+                        "customer_status": detail["party_status"],
+                        "default_addr": detail["default_addr"],
+                        "status_start_date": start_date,
+                        "status_end_date": end_date,
+                        "synced_at": synced_at,
+                    },
+                )
+                snapshot.collections.all().delete()
+                EbsCollectionSnapshot.objects.bulk_create(
+                    EbsCollectionSnapshot(snapshot=snapshot, **col)
+                    for col in detail["collections"]
+                )
+
+    @classmethod
+    def sync(cls, batch_size: int | None = None) -> Dict[str, int]:
+        """pull the credit metrics of every active party from EBS, batch by batch.
+        a failed batch is logged and skipped, its parties fall back to live EBS.
+        """
+        batch_size = batch_size or settings.EBS_SNAPSHOT_BATCH_SIZE
+        witp_codes = cls.active_witp_codes()
+        end_date = timezone.localdate()
+        start_date = end_date - timedelta(days=PARTY_STATUS_WINDOW_DAYS)
+        started_at = timezone.now()
+        synced = failed = 0
+
+        for offset in range(0, len(witp_codes), batch_size):
+            batch = witp_codes[offset : offset + batch_size]
+            try:
+                # a heavy slot & a session per batch, the whole run outlasts the
+                # lease of a slot. the sync waits for a slot rather than giving up
+                with ebs_pool.session(
+                    "credit_snapshot",
+                    limit_timeout=settings.EBS_LIMITER_SYNC_TIMEOUT,
+                ) as connection:
+                    details = cls.pull_batch(connection, batch, start_date, end_date)
+                cls.store_batch(details, start_date, end_date, timezone.now())
+            except Exception as exc:
+                _logger.exception(exc)
+                failed += len(batch)
+                continue
+            synced += len(batch)
+            _logger.info(
+                f"EBS credit snapshot synced {synced}/{len(witp_codes)} parties."
+            )
+
+        # the ones not synced for a while are never served anyway
+        pruned, _ = EbsCreditSnapshot.objects.filter(
+            synced_at__lt=started_at - timedelta(seconds=settings.EBS_SNAPSHOT_MAX_AGE)
+        ).delete()
+        return {"synced": synced, "failed": failed, "pruned": pruned}
+
+    @staticmethod
+    def get_fresh(witp_code: str) -> EbsCreditSnapshot | None:
+        """snapshot of the party if it was synced within ``EBS_SNAPSHOT_MAX_AGE``"""
+        if not witp_code:
+            return None
+        fresh_after = timezone.now() - timedelta(seconds=settings.EBS_SNAPSHOT_MAX_AGE)
+        return (
+            EbsCreditSnapshot.objects.filter(
+                witp_code=str(witp_code).strip(), synced_at__gte=fresh_after
+            )
+            .prefetch_related("collections")
+            .first()
+        )
+
+    @classmethod
+    def get_ebs_details(cls, witp_code: str) -> Dict[str, Any]:
+        """fresh snapshot of the party shaped like
+        ``CreditLimitService.collect_ebs_details``, empty when there is none.
+        """
+        snapshot = cls.get_fresh(witp_code)
+        if snapshot is None:
+            return {}
+
+        return {
+            "grade_row": PartyGradeRow(
+                witp_code=snapshot.witp_code,
+                party_name=snapshot.party_name,
+                is_all_doc_up=snapshot.is_all_doc_up,
+                rating_certificate=snapshot.rating_certificate,
+                party_status=snapshot.party_status,
+                cus_category=snapshot.cus_category,
+                closing_balance=snapshot.closing_balance,
+                average_collection_ratio=snapshot.average_collection_ratio,
+                grade=snapshot.grade,
+            ),
+            "max_due_count": snapshot.max_due_days,
+            "party_status": snapshot.customer_status,
+            "default_addr": snapshot.default_addr,
+            "collections": [
+                {field: getattr(col, field) for field in COLLECTION_FIELDS}
+                for col in snapshot.collections.all()
+            ],
+        }
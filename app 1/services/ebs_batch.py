@@ -0,0 +1,32 @@
+"""
+Helpers to run the single party EBS queries for many parties in one round trip.
+
+The values are bound as one oracle collection and the ``= :bind`` filters of the
+query are turned into ``IN (SELECT COLUMN_VALUE FROM TABLE(:binds))``.
+"""
+import re
+from typing import Sequence
+
+import oracledb
+
+__all__ = ["as_batch_query", "array_bind"]
+
+_NUMBER_LIST_TYPE = "SYS.ODCINUMBERLIST"
+_VARCHAR_LIST_TYPE = "SYS.ODCIVARCHAR2LIST"
+
+
+def as_batch_query(sql: str, bind: str = "witp_code", list_bind: str = "") -> str:
+    """turn the ``= :bind`` filters of a query into filters on the ``:list_bind``
+    collection (``bind`` + "s" by default).
+    """
+    list_bind = list_bind or f"{bind}s"
+    pattern = re.compile(rf"=\s*:{re.escape(bind)}\b", re.IGNORECASE)
+    return pattern.sub(f"IN (SELECT COLUMN_VALUE FROM TABLE(:{list_bind}))", sql)
+
+
+def array_bind(connection: oracledb.Connection, values: Sequence) -> oracledb.DbObject:
+    """the values as an oracle collection, numbers or strings depending on them"""
+    numeric = bool(values) and all(isinstance(value, int) for value in values)
+    list_type = _NUMBER_LIST_TYPE if numeric else _VARCHAR_LIST_TYPE
+    items = list(values) if numeric else [str(value) for value in values]
+    return connection.gettype(list_type).newobject(items)
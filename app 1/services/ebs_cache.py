@@ -0,0 +1,126 @@
+"""
+Read-through cache of EBS query results.
+
+Results are keyed by (query name, WITP code, date window) and kept in the shared
+cache for ``EBS_RESULT_CACHE_TTL[query]`` seconds. After that they are still served
+for ``EBS_RESULT_CACHE_STALE_TTL`` seconds while celery refreshes them in the
+background, so a slow or unreachable EBS does not block the callers. Unknown WITP
+codes are cached for ``EBS_RESULT_CACHE_NEGATIVE_TTL`` seconds only.
+"""
+import time
+from functools import wraps
+from logging import getLogger
+from typing import Any, Callable, Dict, Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.services.cache import make_key
+from core.services.single_flight import coalesce
+
+_logger = getLogger(__name__)
+
+__all__ = ["cached_query", "refresh", "invalidate"]
+
+# query name => undecorated loader, used by the celery refresh task
+_registry: Dict[str, Callable[..., Any]] = {}
+
+
+def _get_ttl(query: str) -> int:
+    return settings.EBS_RESULT_CACHE_TTL.get(
+        query, settings.EBS_RESULT_CACHE_DEFAULT_TTL
+    )
+
+
+def _get_key(query: str, witp_code: str, window: Sequence[str]) -> str:
+    return make_key(f"ebs:{query}", witp_code, *window)
+
+
+def _cache_get(key: str):
+    try:
+        return cache.get(key)
+    except Exception as exc:
+        _logger.exception(exc)
+        return None
+
+
+def _cache_set(key: str, entry: Dict[str, Any], timeout: int) -> None:
+    try:
+        cache.set(key, entry, timeout)
+    except Exception as exc:
+        _logger.exception(exc)
+
+
+def _load(query: str, witp_code: str, window: Sequence[str], connection=None):
+    key = _get_key(query, witp_code, window)
+
+    def _fetch():
+        value = _registry[query](witp_code, *window, connection=connection)
+        missing = not value
+        if missing:
+            timeout = settings.EBS_RESULT_CACHE_NEGATIVE_TTL
+        else:
+            timeout = _get_ttl(query) + settings.EBS_RESULT_CACHE_STALE_TTL
+        entry = {"value": value, "fetched_at": time.time(), "missing": missing}
+        _cache_set(key, entry, timeout)
+        return value
+
+    # concurrent misses of the same entry share a single EBS query
+    return coalesce(key, _fetch)
+
+
+def _schedule_refresh(query: str, key: str, witp_code: str, window: Sequence[str]):
+    from ..tasks import refresh_ebs_result
+
+    try:
+        # only one refresh per entry until the lock expires, even if it fails
+        if not cache.add(
+            f"{key}:refreshing", True, settings.EBS_RESULT_CACHE_REFRESH_LOCK
+        ):
+            return
+        refresh_ebs_result.delay(query, witp_code, list(window))
+    except Exception as exc:
+        _logger.exception(exc)
+        return
+    _logger.info(f"Scheduled refresh of stale EBS {query!r} for WITP({witp_code!r}).")
+
+
+def cached_query(query: str) -> Callable:
+    """
+    Register an EBS loader ``loader(witp_code, *window, connection=None)`` and serve
+    it through the cache. The window arguments must be strings (e.g. oracle dates)
+    so the refresh can be sent to celery.
+    """
+
+    def decorator(loader: Callable[..., Any]) -> Callable[..., Any]:
+        _registry[query] = loader
+
+        @wraps(loader)
+        def wrapper(witp_code: str, *window: str, connection=None):
+            witp_code = str(witp_code)
+            key = _get_key(query, witp_code, window)
+            entry = _cache_get(key)
+
+            if entry is None:
+                return _load(query, witp_code, window, connection)
+
+            age = time.time() - entry["fetched_at"]
+            if not entry["missing"] and age >= _get_ttl(query):
+                _schedule_refresh(query, key, witp_code, window)
+            return entry["value"]
+
+        return wrapper
+
+    return decorator
+
+
+def refresh(query: str, witp_code: str, window: Sequence[str]) -> None:
+    """reload a single entry from EBS, the stale entry stays if EBS fails"""
+    _load(query, str(witp_code), tuple(window))
+
+
+def invalidate(query: str, witp_code: str, *window: str) -> None:
+    try:
+        cache.delete(_get_key(query, str(witp_code), window))
+    except Exception as exc:
+        _logger.exception(exc)
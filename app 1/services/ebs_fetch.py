@@ -0,0 +1,35 @@
+"""
+Fetch tuning of the EBS cursors, configured per named query.
+
+Every named EBS query (the same names as ``ebs_limiter``) maps to a profile of
+``EBS_QUERY_FETCH_PROFILES``, "default" otherwise. A profile sets ``prefetchrows``,
+the rows returned along with the execute, and ``arraysize``, the rows returned by
+every later fetch round trip. The statement cache is sized once on the session pool
+(``EBS_POOL_STMT_CACHE_SIZE``). ``manage.py ebs_fetch_benchmark`` replays the
+queries with other values to tune the profiles from measurements.
+"""
+from typing import Dict
+
+import oracledb
+from django.conf import settings
+
+__all__ = ["get_profile", "tune", "cursor"]
+
+DEFAULT_PROFILE = "default"
+
+
+def get_profile(query: str) -> Dict[str, int]:
+    name = settings.EBS_QUERY_FETCH_PROFILES.get(query, DEFAULT_PROFILE)
+    return settings.EBS_FETCH_PROFILES[name]
+
+
+def tune(cur: oracledb.Cursor, profile: Dict[str, int]) -> oracledb.Cursor:
+    """apply ``profile`` to a cursor that has not been executed yet"""
+    cur.arraysize = profile["arraysize"]
+    cur.prefetchrows = profile["prefetchrows"]
+    return cur
+
+
+def cursor(connection: oracledb.Connection, query: str) -> oracledb.Cursor:
+    """cursor of ``connection`` tuned for ``query``, use it as a context manager"""
+    return tune(connection.cursor(), get_profile(query))
@@ -0,0 +1,173 @@
+"""
+Cluster wide limit of the concurrent EBS queries, shared by the web and celery
+workers through redis.
+
+Every EBS query belongs to a class (``EBS_QUERY_CLASSES``, "default" otherwise)
+with its own number of slots (``EBS_CONCURRENCY_LIMITS``). A slot is a member of a
+redis sorted set scored with its lease deadline, so the slots of a crashed worker
+are reclaimed after ``EBS_LIMITER_LEASE`` seconds. Callers wait at most
+``EBS_LIMITER_ACQUIRE_TIMEOUT`` seconds for a slot, then fail fast.
+"""
+import random
+import time
+from contextlib import contextmanager
+from logging import getLogger
+from typing import Any, Dict, Iterator
+from uuid import uuid4
+
+import redis
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
+
+_logger = getLogger(__name__)
+
+__all__ = ["EbsBusyException", "get_query_class", "slot", "get_stats"]
+
+KEY_PREFIX = "ebs:limiter"
+DEFAULT_CLASS = "default"
+SLOW_WAIT_MS = 1000
+
+# drop the expired leases, then take a slot if one is free
+_ACQUIRE_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now_ms + tonumber(ARGV[2]), ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], tonumber(ARGV[2]))
+    return 1
+end
+return 0
+"""
+
+_client: redis.Redis | None = None
+_acquire_script = None
+
+
+class EbsBusyException(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("EBS is busy, please try again shortly.")
+    default_code = "ebs_busy"
+
+
+def _get_client() -> redis.Redis:
+    global _client, _acquire_script
+
+    if _client is None:
+        _client = redis.Redis.from_url(settings.EBS_LIMITER_REDIS_URL)
+        _acquire_script = _client.register_script(_ACQUIRE_SCRIPT)
+    return _client
+
+
+def _get_acquire_script():
+    _get_client()
+    return _acquire_script
+
+
+def _slots_key(query_class: str) -> str:
+    return f"{KEY_PREFIX}:{query_class}:slots"
+
+
+def _stats_key(query_class: str) -> str:
+    return f"{KEY_PREFIX}:{query_class}:stats"
+
+
+def get_query_class(query: str) -> str:
+    return settings.EBS_QUERY_CLASSES.get(query, DEFAULT_CLASS)
+
+
+def _record(query_class: str, waited_ms: int, acquired: bool) -> None:
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        key = _stats_key(query_class)
+        pipe.hincrby(key, "acquired" if acquired else "timeouts", 1)
+        pipe.hincrby(key, "wait_ms_total", waited_ms)
+        pipe.execute()
+    except redis.RedisError as exc:
+        _logger.exception(exc)
+
+
+def _acquire(query_class: str, token: str, timeout: float) -> bool:
+    limit = settings.EBS_CONCURRENCY_LIMITS.get(
+        query_class, settings.EBS_CONCURRENCY_LIMITS[DEFAULT_CLASS]
+    )
+    args = [limit, settings.EBS_LIMITER_LEASE * 1000, token]
+    script = _get_acquire_script()
+    deadline = time.monotonic() + timeout
+    delay = 0.025
+    while True:
+        if script(keys=[_slots_key(query_class)], args=args):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(delay * random.uniform(0.5, 1.5))
+        delay = min(delay * 2, 0.25)
+
+
+@contextmanager
+def slot(query: str, timeout: float | None = None) -> Iterator[None]:
+    """hold a slot of the class of ``query`` for the duration of the block.
+
+    raises ``EbsBusyException`` when no slot frees up within ``timeout`` seconds
+    (``EBS_LIMITER_ACQUIRE_TIMEOUT`` by default). the limiter fails open when redis
+    is unreachable or ``EBS_LIMITER_ENABLED`` is off.
+    """
+    if not settings.EBS_LIMITER_ENABLED:
+        yield
+        return
+
+    query_class = get_query_class(query)
+    token = uuid4().hex
+    if timeout is None:
+        timeout = settings.EBS_LIMITER_ACQUIRE_TIMEOUT
+    started = time.monotonic()
+    try:
+        acquired = _acquire(query_class, token, timeout)
+    except redis.RedisError as exc:
+        _logger.exception(exc)
+        acquired = None
+
+    if acquired is None:
+        yield
+        return
+
+    waited_ms = int((time.monotonic() - started) * 1000)
+    _record(query_class, waited_ms, acquired)
+    if not acquired:
+        _logger.warning(
+            f"No {query_class!r} EBS slot for {query!r} within {timeout}s, giving up."
+        )
+        raise EbsBusyException
+    if waited_ms >= SLOW_WAIT_MS:
+        _logger.warning(f"Waited {waited_ms}ms for a {query_class!r} EBS slot.")
+
+    try:
+        yield
+    finally:
+        try:
+            _get_client().zrem(_slots_key(query_class), token)
+        except redis.RedisError as exc:
+            # the lease expires on its own
+            _logger.exception(exc)
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """slots in use and queue time of every query class, across the cluster"""
+    client = _get_client()
+    now_ms = int(time.time() * 1000)
+    stats = {}
+    for query_class, limit in settings.EBS_CONCURRENCY_LIMITS.items():
+        raw = client.hgetall(_stats_key(query_class))
+        counters = {key.decode(): int(value) for key, value in raw.items()}
+        acquired = counters.get("acquired", 0)
+        timeouts = counters.get("timeouts", 0)
+        wait_ms_total = counters.get("wait_ms_total", 0)
+        stats[query_class] = {
+            "limit": limit,
+            "in_use": client.zcount(_slots_key(query_class), now_ms, "+inf"),
+            "acquired": acquired,
+            "timeouts": timeouts,
+            "avg_wait_ms": wait_ms_total / max(acquired + timeouts, 1),
+        }
+    return stats
@@ -0,0 +1,297 @@
+"""
+Local mirror of the EBS party master (parties, customer accounts, ship to sites and
+their addresses) backing the EBS lookup endpoints.
+
+The mirror is synced incrementally: every table of the party master is scanned for
+rows whose ``LAST_UPDATE_DATE`` is past the stored watermark, and only the parties
+they belong to are pulled again, in batches bound as one oracle collection. The
+lookups fall back to live EBS when the mirror lags behind or misses the party.
+"""
+from datetime import datetime, time, timedelta
+from logging import getLogger
+from typing import Any, Dict, List, Sequence, Tuple
+
+import oracledb
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.services.cache import invalidate_tags
+
+from ..models import (
+    EbsPartyAddressMirror,
+    EbsPartyMirror,
+    EbsShipToMirror,
+    EbsSyncWatermark,
+)
+from . import ebs_fetch, ebs_pool
+from .ebs_batch import array_bind, as_batch_query
+from .sql_query import (
+    party_accounts_sql,
+    party_addresses_sql,
+    party_default_addr_sql,
+    party_master_changes_sql,
+    party_master_sql,
+)
+
+_logger = getLogger(__name__)
+
+__all__ = ["EBS_PARTY_CACHE_TAG", "EbsMirrorService"]
+
+# responses built from EBS party rows, invalidated whenever the mirror changes
+EBS_PARTY_CACHE_TAG = "ebs:party"
+MIRROR_WATERMARK = "party_master"
+MIRROR_SYNC_LOCK = "ebs_mirror:party_master:syncing"
+# the first sync pulls every party
+EPOCH = datetime(1900, 1, 1)
+
+PARTY_FIELDS = [
+    field.name
+    for field in EbsPartyMirror._meta.concrete_fields
+    if not field.primary_key
+]
+SHIP_TO_FIELDS = ["party_id", "party_number", "party_name", "witp_code", "address"]
+ADDRESS_FIELDS = [
+    "party_id",
+    "party_name",
+    "witp_code",
+    "org_id",
+    "default_address",
+    "all_address",
+    "contact_person",
+    "mobile_number",
+]
+
+party_master_batch_sql = as_batch_query(party_master_sql, bind="party_id")
+party_accounts_batch_sql = as_batch_query(party_accounts_sql, bind="party_id")
+ship_to_batch_sql = as_batch_query(party_default_addr_sql)
+# keep the default and the other addresses of the same account together
+party_addresses_batch_sql = as_batch_query(party_addresses_sql).replace(
+    "WHERE D.PARTY_ID = A.PARTY_ID",
+    "WHERE D.PARTY_ID = A.PARTY_ID AND D.ACCOUNT_NUMBER = A.ACCOUNT_NUMBER",
+    1,
+)
+
+
+class EbsMirrorService:
+    @staticmethod
+    def _fetch(
+        connection: oracledb.Connection, sql: str, **binds: Sequence
+    ) -> List[Tuple]:
+        with ebs_fetch.cursor(connection, "party_mirror") as cursor:
+            arrays = {name: array_bind(connection, v) for name, v in binds.items()}
+            cursor.execute(sql, **arrays)
+            return cursor.fetchall()
+
+    @staticmethod
+    def changed_parties(
+        connection: oracledb.Connection, since: datetime
+    ) -> Tuple[List[int], datetime | None]:
+        """organization parties changed after ``since`` (naive EBS time) and the
+        latest ``LAST_UPDATE_DATE`` among them.
+        """
+        with ebs_fetch.cursor(connection, "party_mirror_changes") as cursor:
+            cursor.execute(party_master_changes_sql, since=since)
+            rows = cursor.fetchall()
+        latest = max((row[1] for row in rows), default=None)
+        return [row[0] for row in rows], latest
+
+    @classmethod
+    def pull_batch(
+        cls, connection: oracledb.Connection, party_ids: Sequence[int]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """mirror rows of the given parties, read with the lookup queries"""
+        party_rows = [
+            dict(zip(PARTY_FIELDS, row))
+            for row in cls._fetch(
+                connection, party_master_batch_sql, party_ids=party_ids
+            )
+        ]
+        for row in party_rows:
+            if isinstance(row["creation_date"], datetime):
+                row["creation_date"] = row["creation_date"].date()
+
+        witp_codes = sorted(
+            {
+                str(account_number)
+                for _, account_number in cls._fetch(
+                    connection, party_accounts_batch_sql, party_ids=party_ids
+                )
+                if account_number
+            }
+        )
+        ship_to_rows, address_rows = [], []
+        if witp_codes:
+            ship_to_rows = [
+                dict(zip(SHIP_TO_FIELDS, row))
+                for row in cls._fetch(
+                    connection, ship_to_batch_sql, witp_codes=witp_codes
+                )
+            ]
+            address_rows = [
+                dict(zip(ADDRESS_FIELDS, row))
+                for row in cls._fetch(
+                    connection, party_addresses_batch_sql, witp_codes=witp_codes
+                )
+            ]
+
+        return {
+            "parties": party_rows,
+            "ship_to": ship_to_rows,
+            "addresses": address_rows,
+        }
+
+    @staticmethod
+    def store_batch(
+        party_ids: Sequence[int], rows: Dict[str, List[Dict[str, Any]]]
+    ) -> None:
+        """replace the mirror rows of the given parties"""
+        party_ids = set(party_ids)
+        with transaction.atomic():
+            for model, key in (
+                (EbsPartyMirror, "parties"),
+                (EbsShipToMirror, "ship_to"),
+                (EbsPartyAddressMirror, "addresses"),
+            ):
+                model.objects.filter(party_id__in=party_ids).delete()
+                model.objects.bulk_create(
+                    model(**row) for row in rows[key] if row["party_id"] in party_ids
+                )
+
+    @staticmethod
+    def _session():
+        # a heavy slot & a session per batch, a full sync outlasts the lease of a
+        # slot. the sync waits for a slot rather than giving up
+        return ebs_pool.session(
+            "party_mirror", limit_timeout=settings.EBS_LIMITER_SYNC_TIMEOUT
+        )
+
+    @classmethod
+    def sync(cls, full: bool = False, batch_size: int | None = None) -> Dict[str, Any]:
+        """pull the parties changed in EBS since the watermark (all when ``full``)
+        and move the watermark forward once every batch is stored.
+        """
+        if not cache.add(MIRROR_SYNC_LOCK, True, settings.EBS_MIRROR_SYNC_LOCK):
+            _logger.info("EBS party mirror sync already running, skipped.")
+            return {"status": "skipped"}
+
+        try:
+            return cls._sync(full, batch_size or settings.EBS_MIRROR_BATCH_SIZE)
+        finally:
+            cache.delete(MIRROR_SYNC_LOCK)
+
+    @classmethod
+    def _sync(cls, full: bool, batch_size: int) -> Dict[str, Any]:
+        watermark, _ = EbsSyncWatermark.objects.get_or_create(name=MIRROR_WATERMARK)
+        since = EPOCH
+        if watermark.last_update_date and not full:
+            # rows committed late with an older LAST_UPDATE_DATE are read again
+            overlap = timedelta(seconds=settings.EBS_MIRROR_OVERLAP)
+            since = timezone.make_naive(watermark.last_update_date) - overlap
+
+        synced = failed = 0
+        with cls._session() as connection:
+            party_ids, latest = cls.changed_parties(connection, since)
+        for offset in range(0, len(party_ids), batch_size):
+            batch = party_ids[offset : offset + batch_size]
+            try:
+                with cls._session() as connection:
+                    rows = cls.pull_batch(connection, batch)
+                cls.store_batch(batch, rows)
+            except Exception as exc:
+                _logger.exception(exc)
+                failed += len(batch)
+                continue
+            synced += len(batch)
+
+        if synced:
+            invalidate_tags(EBS_PARTY_CACHE_TAG)
+        if failed:
+            # the watermark stays, the next sync pulls the failed parties again
+            _logger.error(f"EBS party mirror sync failed for {failed} parties.")
+        else:
+            if latest is not None:
+                watermark.last_update_date = timezone.make_aware(latest)
+            watermark.synced_at = timezone.now()
+            watermark.save(update_fields=["last_update_date", "synced_at"])
+
+        _logger.info(
+            f"EBS party mirror synced {synced} parties changed since {since}."
+        )
+        return {"synced": synced, "failed": failed, "since": str(since)}
+
+    @staticmethod
+    def is_ready() -> bool:
+        """whether the mirror was synced recently enough to be served"""
+        fresh_after = timezone.now() - timedelta(seconds=settings.EBS_MIRROR_MAX_LAG)
+        return EbsSyncWatermark.objects.filter(
+            name=MIRROR_WATERMARK, synced_at__gte=fresh_after
+        ).exists()
+
+    @classmethod
+    def get_basic_party(cls, witp_code: str) -> Dict[str, Any] | None:
+        """shaped like ``fetch_basic_party``, ``None`` to fall back to live EBS"""
+        if not cls.is_ready():
+            return None
+        return (
+            EbsShipToMirror.objects.filter(witp_code=str(witp_code))
+            .order_by("id")
+            .values(*SHIP_TO_FIELDS)
+            .first()
+        )
+
+    @classmethod
+    def get_basic_parties(cls, witp_codes: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """``get_basic_party`` of many WITP codes, the ones not mirrored are left out"""
+        if not cls.is_ready():
+            return {}
+        found = {}
+        for row in (
+            EbsShipToMirror.objects.filter(witp_code__in=witp_codes)
+            .order_by("id")
+            .values(*SHIP_TO_FIELDS)
+        ):
+            found.setdefault(row["witp_code"], row)
+        return found
+
+    @staticmethod
+    def _as_ebs_party(row: Dict[str, Any]) -> Dict[str, Any]:
+        creation_date = row["creation_date"]
+        if creation_date is not None:
+            # EBS returns the truncated creation date as a datetime
+            row["creation_date"] = datetime.combine(creation_date, time())
+        return {"id": row.pop("party_id"), **row}
+
+    @classmethod
+    def get_party_rows(cls, party_id: int) -> List[Dict[str, Any]] | None:
+        """shaped like ``EbsParty``, ``None`` to fall back to live EBS"""
+        return cls.get_parties_rows([party_id]).get(party_id)
+
+    @classmethod
+    def get_parties_rows(
+        cls, party_ids: Sequence[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """``get_party_rows`` of many parties, the ones not mirrored are left out"""
+        if not cls.is_ready():
+            return {}
+        found: Dict[int, List[Dict[str, Any]]] = {}
+        for row in (
+            EbsPartyMirror.objects.filter(party_id__in=party_ids)
+            .order_by("id")
+            .values(*PARTY_FIELDS)
+        ):
+            found.setdefault(row["party_id"], []).append(cls._as_ebs_party(row))
+        return found
+
+    @classmethod
+    def get_party_addresses(cls, witp_code: str) -> List[Dict[str, Any]] | None:
+        """shaped like ``PartyAddress``, ``None`` to fall back to live EBS"""
+        if not cls.is_ready():
+            return None
+        rows = list(
+            EbsPartyAddressMirror.objects.filter(witp_code=str(witp_code))
+            .order_by("id")
+            .values(*ADDRESS_FIELDS)
+        )
+        return rows or None
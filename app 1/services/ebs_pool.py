@@ -0,0 +1,177 @@
+"""
+Process wide Oracle EBS session pool.
+
+Every EBS call site acquires its session from here instead of opening a brand new
+connection. The pool is created lazily on first use, so gunicorn and celery prefork
+children each build their own pool after the fork instead of sharing the sockets
+of the parent process.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+from typing import Any, Dict, Iterator
+
+import oracledb
+from django.conf import settings
+
+from core.services.oracle_client import init_oracle_client
+
+from . import ebs_limiter
+
+_logger = getLogger(__name__)
+
+__all__ = [
+    "get_pool",
+    "acquire",
+    "deadline",
+    "session",
+    "close_pool",
+    "get_pool_stats",
+]
+
+_pool: oracledb.ConnectionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+# monotonic time the sessions taken in the current context must be done by
+_deadline: ContextVar[float | None] = ContextVar("ebs_deadline", default=None)
+
+
+def _create_pool() -> oracledb.ConnectionPool:
+    init_oracle_client()
+    pool = oracledb.create_pool(
+        **settings.EBS_CONN_PARAMS,
+        min=settings.EBS_POOL_MIN,
+        max=settings.EBS_POOL_MAX,
+        increment=settings.EBS_POOL_INCREMENT,
+        ping_interval=settings.EBS_POOL_PING_INTERVAL,
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=settings.EBS_POOL_WAIT_TIMEOUT,
+        stmtcachesize=settings.EBS_POOL_STMT_CACHE_SIZE,
+    )
+    _logger.info(
+        f"EBS session pool created for PID({os.getpid()}) "
+        f"min={pool.min} max={pool.max} increment={pool.increment}."
+    )
+    return pool
+
+
+def get_pool() -> oracledb.ConnectionPool:
+    """return the session pool of the current process, creating it on first use"""
+    global _pool, _pool_pid
+
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = _create_pool()
+            _pool_pid = pid
+    return _pool
+
+
+def acquire() -> oracledb.Connection:
+    """acquire a pooled EBS session. use it as a context manager to release it."""
+    return get_pool().acquire()
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """bound the sessions taken inside the block to ``seconds`` from now, their
+    wait for a limiter slot and every round trip of their queries included.
+    """
+    at = None if seconds is None else time.monotonic() + seconds
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _remaining() -> float | None:
+    at = _deadline.get()
+    if at is None:
+        return None
+    remaining = at - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("EBS time budget exhausted.")
+    return remaining
+
+
+@contextmanager
+def session(
+    query: str, limit_timeout: float | None = None
+) -> Iterator[oracledb.Connection]:
+    """pooled EBS session for running ``query``, within the cluster wide
+    concurrency limit of its class (see ``ebs_limiter``) and the current
+    ``deadline``.
+    """
+    remaining = _remaining()
+    if remaining is not None and (limit_timeout is None or remaining < limit_timeout):
+        limit_timeout = remaining
+
+    with ebs_limiter.slot(query, timeout=limit_timeout):
+        with acquire() as connection:
+            remaining = _remaining()
+            if remaining is None:
+                yield connection
+                return
+
+            # the driver breaks off a round trip past the deadline (DPI-1067), a
+            # late query must not keep its session & slot once nobody waits on it
+            connection.call_timeout = max(1, int(remaining * 1000))
+            try:
+                yield connection
+            finally:
+                try:
+                    connection.call_timeout = 0
+                except oracledb.Error as exc:
+                    _logger.exception(exc)
+
+
+def close_pool() -> None:
+    """close the pool of the current process (e.g. on worker shutdown)"""
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            try:
+                _pool.close(force=True)
+            except oracledb.Error as exc:
+                _logger.exception(exc)
+        _pool = None
+        _pool_pid = None
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """snapshot of the current process pool usage"""
+    if _pool is None or _pool_pid != os.getpid():
+        return {"pid": os.getpid(), "created": False}
+
+    return {
+        "pid": _pool_pid,
+        "created": True,
+        "min": _pool.min,
+        "max": _pool.max,
+        "increment": _pool.increment,
+        "opened": _pool.opened,
+        "busy": _pool.busy,
+        "ping_interval": _pool.ping_interval,
+        "wait_timeout": _pool.wait_timeout,
+    }
+
+
+def _reset_after_fork() -> None:
+    # the child must never reuse the sockets of the parent pool
+    global _pool, _pool_pid, _pool_lock
+
+    _pool = None
+    _pool_pid = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
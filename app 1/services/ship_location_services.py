@@ -1,12 +1,12 @@
 from dataclasses import asdict, dataclass
 from logging import getLogger
 
-import oracledb
-from django.conf import settings
 from oracledb.exceptions import DatabaseError
 from rest_framework.exceptions import APIException
 from rest_framework.status import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 
+from . import ebs_fetch, ebs_pool
+from .ebs_mirror_services import EbsMirrorService
 from .sql_query import party_addresses_sql
 
 logger = getLogger(__name__)
@@ -39,9 +39,13 @@ class PartyAddress:
 class ShipLocationService:
     @staticmethod
     def get_addresses_of_party(witp_code: str):
+        mirrored = EbsMirrorService.get_party_addresses(witp_code)
+        if mirrored is not None:
+            return mirrored
+
         try:
-            with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                with connection.cursor() as cursor:
+            with ebs_pool.session("party_addresses") as connection:
+                with ebs_fetch.cursor(connection, "party_addresses") as cursor:
                     cursor.execute(party_addresses_sql, witp_code=witp_code)
                     results = (
                         asdict(PartyAddress(*address)) for address in cursor.fetchall()
@@ -1547,3 +1547,100 @@ SELECT DISTINCT A.PARTY_ID,
   FROM DEFAULT_ADDRESS D, ALL_ADDRESS A, HZ_PARTIES HP
  WHERE D.PARTY_ID = A.PARTY_ID AND D.PARTY_ID = HP.PARTY_ID
 """
+
+party_master_sql = """
+SELECT DISTINCT
+    HP.PARTY_ID,
+    HCA.ACCOUNT_NUMBER,
+    HCA.ACCOUNT_NAME,
+    HP.PARTY_NAME,
+    HP.ADDRESS1,
+    LOC.ADDRESS_LINES_PHONETIC AS PH_ADDRESS,
+    HCA.SALES_CHANNEL_CODE AS Customer_Category,
+    TRUNC(HP.CREATION_DATE) AS CREATION_DATE,
+    HP.ADDRESS3 AS Division,
+    HP.ADDRESS4 AS District,
+    HP.POSTAL_CODE AS Police_Station,
+    PH.LAST_NAME,
+    PH.PHONE_NUMBER AS PH_CONTACT,
+    HP.ATTRIBUTE1 AS ZONE,
+    HP.ATTRIBUTE2 AS AREA,
+    HCA.CUSTOMER_CLASS_CODE AS Exclusive_Status,
+    PS.ADDRESSEE AS NID,
+    HP.JGZZ_FISCAL_CODE AS TIN,
+    HP.TAX_REFERENCE AS BIN,
+    PH.JOB_TITLE AS Birth_Day,
+    HP.DUNS_NUMBER AS Primary_Invest,
+    HP.YEAR_ESTABLISHED AS Present_Size,
+    HP.MISSION_STATEMENT AS Commitment_Size,
+    HP.EMAIL_ADDRESS,
+    APPS.SOFTLN_COM_PKG.GET_EMP_NAME_FROM_USER_ID(HP.CREATED_BY) AS Created_By
+FROM
+    HZ_PARTIES HP
+    LEFT JOIN HZ_CUST_ACCOUNTS HCA ON HP.PARTY_ID = HCA.PARTY_ID
+    LEFT JOIN APPS.SOFTLN_AR_CONTACTS_PHONE_V PH ON PH.CUSTOMER_ID = HCA.CUST_ACCOUNT_ID
+    JOIN APPS.HZ_PARTY_SITES PS ON PS.PARTY_ID = HP.PARTY_ID
+    JOIN APPS.HZ_LOCATIONS LOC ON PS.LOCATION_ID = LOC.LOCATION_ID
+WHERE
+    HP.PARTY_TYPE = 'ORGANIZATION'
+    AND HP.PARTY_ID = :party_id
+ORDER BY
+    HP.PARTY_ID
+"""
+
+party_master_changes_sql = """
+SELECT
+	CHANGES.PARTY_ID,
+	MAX (CHANGES.LAST_UPDATE_DATE) AS LAST_UPDATE_DATE
+FROM
+	(
+	SELECT HP.PARTY_ID, HP.LAST_UPDATE_DATE
+	FROM APPS.HZ_PARTIES HP
+	WHERE HP.LAST_UPDATE_DATE > :since
+	UNION ALL
+	SELECT HCA.PARTY_ID, HCA.LAST_UPDATE_DATE
+	FROM APPS.HZ_CUST_ACCOUNTS HCA
+	WHERE HCA.LAST_UPDATE_DATE > :since
+	UNION ALL
+	SELECT PS.PARTY_ID, PS.LAST_UPDATE_DATE
+	FROM APPS.HZ_PARTY_SITES PS
+	WHERE PS.LAST_UPDATE_DATE > :since
+	UNION ALL
+	SELECT PS.PARTY_ID, LOC.LAST_UPDATE_DATE
+	FROM APPS.HZ_PARTY_SITES PS, APPS.HZ_LOCATIONS LOC
+	WHERE PS.LOCATION_ID = LOC.LOCATION_ID
+		AND LOC.LAST_UPDATE_DATE > :since
+	UNION ALL
+	SELECT HCA.PARTY_ID, ACCT_USE.LAST_UPDATE_DATE
+	FROM APPS.HZ_CUST_ACCOUNTS HCA, APPS.HZ_CUST_ACCT_SITES_ALL ACCT_USE
+	WHERE HCA.CUST_ACCOUNT_ID = ACCT_USE.CUST_ACCOUNT_ID
+		AND ACCT_USE.LAST_UPDATE_DATE > :since
+	UNION ALL
+	SELECT HCA.PARTY_ID, SITE_USE.LAST_UPDATE_DATE
+	FROM
+		APPS.HZ_CUST_ACCOUNTS HCA,
+		APPS.HZ_CUST_ACCT_SITES_ALL ACCT_USE,
+		APPS.HZ_CUST_SITE_USES_ALL SITE_USE
+	WHERE HCA.CUST_ACCOUNT_ID = ACCT_USE.CUST_ACCOUNT_ID
+		AND ACCT_USE.CUST_ACCT_SITE_ID = SITE_USE.CUST_ACCT_SITE_ID
+		AND SITE_USE.LAST_UPDATE_DATE > :since
+	) CHANGES,
+	APPS.HZ_PARTIES PARTY
+WHERE
+	CHANGES.PARTY_ID = PARTY.PARTY_ID
+	AND PARTY.PARTY_TYPE = 'ORGANIZATION'
+GROUP BY
+	CHANGES.PARTY_ID
+ORDER BY
+	CHANGES.PARTY_ID
+"""
+
+party_accounts_sql = """
+SELECT
+	HCA.PARTY_ID,
+	HCA.ACCOUNT_NUMBER
+FROM
+	APPS.HZ_CUST_ACCOUNTS HCA
+WHERE
+	HCA.PARTY_ID = :party_id
+"""
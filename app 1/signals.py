@@ -1,10 +1,12 @@
 from logging import getLogger
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from core.constants import StatusChoices
+from core.services import delta_sync
+from core.services.cache import invalidate_tags, model_tag
 from pms.constants import EXISTING_PARTY, PMSRecommendationStages
 from recommendation_engine.models import (
     ApprovalQueue,
@@ -13,9 +15,16 @@ from recommendation_engine.models import (
 )
 
 from .models import (
+    Contact,
     CreditLimit,
+    CreditLimitDetail,
+    EbsCollectionDetail,
+    ExtraAttachment,
+    Guarantee,
     Party,
     PartyAttachment,
+    PartyDealing,
+    SecurityCheque,
     ShipLocation,
 )
 from .services.credit_limit_services import CreditLimitService
@@ -93,6 +102,88 @@ def generate_approval_chain(instance: Party | CreditLimit | ShipLocation, **kwar
     return instance
 
 
+@receiver(post_save, sender=Party)
+@receiver(post_delete, sender=Party)
+def invalidate_party_cache(sender, instance: Party, **kwargs):
+    tags = [model_tag(Party), model_tag(Party, instance.pk)]
+    if instance.next_node_id:
+        # the history of the next node counts this one
+        tags.append(model_tag(Party, instance.next_node_id))
+    invalidate_tags(*tags)
+
+
+@receiver(post_save, sender=CreditLimit)
+@receiver(post_delete, sender=CreditLimit)
+@receiver(post_save, sender=ShipLocation)
+@receiver(post_delete, sender=ShipLocation)
+def invalidate_application_cache(sender, instance, **kwargs):
+    invalidate_tags(model_tag(sender), model_tag(sender, instance.pk))
+
+
+# rendered with their party or credit limit, whose ETag must change with them
+PARTY_RELATED_MODELS = (
+    PartyDealing,
+    SecurityCheque,
+    Guarantee,
+    PartyAttachment,
+    ExtraAttachment,
+    Contact,
+)
+CREDIT_LIMIT_RELATED_MODELS = (CreditLimitDetail, EbsCollectionDetail)
+
+
+def invalidate_party_row(sender, instance, **kwargs):
+    invalidate_tags(model_tag(Party, instance.party_id))
+
+
+def invalidate_credit_limit_row(sender, instance, **kwargs):
+    invalidate_tags(model_tag(CreditLimit, instance.credit_limit_id))
+
+
+for _model in PARTY_RELATED_MODELS:
+    post_save.connect(invalidate_party_row, sender=_model)
+    post_delete.connect(invalidate_party_row, sender=_model)
+for _model in CREDIT_LIMIT_RELATED_MODELS:
+    post_save.connect(invalidate_credit_limit_row, sender=_model)
+    post_delete.connect(invalidate_credit_limit_row, sender=_model)
+
+
+@receiver(post_save, sender=ApprovalQueue)
+@receiver(post_delete, sender=ApprovalQueue)
+def invalidate_approval_queue_owner(sender, instance: ApprovalQueue, **kwargs):
+    model = ContentType.objects.get_for_id(instance.content_type_id).model_class()
+    if model is not None:
+        invalidate_tags(model_tag(model, instance.object_id))
+
+
+@receiver(post_delete, sender=Party)
+@receiver(post_delete, sender=CreditLimit)
+@receiver(post_delete, sender=ShipLocation)
+def record_application_tombstone(sender, instance, **kwargs):
+    delta_sync.record_deletion(instance)
+
+
+@receiver(pre_save, sender=Party)
+def track_party_archiving(sender, instance: Party, **kwargs):
+    # read by record_archived_party_tombstone, a party is archived only once
+    instance._was_archived = (
+        instance.status == StatusChoices.ARCHIVED
+        and instance.pk is not None
+        and Party.objects.filter(
+            pk=instance.pk, status=StatusChoices.ARCHIVED
+        ).exists()
+    )
+
+
+@receiver(post_save, sender=Party)
+def record_archived_party_tombstone(sender, instance: Party, **kwargs):
+    # the archived parties leave the lists like the deleted ones
+    if instance.status == StatusChoices.ARCHIVED and not getattr(
+        instance, "_was_archived", False
+    ):
+        delta_sync.record_deletion(instance)
+
+
 @receiver(post_delete, sender=PartyAttachment)
 def handle_party_delete_postwork(sender, instance, **kwargs):
     MediaRemover.remove_media(sender, instance, **kwargs)
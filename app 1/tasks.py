@@ -2,48 +2,133 @@ from datetime import datetime, timedelta
 from logging import getLogger
 from uuid import UUID
 
-import oracledb
 from celery import shared_task
+from celery.signals import worker_process_shutdown
+from celery.utils.time import get_exponential_backoff_interval
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
 
 from core.constants import StatusChoices
+from core.services import delta_sync
 from pms.models.credit_limit import CreditLimit
+from pms.services import ebs_cache, ebs_pool
 from pms.services.credit_limit_services import CreditLimitService
+from pms.services.credit_snapshot_services import CreditSnapshotService
+from pms.services.ebs_mirror_services import EbsMirrorService
 
 from .signals import generate_approval_chain
 
 _logger = getLogger(__name__)
 
 
+@worker_process_shutdown.connect
+def close_pools(**kwargs):
+    ebs_pool.close_pool()
+    for connection in connections.all(initialized_only=True):
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+
+
+class CreditLimitPostProcessError(Exception):
+    pass
+
+
+def _post_process_key(crl_id: UUID) -> str:
+    return f"credit_limit_post_process:{crl_id}"
+
+
+def _retry_or_dead_letter(task, crl: CreditLimit, exc: Exception):
+    """retry with exponential backoff & jitter, park the application when exhausted"""
+    if task.request.retries >= task.max_retries:
+        crl.ebs_pull_failed_at = timezone.now()
+        crl.ebs_pull_error = str(exc)[:500]
+        crl.save(update_fields=["ebs_pull_failed_at", "ebs_pull_error"])
+        _logger.error(
+            f"EBS post process gave up for CreditLimit({crl} | {crl.id}): {exc!r}"
+        )
+        return
+    countdown = get_exponential_backoff_interval(
+        factor=settings.CREDIT_LIMIT_POST_PROCESS_BACKOFF,
+        retries=task.request.retries,
+        maximum=settings.CREDIT_LIMIT_POST_PROCESS_MAX_BACKOFF,
+        full_jitter=True,
+    )
+    raise task.retry(exc=exc, countdown=countdown)
+
+
 @shared_task(
-    name="Credit Limit Post Process", bind=True, retry_kwargs={"max_retries": 10}
+    name="Credit Limit Post Process",
+    bind=True,
+    max_retries=settings.CREDIT_LIMIT_POST_PROCESS_MAX_RETRIES,
 )
 def run_credit_limit_post_process(self, crl_id: UUID):
     try:
         crl = CreditLimit.objects.get(id=crl_id)
-        with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-            row = CreditLimitService.get_party_grading(crl.witp_code, connection)
-            max_due_count = CreditLimitService.get_max_inv_due_count(
-                crl.witp_code, connection
-            )
-            party_status = CreditLimitService().get_party_status(
-                crl.witp_code, connection=connection
-            )
-            default_addr = CreditLimitService.get_party_default_addr(
-                crl.witp_code, connection
-            )
-            collections = CreditLimitService().get_party_collections(
-                crl.witp_code, connection
-            )
-
-            CreditLimitService.create_party_collections(crl, collections)
-            CreditLimitService.set_credit_limit_extra_details(
-                crl, row.grade, max_due_count, party_status, default_addr
-            )
-
-            generate_approval_chain(crl, row=row)
-    except (oracledb.DatabaseError, Exception) as exc:
-        raise self.retry(exc=exc, countdown=2)  # noqa: B904
+    except CreditLimit.DoesNotExist:
+        _logger.warning(f"CreditLimit({crl_id}) removed before its post process.")
+        return
+
+    # the results fetched by the previous attempts are kept across the retries
+    key = _post_process_key(crl_id)
+    collected, errors = CreditLimitService.collect_ebs_details(
+        crl.witp_code,
+        collected=cache.get(key),
+        time_budget=settings.CREDIT_LIMIT_EBS_TIME_BUDGET,
+    )
+    if errors:
+        cache.set(key, collected, settings.CREDIT_LIMIT_POST_PROCESS_MAX_BACKOFF * 2)
+        message = "; ".join(f"{name}: {exc!r}" for name, exc in errors.items())
+        _logger.warning(f"EBS post process failed for CreditLimit({crl_id}): {message}")
+        return _retry_or_dead_letter(self, crl, CreditLimitPostProcessError(message))
+
+    try:
+        row = collected["grade_row"]
+        crl.ebs_pull_failed_at = None
+        crl.ebs_pull_error = None
+        CreditLimitService.create_party_collections(crl, collected["collections"])
+        CreditLimitService.set_credit_limit_extra_details(
+            crl,
+            row.grade,
+            collected["max_due_count"],
+            collected["party_status"],
+            collected["default_addr"],
+        )
+
+        generate_approval_chain(crl, row=row)
+    except Exception as exc:
+        _logger.exception(exc)
+        return _retry_or_dead_letter(self, crl, exc)
+
+    cache.delete(key)
+
+
+@shared_task(name="refresh_ebs_result", ignore_result=True)
+def refresh_ebs_result(query: str, witp_code: str, window: list):
+    try:
+        ebs_cache.refresh(query, witp_code, window)
+    except Exception as exc:
+        # the stale entry is kept and served until the next refresh succeeds
+        _logger.exception(exc)
+
+
+@shared_task(name="sync_ebs_credit_snapshot", time_limit=settings.EBS_SYNC_TIME_LIMIT)
+def sync_ebs_credit_snapshot():
+    result = CreditSnapshotService.sync()
+    _logger.info(f"EBS credit snapshot sync finished: {result}")
+    return {"status": "EBS credit snapshot synced.", **result}
+
+
+@shared_task(name="sync_ebs_party_mirror", time_limit=settings.EBS_SYNC_TIME_LIMIT)
+def sync_ebs_party_mirror(full: bool = False):
+    result = EbsMirrorService.sync(full=full)
+    return {"status": "EBS party mirror synced.", **result}
+
+
+@shared_task(name="prune_tombstones", ignore_result=True)
+def prune_tombstones():
+    delta_sync.prune_tombstones()
 
 
 @shared_task(name="credit_limit_cleanup", bind=True, retry_kwargs={"max_retries": 10})
@@ -0,0 +1,233 @@
+import threading
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from celery.exceptions import Retry
+
+from pms import tasks
+from pms.models.credit_limit import CreditLimit
+from pms.services import credit_limit_services, ebs_pool
+from pms.services.credit_limit_services import CreditLimitService, PartyGradeRow
+from pms.services.credit_snapshot_services import CreditSnapshotService
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+GRADE_ROW = PartyGradeRow(witp_code="W-1", grade="A")
+
+
+@pytest.fixture
+def ebs(monkeypatch):
+    """EBS loaders counting their calls, ``failing`` ones raise, ``slow`` ones hang"""
+    calls = {}
+    failing, slow = set(), set()
+    release = threading.Event()
+
+    def loader(name, value):
+        def load(witp_code):
+            calls[name] = calls.get(name, 0) + 1
+            if name in failing:
+                raise credit_limit_services.OracleServiceException
+            if name in slow:
+                release.wait(5)
+            return value
+
+        return staticmethod(load)
+
+    for name, attr, value in [
+        ("grade_row", "get_party_grading", GRADE_ROW),
+        ("max_due_count", "get_max_inv_due_count", 3),
+        ("party_status", "get_party_status", None),
+        ("default_addr", "get_party_default_addr", "Dhaka"),
+    ]:
+        monkeypatch.setattr(CreditLimitService, attr, loader(name, value))
+    monkeypatch.setattr(
+        credit_limit_services,
+        "_fetch_party_collections",
+        loader("collections", [{"closing_balance": 10}]).__func__,
+    )
+    monkeypatch.setattr(CreditSnapshotService, "get_ebs_details", lambda code: {})
+    yield SimpleNamespace(calls=calls, failing=failing, slow=slow)
+    release.set()
+
+
+def test_collect_ebs_details_keeps_a_null_column_as_a_result(ebs) -> None:
+    collected, errors = CreditLimitService.collect_ebs_details("W-1")
+
+    assert errors == {}
+    assert collected["party_status"] is None
+    assert collected["grade_row"] == GRADE_ROW
+
+
+def test_collect_ebs_details_reports_the_errors_per_query(ebs) -> None:
+    ebs.failing.add("max_due_count")
+    ebs.slow.add("collections")
+
+    collected, errors = CreditLimitService.collect_ebs_details("W-1", time_budget=0.2)
+
+    assert set(errors) == {"max_due_count", "collections"}
+    assert isinstance(
+        errors["max_due_count"], credit_limit_services.OracleServiceException
+    )
+    assert isinstance(errors["collections"], TimeoutError)
+    assert set(collected) == {"grade_row", "party_status", "default_addr"}
+
+
+def test_collect_ebs_details_passes_its_budget_to_the_sessions(
+    ebs, monkeypatch
+) -> None:
+    monkeypatch.setattr(
+        CreditLimitService,
+        "get_party_grading",
+        staticmethod(lambda witp_code: ebs_pool._remaining()),
+    )
+
+    collected, _ = CreditLimitService.collect_ebs_details("W-1", time_budget=30)
+
+    assert 0 < collected["grade_row"] <= 30
+
+
+def test_collect_ebs_details_skips_what_was_already_collected(ebs) -> None:
+    collected, errors = CreditLimitService.collect_ebs_details(
+        "W-1", collected={"grade_row": GRADE_ROW, "default_addr": "Khulna"}
+    )
+
+    assert errors == {}
+    assert collected["default_addr"] == "Khulna"
+    assert "grade_row" not in ebs.calls
+    assert "default_addr" not in ebs.calls
+
+
+class FakeConnection:
+    call_timeout = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def connection(monkeypatch, settings):
+    settings.EBS_LIMITER_ENABLED = False
+    connection = FakeConnection()
+    monkeypatch.setattr(ebs_pool, "acquire", lambda: connection)
+    return connection
+
+
+def test_session_bounds_the_round_trips_to_the_deadline(connection) -> None:
+    with ebs_pool.deadline(2):
+        with ebs_pool.session("party_status") as con:
+            assert 0 < con.call_timeout <= 2000
+
+    # the pooled session goes back without the timeout of this caller
+    assert connection.call_timeout == 0
+
+
+def test_session_sets_no_call_timeout_without_a_deadline(connection) -> None:
+    with ebs_pool.session("party_status") as con:
+        assert con.call_timeout == 0
+
+
+def test_session_is_refused_once_the_deadline_passed(connection, monkeypatch) -> None:
+    monkeypatch.setattr(
+        ebs_pool, "acquire", lambda: pytest.fail("no session past the deadline")
+    )
+
+    with ebs_pool.deadline(0):
+        with pytest.raises(TimeoutError):
+            with ebs_pool.session("party_status"):
+                pass
+
+
+@pytest.fixture
+def credit_limit(monkeypatch):
+    """the application of the task, its post process steps recorded"""
+    crl = SimpleNamespace(id=uuid4(), witp_code="W-1", saved=[], processed=[])
+    crl.save = lambda update_fields=None: crl.saved.append(update_fields)
+
+    class StubCreditLimit:
+        DoesNotExist = CreditLimit.DoesNotExist
+        objects = SimpleNamespace(get=lambda id: crl)
+
+    monkeypatch.setattr(tasks, "CreditLimit", StubCreditLimit)
+    monkeypatch.setattr(
+        CreditLimitService,
+        "create_party_collections",
+        staticmethod(lambda instance, collections: crl.processed.append(collections)),
+    )
+    monkeypatch.setattr(
+        CreditLimitService,
+        "set_credit_limit_extra_details",
+        staticmethod(lambda instance, *details: crl.processed.append(details)),
+    )
+    monkeypatch.setattr(tasks, "generate_approval_chain", lambda instance, row: None)
+    return crl
+
+
+def test_a_retry_only_runs_the_queries_that_failed(
+    ebs, credit_limit, local_cache, monkeypatch
+) -> None:
+    retried = []
+    monkeypatch.setattr(
+        tasks, "_retry_or_dead_letter", lambda task, crl, exc: retried.append(exc)
+    )
+    ebs.failing.add("party_status")
+
+    tasks.run_credit_limit_post_process.run(credit_limit.id)
+
+    assert len(retried) == 1
+    assert "party_status" in str(retried[0])
+    assert credit_limit.processed == []
+
+    ebs.failing.clear()
+    tasks.run_credit_limit_post_process.run(credit_limit.id)
+
+    assert len(retried) == 1
+    assert ebs.calls == {
+        "grade_row": 1,
+        "max_due_count": 1,
+        "party_status": 2,
+        "default_addr": 1,
+        "collections": 1,
+    }
+    assert credit_limit.processed == [
+        [{"closing_balance": 10}],
+        ("A", 3, None, "Dhaka"),
+    ]
+    assert local_cache.get(tasks._post_process_key(credit_limit.id)) is None
+
+
+def _task(retries: int):
+    def retry(exc, countdown):
+        task.countdown = countdown
+        return Retry(exc=exc, when=countdown)
+
+    task = SimpleNamespace(
+        request=SimpleNamespace(retries=retries), max_retries=8, retry=retry
+    )
+    return task
+
+
+@pytest.mark.parametrize("retries", [0, 3, 7])
+def test_retry_backs_off_exponentially_with_jitter(
+    credit_limit, settings, retries
+) -> None:
+    settings.CREDIT_LIMIT_POST_PROCESS_BACKOFF = 5
+    settings.CREDIT_LIMIT_POST_PROCESS_MAX_BACKOFF = 60 * 10
+    task = _task(retries)
+
+    with pytest.raises(Retry):
+        tasks._retry_or_dead_letter(task, credit_limit, RuntimeError("EBS down"))
+
+    assert 0 <= task.countdown <= min(60 * 10, 5 * 2**retries)
+    assert credit_limit.saved == []
+
+
+def test_exhausted_retries_park_the_application(credit_limit) -> None:
+    tasks._retry_or_dead_letter(_task(8), credit_limit, RuntimeError("EBS down"))
+
+    assert credit_limit.saved == [["ebs_pull_failed_at", "ebs_pull_error"]]
+    assert credit_limit.ebs_pull_failed_at is not None
+    assert credit_limit.ebs_pull_error == "EBS down"
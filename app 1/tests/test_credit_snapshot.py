@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from pms.models import EbsCollectionSnapshot, EbsCreditSnapshot
+from pms.services import credit_limit_services
+from pms.services.credit_limit_services import CreditLimitService, PartyGradeRow
+
+djangodb = pytest.mark.django_db
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+LIVE = {
+    "get_party_grading": PartyGradeRow(witp_code="W-1", grade="B"),
+    "get_max_inv_due_count": 9,
+    "get_party_status": "WATCHFUL",
+    "get_party_default_addr": "Live EBS",
+}
+
+
+@pytest.fixture
+def ebs(monkeypatch):
+    """live EBS loaders recording the queries they were asked"""
+    calls = []
+
+    def loader(name, value):
+        def load(witp_code):
+            calls.append(name)
+            return value
+
+        return load
+
+    for attr, value in LIVE.items():
+        monkeypatch.setattr(CreditLimitService, attr, staticmethod(loader(attr, value)))
+    monkeypatch.setattr(
+        credit_limit_services,
+        "_fetch_party_collections",
+        loader("collections", [{"closing_balance": 10}]),
+    )
+    return calls
+
+
+def _snapshot(witp_code="W-1", synced_at=None):
+    snapshot = EbsCreditSnapshot.objects.create(
+        witp_code=witp_code,
+        party_name="Snapshot",
+        grade="A",
+        closing_balance=Decimal("250.00"),
+        max_due_days=2,
+        customer_status="REGULAR",
+        default_addr="Dhaka",
+        status_start_date=date(2026, 1, 1),
+        status_end_date=date(2026, 10, 1),
+        synced_at=synced_at or timezone.now(),
+    )
+    EbsCollectionSnapshot.objects.create(
+        snapshot=snapshot,
+        org_id="101",
+        party_id="7",
+        account_number=witp_code,
+        org_type="SALES",
+        closing_balance=Decimal("250.00"),
+    )
+    return snapshot
+
+
+@djangodb
+def test_a_fresh_snapshot_is_read_instead_of_live_ebs(ebs) -> None:
+    _snapshot()
+
+    collected, errors = CreditLimitService.collect_ebs_details(" W-1 ")
+
+    assert errors == {}
+    assert ebs == []
+    assert collected["grade_row"].grade == "A"
+    assert collected["grade_row"].closing_balance == Decimal("250.00")
+    assert collected["max_due_count"] == 2
+    assert collected["party_status"] == "REGULAR"
+    assert collected["default_addr"] == "Dhaka"
+    assert [row["org_type"] for row in collected["collections"]] == ["SALES"]
+    assert collected["collections"][0]["account_number"] == "W-1"
+
+
+@djangodb
+def test_a_stale_snapshot_falls_back_to_live_ebs(ebs, settings) -> None:
+    settings.EBS_SNAPSHOT_MAX_AGE = 60 * 60
+    _snapshot(synced_at=timezone.now() - timedelta(hours=2))
+
+    collected, errors = CreditLimitService.collect_ebs_details("W-1")
+
+    assert errors == {}
+    assert sorted(ebs) == sorted([*LIVE, "collections"])
+    assert collected["grade_row"].grade == "B"
+    assert collected["party_status"] == "WATCHFUL"
+    assert collected["default_addr"] == "Live EBS"
+    assert collected["collections"] == [{"closing_balance": 10}]
+
+
+@djangodb
+def test_a_party_without_a_snapshot_falls_back_to_live_ebs(ebs) -> None:
+    _snapshot(witp_code="W-2")
+
+    collected, errors = CreditLimitService.collect_ebs_details("W-3")
+
+    assert errors == {}
+    assert len(ebs) == 5
+    assert collected["max_due_count"] == 9
+
+
+@djangodb
+def test_what_was_already_collected_wins_over_the_snapshot(ebs) -> None:
+    _snapshot()
+
+    collected, _ = CreditLimitService.collect_ebs_details(
+        "W-1", collected={"default_addr": "Khulna"}
+    )
+
+    assert ebs == []
+    assert collected["default_addr"] == "Khulna"
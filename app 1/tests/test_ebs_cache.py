@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from pms import tasks
+from pms.services import ebs_cache
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+QUERY = "test_party_limit"
+loads = []
+
+
+@ebs_cache.cached_query(QUERY)
+def _fetch_party_limit(witp_code: str, *window: str, connection=None):
+    loads.append((witp_code, *window))
+    return None if witp_code == "UNKNOWN" else {"witp_code": witp_code, "limit": 5}
+
+
+@pytest.fixture(autouse=True)
+def ebs_cache_settings(settings):
+    settings.EBS_RESULT_CACHE_TTL = {QUERY: 60}
+    settings.EBS_RESULT_CACHE_STALE_TTL = 600
+    settings.EBS_RESULT_CACHE_NEGATIVE_TTL = 30
+    settings.EBS_RESULT_CACHE_REFRESH_LOCK = 60
+    loads.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """the wall clock of the entries & of the in-memory cache expiry, moved by hand"""
+    now = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    def advance(seconds: float) -> None:
+        now[0] += seconds
+
+    return advance
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        tasks.refresh_ebs_result, "delay", lambda *args: scheduled.append(args)
+    )
+    return scheduled
+
+
+def test_a_fresh_entry_is_served_without_asking_ebs(clock, refreshes) -> None:
+    first = _fetch_party_limit("W-1", "01-Oct-2026")
+    clock(59)
+
+    assert _fetch_party_limit("W-1", "01-Oct-2026") == first
+    assert loads == [("W-1", "01-Oct-2026")]
+    assert refreshes == []
+
+
+def test_the_window_is_part_of_the_key(refreshes) -> None:
+    _fetch_party_limit("W-1", "01-Oct-2026")
+    _fetch_party_limit("W-1", "02-Oct-2026")
+
+    assert len(loads) == 2
+
+
+def test_a_stale_entry_is_served_while_celery_refreshes_it(clock, refreshes) -> None:
+    first = _fetch_party_limit("W-1", "01-Oct-2026")
+    clock(61)
+
+    assert _fetch_party_limit("W-1", "01-Oct-2026") == first
+    assert _fetch_party_limit("W-1", "01-Oct-2026") == first
+    # a single refresh is scheduled, the callers never wait on EBS
+    assert refreshes == [(QUERY, "W-1", ["01-Oct-2026"])]
+    assert len(loads) == 1
+
+    ebs_cache.refresh(*refreshes[0])
+    assert len(loads) == 2
+    clock(59)
+    _fetch_party_limit("W-1", "01-Oct-2026")
+    assert len(refreshes) == 1
+
+
+def test_an_entry_past_its_stale_window_is_loaded_again(clock, refreshes) -> None:
+    _fetch_party_limit("W-1", "01-Oct-2026")
+    clock(60 + 600 + 1)
+
+    _fetch_party_limit("W-1", "01-Oct-2026")
+
+    assert len(loads) == 2
+    assert refreshes == []
+
+
+def test_an_unknown_witp_code_is_remembered_shortly(clock, refreshes) -> None:
+    assert _fetch_party_limit("UNKNOWN", "01-Oct-2026") is None
+    clock(29)
+    assert _fetch_party_limit("UNKNOWN", "01-Oct-2026") is None
+    assert len(loads) == 1
+
+    clock(2)
+    assert _fetch_party_limit("UNKNOWN", "01-Oct-2026") is None
+
+    assert len(loads) == 2
+    # a negative entry expires, it is never refreshed in the background
+    assert refreshes == []
+
+
+def test_invalidate_drops_the_entry(refreshes) -> None:
+    _fetch_party_limit("W-1", "01-Oct-2026")
+
+    ebs_cache.invalidate(QUERY, "W-1", "01-Oct-2026")
+    _fetch_party_limit("W-1", "01-Oct-2026")
+
+    assert len(loads) == 2
@@ -0,0 +1,65 @@
+import pytest
+import redis
+
+from pms.services import ebs_limiter
+
+
+def test_slot_fails_open_when_redis_is_unreachable(monkeypatch, settings) -> None:
+    settings.EBS_LIMITER_ENABLED = True
+
+    def unreachable():
+        raise redis.ConnectionError("redis is down")
+
+    monkeypatch.setattr(ebs_limiter, "_get_client", unreachable)
+
+    ran = False
+    with ebs_limiter.slot("party_status"):
+        ran = True
+    assert ran
+
+
+def test_slot_is_skipped_when_the_limiter_is_off(monkeypatch, settings) -> None:
+    settings.EBS_LIMITER_ENABLED = False
+
+    def unexpected(*args):
+        raise AssertionError("the limiter must not be asked for a slot")
+
+    monkeypatch.setattr(ebs_limiter, "_acquire", unexpected)
+
+    with ebs_limiter.slot("party_status"):
+        pass
+
+
+def test_slot_raises_busy_when_no_slot_frees_up(monkeypatch, settings) -> None:
+    settings.EBS_LIMITER_ENABLED = True
+    monkeypatch.setattr(ebs_limiter, "_acquire", lambda *args: False)
+    monkeypatch.setattr(ebs_limiter, "_record", lambda *args: None)
+
+    with pytest.raises(ebs_limiter.EbsBusyException):
+        with ebs_limiter.slot("party_status", timeout=0):
+            pass
+
+
+def test_slot_is_released_after_the_block(monkeypatch, settings) -> None:
+    settings.EBS_LIMITER_ENABLED = True
+    released = []
+
+    class Client:
+        def zrem(self, key, token):
+            released.append(key)
+
+    monkeypatch.setattr(ebs_limiter, "_acquire", lambda *args: True)
+    monkeypatch.setattr(ebs_limiter, "_record", lambda *args: None)
+    monkeypatch.setattr(ebs_limiter, "_get_client", Client)
+
+    with pytest.raises(ValueError):
+        with ebs_limiter.slot("party_status"):
+            raise ValueError("query failed")
+    assert released == [ebs_limiter._slots_key("heavy")]
+
+
+def test_get_query_class_defaults_to_the_default_class(settings) -> None:
+    settings.EBS_QUERY_CLASSES = {"party_status": "heavy"}
+
+    assert ebs_limiter.get_query_class("party_status") == "heavy"
+    assert ebs_limiter.get_query_class("party_grading") == ebs_limiter.DEFAULT_CLASS
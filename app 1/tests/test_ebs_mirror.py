@@ -0,0 +1,149 @@
+from dataclasses import fields
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from pms.models import EbsPartyMirror, EbsShipToMirror, EbsSyncWatermark
+from pms.services import ebs_pool
+from pms.services.ebs_mirror_services import MIRROR_WATERMARK, EbsMirrorService
+from pms.views import ebs_party
+from pms.views.ebs_party import EbsParty, EbsPartyViewSet
+
+djangodb = pytest.mark.django_db
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+LIVE_SHIP_TO = ("2", "P-2", "Live", "W-2", "Khulna")
+
+
+def _party_row(party_id: int) -> tuple:
+    row = dict.fromkeys(field.name for field in fields(EbsParty))
+    row["id"] = party_id
+    row["party_name"] = "Live"
+    return tuple(row.values())
+
+
+@pytest.fixture
+def ebs(monkeypatch):
+    """live EBS knowing W-2 & party 2, recording what it was asked"""
+    queried = []
+
+    def fetch_one(key, fetch):
+        queried.append(key)
+        return LIVE_SHIP_TO if key.endswith("W-2") else None
+
+    def fetch_batch(sql, **binds):
+        queried.append(binds)
+        if "W-2" in binds.get("witp_codes", []):
+            return [LIVE_SHIP_TO]
+        if 2 in binds.get("party_ids", []):
+            return [_party_row(2)]
+        return []
+
+    monkeypatch.setattr(ebs_party, "coalesce", fetch_one)
+    monkeypatch.setattr(ebs_party, "_fetch_batch", fetch_batch)
+    return queried
+
+
+@pytest.fixture
+def mirror():
+    """the mirror knows W-1 & party 1, synced a minute ago"""
+    EbsShipToMirror.objects.create(
+        party_id=1, party_number="P-1", party_name="Mirrored", witp_code="W-1"
+    )
+    EbsPartyMirror.objects.create(
+        party_id=1, party_name="Mirrored", creation_date=date(2020, 5, 1)
+    )
+    return EbsSyncWatermark.objects.create(
+        name=MIRROR_WATERMARK,
+        last_update_date=timezone.now(),
+        synced_at=timezone.now() - timedelta(minutes=1),
+    )
+
+
+def _lag_behind(watermark, settings) -> None:
+    settings.EBS_MIRROR_MAX_LAG = 60 * 60
+    watermark.synced_at = timezone.now() - timedelta(hours=2)
+    watermark.save(update_fields=["synced_at"])
+
+
+@djangodb
+def test_the_mirror_is_ready_once_synced_within_the_lag(mirror, settings) -> None:
+    assert EbsMirrorService.is_ready()
+
+    _lag_behind(mirror, settings)
+
+    assert not EbsMirrorService.is_ready()
+    assert EbsMirrorService.get_basic_party("W-1") is None
+    assert EbsMirrorService.get_parties_rows([1]) == {}
+
+
+@djangodb
+def test_the_mirror_is_not_ready_before_its_first_sync() -> None:
+    EbsShipToMirror.objects.create(party_id=1, witp_code="W-1")
+
+    assert EbsMirrorService.get_basic_party("W-1") is None
+    assert EbsMirrorService.get_basic_parties(["W-1"]) == {}
+
+
+@djangodb
+def test_a_mirrored_party_is_served_without_live_ebs(mirror, ebs) -> None:
+    party = ebs_party.fetch_basic_party("W-1")
+    parties, missing = ebs_party.fetch_parties([1])
+
+    assert party["party_name"] == "Mirrored"
+    assert party["party_id"] == 1
+    # shaped like the live EBS rows
+    assert parties[1][0]["id"] == 1
+    assert parties[1][0]["creation_date"] == datetime(2020, 5, 1)
+    assert missing == []
+    assert ebs == []
+
+
+@djangodb
+def test_a_party_missing_from_the_mirror_falls_back_to_live_ebs(mirror, ebs) -> None:
+    party = ebs_party.fetch_basic_party("W-2")
+    parties, missing = ebs_party.fetch_basic_parties(["W-1", "W-2", "W-3"])
+    rows, missing_ids = ebs_party.fetch_parties([1, 2])
+
+    assert party["party_name"] == "Live"
+    assert parties["W-1"]["party_name"] == "Mirrored"
+    assert parties["W-2"]["party_name"] == "Live"
+    assert missing == ["W-3"]
+    assert rows[1][0]["party_name"] == "Mirrored"
+    assert rows[2][0]["party_name"] == "Live"
+    assert missing_ids == []
+    # only the parties the mirror misses are asked from EBS
+    assert ebs == [
+        "ebs:basic_party:W-2",
+        {"witp_codes": ["W-2", "W-3"]},
+        {"party_ids": [2]},
+    ]
+
+
+@djangodb
+def test_a_stale_mirror_falls_back_to_live_ebs(mirror, ebs, settings) -> None:
+    _lag_behind(mirror, settings)
+
+    parties, missing = ebs_party.fetch_basic_parties(["W-1", "W-2"])
+    rows, missing_ids = ebs_party.fetch_parties([1, 2])
+
+    assert list(parties) == ["W-2"]
+    assert missing == ["W-1"]
+    assert list(rows) == [2]
+    assert missing_ids == [1]
+    assert ebs == [{"witp_codes": ["W-1", "W-2"]}, {"party_ids": [1, 2]}]
+
+
+@djangodb
+def test_retrieve_with_party_id_reads_the_mirror_first(mirror, monkeypatch) -> None:
+    monkeypatch.setattr(
+        ebs_pool, "session", lambda name: pytest.fail("no EBS for a mirrored party")
+    )
+    view = EbsPartyViewSet.as_view({"get": "retrieve_with_party_id"})
+
+    response = view(APIRequestFactory().get("/ebs/party/1"), pk="1")
+
+    assert response.status_code == 200
+    assert [row["party_name"] for row in response.data] == ["Mirrored"]
@@ -0,0 +1,97 @@
+from dataclasses import fields
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from pms.services.ebs_mirror_services import EbsMirrorService
+from pms.views import ebs_party
+from pms.views.ebs_party import EbsParty, EbsPartyBatchSerializer, EbsPartyViewSet
+
+MIRRORED = {"party_id": "1", "party_name": "Mirrored", "witp_code": "W-1"}
+
+
+def _party_row(party_id: int) -> tuple:
+    row = dict.fromkeys(field.name for field in fields(EbsParty))
+    row["id"] = party_id
+    return tuple(row.values())
+
+
+@pytest.fixture
+def ebs(monkeypatch):
+    """the mirror knows W-1, live EBS W-2 & party 7, nothing else exists"""
+    queried = []
+
+    def fetch_batch(sql, **binds):
+        queried.append(binds)
+        if "W-2" in binds.get("witp_codes", []):
+            return [("2", "P-2", "Live", "W-2", "Dhaka")]
+        if 7 in binds.get("party_ids", []):
+            return [_party_row(7), _party_row(7)]
+        return []
+
+    monkeypatch.setattr(
+        EbsMirrorService,
+        "get_basic_parties",
+        lambda codes: {"W-1": MIRRORED} if "W-1" in codes else {},
+    )
+    monkeypatch.setattr(EbsMirrorService, "get_parties_rows", lambda ids: {})
+    monkeypatch.setattr(ebs_party, "_fetch_batch", fetch_batch)
+    return queried
+
+
+def _batch(data, user=None):
+    view = EbsPartyViewSet.as_view({"post": "batch"}, **EbsPartyViewSet.batch.kwargs)
+    request = APIRequestFactory().post("/ebs/batch", data, format="json")
+    if user is not None:
+        force_authenticate(request, user=user)
+    return view(request)
+
+
+def test_batch_needs_an_authenticated_user(ebs) -> None:
+    response = _batch({"witp_codes": ["W-1"]})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert ebs == []
+
+
+def test_batch_maps_the_witp_codes_found_and_lists_the_missing(ebs) -> None:
+    user = get_user_model()(username="ebs")
+
+    response = _batch({"witp_codes": ["W-1", " W-2", "W-3", "W-1"]}, user=user)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(response.data["results"]) == ["W-1", "W-2"]
+    assert response.data["results"]["W-1"] == MIRRORED
+    assert response.data["results"]["W-2"]["party_name"] == "Live"
+    assert response.data["missing"] == ["W-3"]
+    # the mirrored code is not asked from EBS again
+    assert ebs == [{"witp_codes": ["W-2", "W-3"]}]
+
+
+def test_batch_groups_the_rows_of_each_party_id(ebs) -> None:
+    response = _batch({"party_ids": [7, 8]}, user=get_user_model()(username="ebs"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"][7]) == 2
+    assert response.data["missing"] == [8]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"witp_codes": ["W-1"], "party_ids": [7]},
+        {"witp_codes": []},
+        {"party_ids": ["seven"]},
+        {"witp_codes": ["W"] * (ebs_party.EBS_BATCH_LOOKUP_MAX_SIZE + 1)},
+    ],
+)
+def test_batch_serializer_wants_either_codes_or_ids(data) -> None:
+    assert not EbsPartyBatchSerializer(data=data).is_valid()
+
+
+@pytest.mark.parametrize("data", [{"witp_codes": ["W-1"]}, {"party_ids": [7]}])
+def test_batch_serializer_accepts_one_kind_of_lookup(data) -> None:
+    assert EbsPartyBatchSerializer(data=data).is_valid()
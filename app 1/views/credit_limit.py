@@ -16,9 +16,26 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ViewSet
 
 from core.constants import StatusChoices
+from core.mixins import (
+    DeltaSyncMixin,
+    ReplicaReadMixin,
+    minimal_response,
+    prefers_minimal_return,
+)
 from core.openapi_metadata.metadata import OpenApiTags
-from core.pagination import StandardResultSetPagination
+from core.pagination import KeysetResultSetPagination
 from core.renderer import CustomRenderer
+from core.services import counts
+from core.services.cache import model_tag
+from core.services.delta_sync import UPDATED_SINCE_QUERY_PARAM
+from core.services.etags import conditional_response, row_version
+from core.services.idempotency import IDEMPOTENCY_HEADER, idempotent
+from core.services.streaming import (
+    JSON,
+    NDJSON,
+    STREAM_QUERY_PARAM,
+    get_stream_format,
+)
 from pms.constants import PMSRecommendationStages
 
 from ..models import CreditLimit, CreditLimitDetail
@@ -64,23 +81,34 @@ class RoleNotDefinedException(exceptions.APIException):
 
 
 @extend_schema(tags=[OpenApiTags.PMS_CREDIT_LIMIT_APPLICATION])
-class CreditLimitViewSet(ViewSet):
+class CreditLimitViewSet(ReplicaReadMixin, DeltaSyncMixin, ViewSet):
     queryset = CreditLimit.objects.all().order_by("-created_at")
     serializer_class = CreditLimitSerializer
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
-    pagination_class = StandardResultSetPagination
+    pagination_class = KeysetResultSetPagination
+    count_strategy = counts.CACHED
     required_scopes = ["read"]
     renderer_classes = (CustomRenderer,)
 
     def _send_paginate_response(self, request, queryset):
         paginator = self.pagination_class()
         paginator.set_page_size(request)
+        context = self.serializer_class.sparse_context(request)
+        if stream_format := get_stream_format(request):
+            return paginator.get_streaming_response(
+                queryset,
+                request,
+                self.serializer_class(context=context),
+                stream_format,
+                view=self,
+            )
         qs = paginator.paginate_queryset(
             queryset,
             request,
+            view=self,
         )
-        serialized_data = self.serializer_class(instance=qs, many=True)
+        serialized_data = self.serializer_class(instance=qs, many=True, context=context)
         return paginator.get_paginated_response(serialized_data.data)
 
     @staticmethod
@@ -150,6 +178,21 @@ class CreditLimitViewSet(ViewSet):
                 required=False,
                 description="Format: YYYY-MM-DD",
             ),
+            OpenApiParameter(
+                STREAM_QUERY_PARAM,
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                required=False,
+                enum=[NDJSON, JSON],
+                description="stream the page as NDJSON or as chunked JSON",
+            ),
+            OpenApiParameter(
+                UPDATED_SINCE_QUERY_PARAM,
+                OpenApiTypes.DATETIME,
+                OpenApiParameter.QUERY,
+                required=False,
+                description="only the changes since the watermark of the last sync",
+            ),
         ]
     )
     def list(self, request: Request) -> Response:
@@ -172,9 +215,24 @@ class CreditLimitViewSet(ViewSet):
         end_date = request.query_params.get("end_date")
         queryset = self._filter_by_date_range(queryset, start_date, end_date)
 
+        # changes since the last sync
+        queryset = self.filter_updated_since(request, queryset)
+
         return self._send_paginate_response(request, queryset)
 
-    @extend_schema(request=CreditLimitSerializer)
+    @extend_schema(
+        request=CreditLimitSerializer,
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                OpenApiTypes.STR,
+                OpenApiParameter.HEADER,
+                required=False,
+                description="retries with the same key get the first response",
+            ),
+        ],
+    )
+    @idempotent
     def create(self, request: Request) -> Response:
         """Create new Credit Limit"""
         serialized_data = CreditLimitSerializer(data=request.data)
@@ -217,8 +275,14 @@ class CreditLimitViewSet(ViewSet):
         serialized_instance.save()
 
         logging.info(f"Credit limit with id {pk!r} partially updated.")
+        if prefers_minimal_return(request):
+            return minimal_response(serialized_instance.instance)
         return Response(serialized_instance.data)
 
+    @conditional_response(
+        parts=lambda view, request, pk: row_version(CreditLimit, pk),
+        tags=lambda view, request, pk: [model_tag(CreditLimit, pk)],
+    )
     def retrieve(self, request: Request, pk: uuid.UUID) -> Response:
         """Retrieve a single party"""
         try:
@@ -227,7 +291,9 @@ class CreditLimitViewSet(ViewSet):
             logging.error(f"Credit limit with id {pk!r} does not exist.")
             raise CreditLimitApplicationNotFoundException from e
 
-        serialized_credit_limit = self.serializer_class(instance=orm_instance)
+        serialized_credit_limit = self.serializer_class(
+            instance=orm_instance, context=self.serializer_class.sparse_context(request)
+        )
         logging.info(f"Credit limit with id {pk!r} retrieved successfully.")
         return Response(serialized_credit_limit.data)
 
@@ -1,16 +1,17 @@
+from contextlib import ExitStack
 from dataclasses import asdict, dataclass
 from datetime import date
 from http import HTTPMethod
 from logging import getLogger
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence, Tuple
 
-import oracledb
-from django.conf import settings
-from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
-from django.views.decorators.cache import cache_page
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from oauth2_provider.contrib.rest_framework.authentication import OAuth2Authentication
+from oauth2_provider.contrib.rest_framework.permissions import (
+    IsAuthenticatedOrTokenHasScope,
+)
 from oracledb.exceptions import DatabaseError
 from rest_framework import exceptions, serializers, status
 from rest_framework.decorators import action
@@ -20,11 +21,33 @@ from rest_framework.viewsets import ViewSet
 
 from core.openapi_metadata.metadata import OpenApiTags
 from core.renderer import CustomRenderer
+from core.services.cache import cache_response
+from core.services.single_flight import coalesce
+from core.services.streaming import (
+    JSON,
+    NDJSON,
+    STREAM_QUERY_PARAM,
+    get_stream_format,
+    streaming_response,
+)
+
+from ..services import ebs_fetch, ebs_pool
+from ..services.ebs_batch import array_bind, as_batch_query
+from ..services.ebs_mirror_services import EBS_PARTY_CACHE_TAG, EbsMirrorService
+from ..services.sql_query import party_master_sql
 
 logger = getLogger("pms.views.ebs_party")
 
 __all__ = ["EbsPartyViewSet", "EbsPartyCollectionViewSet"]
 
+EBS_CACHING_TIME = 60 * 60 * 4  # 4 Hours
+EBS_BATCH_LOOKUP_MAX_SIZE = 500
+
+
+def stream_format_parts(view, request: Request, *args, **kwargs) -> List[str | None]:
+    # the NDJSON ``Accept`` is not in the url, a stream must not hit a cached page
+    return [get_stream_format(request)]
+
 
 class InvalidWitpCodeException(exceptions.APIException):
     status_code = status.HTTP_400_BAD_REQUEST
@@ -119,6 +142,28 @@ class EbsPartyShipLocationSerializer(serializers.Serializer):
     party_number = serializers.CharField()
 
 
+class EbsPartyBatchSerializer(serializers.Serializer):
+    witp_codes = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False,
+        max_length=EBS_BATCH_LOOKUP_MAX_SIZE,
+        required=False,
+    )
+    party_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=EBS_BATCH_LOOKUP_MAX_SIZE,
+        required=False,
+    )
+
+    def validate(self, attrs):
+        if bool(attrs.get("witp_codes")) == bool(attrs.get("party_ids")):
+            raise serializers.ValidationError(
+                _("Provide either witp_codes or party_ids.")
+            )
+        return attrs
+
+
 class EbsPartySerializer(serializers.Serializer):
     party_id = serializers.IntegerField()
     account_number = serializers.CharField(max_length=255)
@@ -147,46 +192,6 @@ class EbsPartySerializer(serializers.Serializer):
     created_by = serializers.CharField(max_length=255)
 
 
-EBS_PARTY_QUERY_STRING = """
-SELECT DISTINCT
-    HP.PARTY_ID,
-    HCA.ACCOUNT_NUMBER,
-    HCA.ACCOUNT_NAME,
-    HP.PARTY_NAME,
-    HP.ADDRESS1,
-    LOC.ADDRESS_LINES_PHONETIC AS PH_ADDRESS,
-    HCA.SALES_CHANNEL_CODE AS Customer_Category,
-    TRUNC(HP.CREATION_DATE) AS CREATION_DATE,
-    HP.ADDRESS3 AS Division,
-    HP.ADDRESS4 AS District,
-    HP.POSTAL_CODE AS Police_Station,
-    PH.LAST_NAME,
-    PH.PHONE_NUMBER AS PH_CONTACT,
-    HP.ATTRIBUTE1 AS ZONE,
-    HP.ATTRIBUTE2 AS AREA,
-    HCA.CUSTOMER_CLASS_CODE AS Exclusive_Status,
-    PS.ADDRESSEE AS NID,
-    HP.JGZZ_FISCAL_CODE AS TIN,
-    HP.TAX_REFERENCE AS BIN,
-    PH.JOB_TITLE AS Birth_Day,
-    HP.DUNS_NUMBER AS Primary_Invest,
-    HP.YEAR_ESTABLISHED AS Present_Size,
-    HP.MISSION_STATEMENT AS Commitment_Size,
-    HP.EMAIL_ADDRESS,
-    APPS.SOFTLN_COM_PKG.GET_EMP_NAME_FROM_USER_ID(HP.CREATED_BY) AS Created_By
-FROM
-    HZ_PARTIES HP
-    LEFT JOIN HZ_CUST_ACCOUNTS HCA ON HP.PARTY_ID = HCA.PARTY_ID
-    LEFT JOIN APPS.SOFTLN_AR_CONTACTS_PHONE_V PH ON PH.CUSTOMER_ID = HCA.CUST_ACCOUNT_ID
-    JOIN APPS.HZ_PARTY_SITES PS ON PS.PARTY_ID = HP.PARTY_ID
-    JOIN APPS.HZ_LOCATIONS LOC ON PS.LOCATION_ID = LOC.LOCATION_ID
-WHERE
-    HP.PARTY_TYPE = 'ORGANIZATION'
-    AND HP.PARTY_ID = :party_id
-ORDER BY
-    HP.PARTY_ID
-"""
-
 EBS_PARTY_QUERY_STRING_WITP = """
 SELECT DISTINCT
     HP.PARTY_ID AS ID,
@@ -262,13 +267,23 @@ WHERE
 	AND ACCT_USE.STATUS = 'A'
 """
 
+PARY_BASIC_INFORMATION_BATCH_QUERY = as_batch_query(PARY_BASIC_INFORMATION_QUERY)
+PARTY_MASTER_BATCH_QUERY = as_batch_query(party_master_sql, bind="party_id")
+
 
 def fetch_basic_party(witp_code: str) -> Dict[str, Any]:
-    try:
-        with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-            with connection.cursor() as cursor:
+    result = EbsMirrorService.get_basic_party(witp_code)
+    if result is not None:
+        return result
+
+    def _fetch():
+        with ebs_pool.session("basic_party") as connection:
+            with ebs_fetch.cursor(connection, "basic_party") as cursor:
                 cursor.execute(PARY_BASIC_INFORMATION_QUERY, witp_code=witp_code)
-                queryset = cursor.fetchone()
+                return cursor.fetchone()
+
+    try:
+        queryset = coalesce(f"ebs:basic_party:{witp_code}", _fetch)
     except DatabaseError as exc:
         logger.exception(exc)
         raise OracleServiceException(str(exc)) from exc
@@ -281,6 +296,60 @@ def fetch_basic_party(witp_code: str) -> Dict[str, Any]:
     return result
 
 
+def _fetch_batch(sql: str, **binds: Sequence) -> List[Tuple]:
+    try:
+        with ebs_pool.session("party_batch") as connection:
+            with ebs_fetch.cursor(connection, "party_batch") as cursor:
+                cursor.execute(
+                    sql,
+                    **{name: array_bind(connection, v) for name, v in binds.items()},
+                )
+                return cursor.fetchall()
+    except DatabaseError as exc:
+        logger.exception(exc)
+        raise OracleServiceException(str(exc)) from exc
+
+
+def fetch_basic_parties(
+    witp_codes: Sequence[str],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """``fetch_basic_party`` of many WITP codes in a single query, keyed by WITP code,
+    along with the codes not found.
+    """
+    codes = list(dict.fromkeys(str(code).strip() for code in witp_codes))
+    found = EbsMirrorService.get_basic_parties(codes)
+    pending = [code for code in codes if code not in found]
+    if pending:
+        for row in _fetch_batch(PARY_BASIC_INFORMATION_BATCH_QUERY, witp_codes=pending):
+            info = asdict(EbsPartyShipLocationInfo(*row))
+            found.setdefault(str(info["witp_code"]), info)
+
+    results = {code: found[code] for code in codes if code in found}
+    missing = [code for code in codes if code not in found]
+    logger.info(f"Retrieved {len(results)} parties, {len(missing)} WITP codes missing.")
+    return results, missing
+
+
+def fetch_parties(
+    party_ids: Sequence[int],
+) -> Tuple[Dict[int, List[Dict[str, Any]]], List[int]]:
+    """``EbsParty`` rows of many parties in a single query, keyed by party ID, along
+    with the IDs not found.
+    """
+    ids = list(dict.fromkeys(int(party_id) for party_id in party_ids))
+    found = EbsMirrorService.get_parties_rows(ids)
+    pending = [party_id for party_id in ids if party_id not in found]
+    if pending:
+        for row in _fetch_batch(PARTY_MASTER_BATCH_QUERY, party_ids=pending):
+            party = asdict(EbsParty(*row))
+            found.setdefault(party["id"], []).append(party)
+
+    results = {party_id: found[party_id] for party_id in ids if party_id in found}
+    missing = [party_id for party_id in ids if party_id not in found]
+    logger.info(f"Retrieved {len(results)} parties, {len(missing)} party IDs missing.")
+    return results, missing
+
+
 @extend_schema(tags=[OpenApiTags.EBS_ROUTES])
 class EbsPartyViewSet(ViewSet):
     # TODO: Need to give the Response serializer type
@@ -301,12 +370,35 @@ class EbsPartyViewSet(ViewSet):
             )
         ],
     )
-    @method_decorator(cache_page(60 * 60 * 4))
+    @cache_response(EBS_CACHING_TIME, tags=[EBS_PARTY_CACHE_TAG])
     def retrieve(self, request: Request, pk: int) -> Response:
         """Retrieve an existing Party Information with WITP CODE"""
         response = fetch_basic_party(pk)
         return Response(response)
 
+    @extend_schema(
+        request=EbsPartyBatchSerializer,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(
+        detail=False,
+        methods=[HTTPMethod.POST],
+        url_path="batch",
+        # unlike the single lookups, a bulk read of the parties needs a login
+        authentication_classes=[OAuth2Authentication],
+        permission_classes=[IsAuthenticatedOrTokenHasScope],
+    )
+    def batch(self, request: Request) -> Response:
+        """Retrieve many Party Information at once with WITP CODEs or Party IDs"""
+        serializer = EbsPartyBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if witp_codes := serializer.validated_data.get("witp_codes"):
+            results, missing = fetch_basic_parties(witp_codes)
+        else:
+            results, missing = fetch_parties(serializer.validated_data["party_ids"])
+        return Response({"results": results, "missing": missing})
+
     @extend_schema(
         responses={200: EbsPartySerializer},
         parameters=[
@@ -315,7 +407,7 @@ class EbsPartyViewSet(ViewSet):
             )
         ],
     )
-    @method_decorator(cache_page(60 * 60 * 4))
+    @cache_response(EBS_CACHING_TIME, tags=[EBS_PARTY_CACHE_TAG])
     @action(detail=True, methods=[HTTPMethod.GET], url_path="partyid")
     def retrieve_with_party_id(self, request: Request, pk: int):
         """Retrieve an existing Party Information with Party ID"""
@@ -325,10 +417,14 @@ class EbsPartyViewSet(ViewSet):
             logger.error(f"Invalid party ID: {pk!r}. {str(exc)!r}")
             raise InvalidWitpCodeException(f"{pk!r} is not a valid number.") from exc
 
+        mirrored = EbsMirrorService.get_party_rows(pk)
+        if mirrored is not None:
+            return Response(mirrored)
+
         try:
-            with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                with connection.cursor() as cursor:
-                    cursor.execute(EBS_PARTY_QUERY_STRING, party_id=pk)
+            with ebs_pool.session("party_master") as connection:
+                with ebs_fetch.cursor(connection, "party_master") as cursor:
+                    cursor.execute(party_master_sql, party_id=pk)
                     queryset = cursor.fetchall()
         except DatabaseError as exc:
             logger.exception(exc)
@@ -361,25 +457,87 @@ class EbsPartyCollectionViewSet(ViewSet):
 
         return create_row
 
+    def _stream_collections(self, witp_code: str, stream_format: str):
+        """stream the ledger rows one fetch (the ``arraysize`` of the
+        "party_collection_stream" profile) at a time, the session is held until the
+        response is closed.
+        """
+        from .ebs_collection_query import COLLECTION_QUERY_STR
+
+        # the limiter slot and the session are held until the response is closed
+        stack = ExitStack()
+        try:
+            connection = stack.enter_context(
+                ebs_pool.session("party_collection_stream")
+            )
+        except DatabaseError as exc:
+            logger.exception(exc)
+            raise OracleServiceException(str(exc)) from exc
+        cursor = stack.enter_context(
+            ebs_fetch.cursor(connection, "party_collection_stream")
+        )
+        _release = stack.close
+
+        try:
+            cursor.execute(COLLECTION_QUERY_STR, witp_code=witp_code)
+            cursor.rowfactory = self.dict_provider(cursor)
+            first_batch = cursor.fetchmany()
+        except DatabaseError as exc:
+            _release()
+            logger.exception(exc)
+            raise OracleServiceException(str(exc)) from exc
+        if not first_batch:
+            _release()
+            logger.warning(f"No party found with party ID {witp_code!r}.")
+            raise PartyNotFoundException
+
+        def batches():
+            rows = first_batch
+            while rows:
+                yield rows
+                try:
+                    rows = cursor.fetchmany()
+                except DatabaseError as exc:
+                    # the status is already sent, the client gets a truncated body
+                    logger.exception(exc)
+                    raise
+
+        logger.info(f"Streaming party collections for party ID {witp_code!r}.")
+        return streaming_response(batches(), stream_format, on_close=_release)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
                 name="id", type=OpenApiTypes.STR, location=OpenApiParameter.PATH
-            )
+            ),
+            OpenApiParameter(
+                name=STREAM_QUERY_PARAM,
+                type=OpenApiTypes.STR,
+                enum=[NDJSON, JSON],
+                description="stream the rows as NDJSON or as chunked JSON",
+            ),
         ],
     )
-    @method_decorator(cache_page(60 * 60 * 4))
+    @cache_response(
+        EBS_CACHING_TIME, tags=[EBS_PARTY_CACHE_TAG], vary_on=stream_format_parts
+    )
     @action(detail=True, methods=[HTTPMethod.GET], url_path="bywitp")
     def retrieve_with_party_id(self, request: Request, pk: int):
         """Retrieve an existing Party Information with Party ID"""
         from .ebs_collection_query import COLLECTION_QUERY_STR
 
-        try:
-            with oracledb.connect(params=settings.EBS_CONN_PARAMS) as connection:
-                with connection.cursor() as cursor:
+        if stream_format := get_stream_format(request):
+            return self._stream_collections(pk, stream_format)
+
+        def _fetch():
+            with ebs_pool.session("party_collection_ledger") as connection:
+                with ebs_fetch.cursor(connection, "party_collection_ledger") as cursor:
                     cursor.execute(COLLECTION_QUERY_STR, witp_code=pk)
                     cursor.rowfactory = self.dict_provider(cursor)
-                    queryset = cursor.fetchall()
+                    return cursor.fetchall()
+
+        try:
+            queryset = coalesce(f"ebs:party_collection:{pk}", _fetch)
         except DatabaseError as exc:
             logger.exception(exc)
             raise OracleServiceException(str(exc)) from exc
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from http import HTTPMethod
 from logging import getLogger
 
@@ -20,9 +20,32 @@ from rest_framework.viewsets import ViewSet
 
 from auth_users.models import User
 from core.constants import StatusChoices
+from core.mixins import (
+    DeltaSyncMixin,
+    ReplicaReadMixin,
+    minimal_response,
+    prefers_minimal_return,
+)
 from core.openapi_metadata.metadata import OpenApiTags
-from core.pagination import StandardResultSetPagination
+from core.pagination import KeysetResultSetPagination
 from core.renderer import CustomRenderer
+from core.services import counts
+from core.services.cache import model_tag
+from core.services.delta_sync import UPDATED_SINCE_QUERY_PARAM
+from core.services.etags import conditional_response, row_version
+from core.services.idempotency import IDEMPOTENCY_HEADER, idempotent
+from core.services.streaming import (
+    JSON,
+    NDJSON,
+    STREAM_QUERY_PARAM,
+    get_stream_format,
+)
+from dropdown_repository.pms.models import (
+    DistrictLov,
+    DivisionLov,
+    PartyCategoryLov,
+    PoliceStationLov,
+)
 from pms.constants import PMSRecommendationStages
 
 from ..exceptions import PartyNotFoundException
@@ -53,15 +76,27 @@ def is_ebs_team(role: Group) -> bool:
     return role.name.lower() == target_role_name
 
 
+def party_version(view, request: Request, pk: uuid.UUID):
+    version = row_version(Party, pk)
+    # the expired documents are computed against the current day
+    return None if version is None else [*version, date.today()]
+
+
+def party_tags(view, request: Request, pk: uuid.UUID):
+    lovs = (DivisionLov, DistrictLov, PartyCategoryLov, PoliceStationLov)
+    return [model_tag(Party, pk), *(model_tag(lov) for lov in lovs)]
+
+
 @extend_schema(tags=[OpenApiTags.PARTY])
-class PartyViewSet(ViewSet):
+class PartyViewSet(ReplicaReadMixin, DeltaSyncMixin, ViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = Party.objects.filter(~Q(status=StatusChoices.ARCHIVED)).order_by(
         "-created_at"
     )
     serializer_class = PartySerializer
-    pagination_class = StandardResultSetPagination
+    pagination_class = KeysetResultSetPagination
+    count_strategy = counts.CACHED
     required_scopes = ["read"]
     renderer_classes = [
         CustomRenderer,
@@ -96,6 +131,21 @@ class PartyViewSet(ViewSet):
                 required=False,
                 description="Format: YYYY-MM-DD",
             ),
+            OpenApiParameter(
+                STREAM_QUERY_PARAM,
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                required=False,
+                enum=[NDJSON, JSON],
+                description="stream the page as NDJSON or as chunked JSON",
+            ),
+            OpenApiParameter(
+                UPDATED_SINCE_QUERY_PARAM,
+                OpenApiTypes.DATETIME,
+                OpenApiParameter.QUERY,
+                required=False,
+                description="only the changes since the watermark of the last sync",
+            ),
         ]
     )
     def list(self, request: Request) -> Response:  # noqa: C901
@@ -194,13 +244,29 @@ class PartyViewSet(ViewSet):
 
         paginator = self.pagination_class()
         paginator.set_page_size(request)
-        paginated_queryset = paginator.paginate_queryset(
-            self.queryset.prefetch_related("dealing", "contacts", "attachments"),
-            request,
+        prefetches = [
+            lookup
+            for lookup in ("dealing", "contacts", "attachments")
+            if self.serializer_class.is_requested_by(request, lookup)
+        ]
+        queryset = self.queryset.prefetch_related(*prefetches)
+        queryset = self.filter_updated_since(request, queryset)
+        context = self.serializer_class.sparse_context(request)
+        if stream_format := get_stream_format(request):
+            return paginator.get_streaming_response(
+                queryset,
+                request,
+                self.serializer_class(context=context),
+                stream_format,
+                view=self,
+            )
+        paginated_queryset = paginator.paginate_queryset(queryset, request, view=self)
+        serialized_data = self.serializer_class(
+            instance=paginated_queryset, many=True, context=context
         )
-        serialized_data = self.serializer_class(instance=paginated_queryset, many=True)
         return paginator.get_paginated_response(serialized_data.data)
 
+    @conditional_response(parts=party_version, tags=party_tags)
     def retrieve(self, request: Request, pk: uuid.UUID) -> Response:
         """Retrieve a single party"""
         try:
@@ -209,11 +275,25 @@ class PartyViewSet(ViewSet):
             logger.error(f"Party with id {pk!r} does not exist.")
             raise PartyNotFoundException from e
 
-        serialized_party = self.serializer_class(instance=party)
+        serialized_party = self.serializer_class(
+            instance=party, context=self.serializer_class.sparse_context(request)
+        )
         logger.info(f"Retrieved party ID {pk!r}.")
         return Response(serialized_party.data)
 
-    @extend_schema(request=PartySerializer)
+    @extend_schema(
+        request=PartySerializer,
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                OpenApiTypes.STR,
+                OpenApiParameter.HEADER,
+                required=False,
+                description="retries with the same key get the first response",
+            ),
+        ],
+    )
+    @idempotent
     def create(self, request: Request) -> Response:
         """Create new Party"""
         serialized_data = PartySerializer(data=request.data)
@@ -242,6 +322,8 @@ class PartyViewSet(ViewSet):
 
         serialized_data.validated_data["updated_by"] = request.user
         serialized_data.save()
+        if prefers_minimal_return(request):
+            return minimal_response(serialized_data.instance)
         return Response(serialized_data.data)
 
     @extend_schema(
@@ -404,6 +486,6 @@ class PartyViewSet(ViewSet):
 
         paginator = self.pagination_class()
         paginator.set_page_size(request)
-        paginated_queryset = paginator.paginate_queryset(qs.all(), request)
+        paginated_queryset = paginator.paginate_queryset(qs.all(), request, view=self)
         serialized_data = self.serializer_class(instance=paginated_queryset, many=True)
         return paginator.get_paginated_response(serialized_data.data)
@@ -20,9 +20,24 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
 from core.constants import StatusChoices
+from core.mixins import (
+    DeltaSyncMixin,
+    ReplicaReadMixin,
+    minimal_response,
+    prefers_minimal_return,
+)
 from core.openapi_metadata.metadata import OpenApiTags
-from core.pagination import StandardResultSetPagination
+from core.pagination import KeysetResultSetPagination
 from core.renderer import CustomRenderer
+from core.services import counts
+from core.services.delta_sync import UPDATED_SINCE_QUERY_PARAM
+from core.services.idempotency import IDEMPOTENCY_HEADER, idempotent
+from core.services.streaming import (
+    JSON,
+    NDJSON,
+    STREAM_QUERY_PARAM,
+    get_stream_format,
+)
 from pms.constants import PMSRecommendationStages
 
 from ..models import ShipLocation
@@ -54,12 +69,13 @@ class PartyNotFoundException(exceptions.APIException):
 
 
 @extend_schema(tags=[OpenApiTags.PMS_SHIP_LOCATION_APPLICATION])
-class ShipLocationViewSet(ViewSet):
+class ShipLocationViewSet(ReplicaReadMixin, DeltaSyncMixin, ViewSet):
     queryset = ShipLocation.objects.all().order_by("-created_at")
     serializer_class = ShipLocationSerializer
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
-    pagination_class = StandardResultSetPagination
+    pagination_class = KeysetResultSetPagination
+    count_strategy = counts.CACHED
     required_scopes = ["read"]
     renderer_classes = (CustomRenderer,)
 
@@ -99,6 +115,21 @@ class ShipLocationViewSet(ViewSet):
                 required=False,
                 description="Format: YYYY-MM-DD",
             ),
+            OpenApiParameter(
+                STREAM_QUERY_PARAM,
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                required=False,
+                enum=[NDJSON, JSON],
+                description="stream the page as NDJSON or as chunked JSON",
+            ),
+            OpenApiParameter(
+                UPDATED_SINCE_QUERY_PARAM,
+                OpenApiTypes.DATETIME,
+                OpenApiParameter.QUERY,
+                required=False,
+                description="only the changes since the watermark of the last sync",
+            ),
         ]
     )
     def list(self, request: Request) -> Response:  # noqa: C901
@@ -192,16 +223,38 @@ class ShipLocationViewSet(ViewSet):
             logger.error("could not parse the given dates in url params")
             logger.exception(exc)
 
+        self.queryset = self.filter_updated_since(request, self.queryset)
         paginator = self.pagination_class()
         paginator.set_page_size(request)
+        if stream_format := get_stream_format(request):
+            return paginator.get_streaming_response(
+                self.queryset,
+                request,
+                self.serializer_class(),
+                stream_format,
+                view=self,
+            )
         paginated_queryset = paginator.paginate_queryset(
             self.queryset,
             request,
+            view=self,
         )
         serialized_data = self.serializer_class(instance=paginated_queryset, many=True)
         return paginator.get_paginated_response(serialized_data.data)
 
-    @extend_schema(request=ShipLocationCreateSerializer)
+    @extend_schema(
+        request=ShipLocationCreateSerializer,
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                OpenApiTypes.STR,
+                OpenApiParameter.HEADER,
+                required=False,
+                description="retries with the same key get the first response",
+            ),
+        ],
+    )
+    @idempotent
     def create(self, request: Request) -> Response:
         """Create new Shipment Location Change Application"""
         serialized_data = ShipLocationCreateSerializer(data=request.data)
@@ -247,6 +300,8 @@ class ShipLocationViewSet(ViewSet):
             logger.error(f"Validation error for id {pk!r} : {str(payload.errors)!r}")
             raise exceptions.ValidationError(payload.errors)
         payload.save()
+        if prefers_minimal_return(request):
+            return minimal_response(payload.instance)
         credit_limit_serialized = self.serializer_class(instance=payload.instance)
         logger.info(f"Partially updated ship location of id {pk!r}")
         return Response(credit_limit_serialized.data)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TmsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tms"
+
+    def ready(self) -> None:
+        import tms.signals  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tms", "0025_alter_tender_analytics_note_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tender",
+            index=models.Index(
+                fields=["created_at", "id"], name="tms_tender_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tms", "0026_tender_tms_tender_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["updated_at", "id"], name="tms_notif_updated_id_idx"
+            ),
+        ),
+    ]
@@ -38,3 +38,9 @@ class Notification(models.Model):
             self.team_name = self.tender.team_name.team_name
             self.tender_type = self.tender.tender_type.type_name
         super().save(*args, **kwargs)
+
+    class Meta:
+        # delta sync of the lists
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="tms_notif_updated_id_idx")
+        ]
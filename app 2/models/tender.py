@@ -108,6 +108,12 @@ class Tender(AuditLogMixin):
 
         super().save(*args, **kwargs)
 
+    class Meta:
+        # keyset pagination of the lists
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="tms_tender_created_id_idx")
+        ]
+
 
 # This table store the bank guarentee extention data as well as its validity date.
 class BGValidityDate(AuditLogMixin):
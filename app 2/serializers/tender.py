@@ -3,6 +3,8 @@ from django.db.models import FloatField
 from django.db.models.functions import Cast
 from rest_framework import serializers
 
+from core.mixins import SparseFieldsMixin
+
 from ..models.participant_bids import ParticipantBid
 from ..models.tender import Tender
 from ..serializers.contract_agreement import PaymentSerializer, VendorSerializer
@@ -18,7 +20,7 @@ from .product import (
 from .time_stamp_serializer import TenderSubmissionTimeStampsSerializer
 
 
-class TenderSerializer(serializers.ModelSerializer):
+class TenderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     products = ProductSerializer(many=True, read_only=True)
     bg_valid_dates = BGValidityDateSerializer(many=True, read_only=True)
     tender_submission_timestamp = TenderSubmissionTimeStampsSerializer(
@@ -31,6 +33,18 @@ class TenderSerializer(serializers.ModelSerializer):
     vendor = VendorSerializer(many=True, read_only=True)
     payment = PaymentSerializer(many=True, read_only=True)
 
+    expandable_fields = (
+        "products",
+        "bg_valid_dates",
+        "tender_submission_timestamp",
+        "noa",
+        "participant_bid",
+        "contract_agreement",
+        "vendor",
+        "payment",
+        "lower_bids",
+    )
+
     class Meta:
         model = Tender
         fields = "__all__"
@@ -45,22 +59,17 @@ class TenderSerializer(serializers.ModelSerializer):
             if domain.endswith("/"):
                 domain = domain[:-1]
 
-        representation["bg_attachment"] = process_attachment(
-            instance.bg_attachment, domain
-        )
-        # Process pretender_meeting_attachment
-        representation["pretender_meeting_attachment"] = process_attachment(
-            instance.pretender_meeting_attachment, domain
-        )
-        # Process external_application_attach
-        representation["external_application_attach"] = process_attachment(
-            instance.external_application_attach, domain
-        )
-
-        # Process technical_compliance_sheet
-        representation["technical_compliance_sheet"] = process_attachment(
-            instance.technical_compliance_sheet, domain
-        )
+        for attachment in (
+            "bg_attachment",
+            "pretender_meeting_attachment",
+            "external_application_attach",
+            "technical_compliance_sheet",
+        ):
+            # left out with ?fields=
+            if attachment in representation:
+                representation[attachment] = process_attachment(
+                    getattr(instance, attachment), domain
+                )
         # Process vendor attachments
         if "vendor" in representation:
             vendors = []
@@ -82,7 +91,7 @@ class TenderSerializer(serializers.ModelSerializer):
                 payments.append(payment_data)
             representation["payment"] = payments
 
-        if instance.participant_bid.exists():
+        if "participant_bid" in representation and instance.participant_bid.exists():
             ordered_bids = instance.participant_bid.annotate(
                 bid_price_numeric=Cast("biding_price", FloatField())
             ).order_by("bid_price_numeric")
@@ -90,7 +99,7 @@ class TenderSerializer(serializers.ModelSerializer):
                 ordered_bids, many=True
             ).data
 
-        if instance.participant_bid.exists():
+        if self.is_requested("lower_bids") and instance.participant_bid.exists():
             ordered_bids = instance.participant_bid.annotate(
                 bid_price_numeric=Cast("biding_price", FloatField())
             ).order_by("bid_price_numeric")
@@ -102,13 +111,13 @@ class TenderSerializer(serializers.ModelSerializer):
                 f"lower_bid_{i+1}": bid.biding_price for i, bid in enumerate(lower_bids)
             }
 
-        if instance.team_name:
+        if "team_name" in representation and instance.team_name:
             representation["team_name"] = {
                 "id": instance.team_name.id,
                 "name": instance.team_name.team_name,
             }
 
-        if instance.tender_type:
+        if "tender_type" in representation and instance.tender_type:
             representation["tender_type"] = {
                 "id": instance.tender_type.id,
                 "name": instance.tender_type.type_name,
@@ -0,0 +1,74 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services import delta_sync
+from core.services.cache import invalidate_tags, model_tag
+
+from .models.contract_agreement import (
+    ContractAgreement,
+    Payment,
+    PGReleasedDate,
+    Vendor,
+)
+from .models.noa import BGReleasedDate, NotificationOfAward
+from .models.notification import Notification
+from .models.participant_bids import ParticipantBid
+from .models.product import Product, ProductAnalysis, ProductSpacification
+from .models.tender import (
+    BGValidityDate,
+    Ministry,
+    Participant,
+    Tender,
+    TenderSubmissionTimeStamps,
+)
+
+# rendered with their tender, whose ETag must change with them
+TENDER_RELATED_MODELS = (
+    Product,
+    BGValidityDate,
+    TenderSubmissionTimeStamps,
+    NotificationOfAward,
+    BGReleasedDate,
+    ParticipantBid,
+    ContractAgreement,
+    PGReleasedDate,
+    Vendor,
+    Payment,
+)
+
+
+@receiver(post_delete, sender=Notification)
+def record_notification_tombstone(sender, instance: Notification, **kwargs):
+    delta_sync.record_deletion(instance)
+
+
+@receiver(post_save, sender=Tender)
+@receiver(post_delete, sender=Tender)
+def invalidate_tender_row(sender, instance: Tender, **kwargs):
+    invalidate_tags(model_tag(Tender, instance.pk))
+
+
+def invalidate_related_tender_row(sender, instance, **kwargs):
+    invalidate_tags(model_tag(Tender, instance.tender_id))
+
+
+for _model in TENDER_RELATED_MODELS:
+    post_save.connect(invalidate_related_tender_row, sender=_model)
+    post_delete.connect(invalidate_related_tender_row, sender=_model)
+
+
+@receiver(post_save, sender=ProductSpacification)
+@receiver(post_delete, sender=ProductSpacification)
+@receiver(post_save, sender=ProductAnalysis)
+@receiver(post_delete, sender=ProductAnalysis)
+def invalidate_product_tender_row(sender, instance, **kwargs):
+    # rendered with their product, saved without it
+    invalidate_tags(model_tag(Tender, instance.product.tender_id))
+
+
+@receiver(post_save, sender=Ministry)
+@receiver(post_delete, sender=Ministry)
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+def invalidate_tender_setup(sender, **kwargs):
+    invalidate_tags(model_tag(sender))
@@ -1,15 +1,18 @@
 from logging import getLogger
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from oauth2_provider.contrib.rest_framework.authentication import OAuth2Authentication
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 
+from core.mixins import DeltaSyncMixin, ReplicaReadMixin
 from core.openapi_metadata.metadata import OpenApiTags
-from core.pagination import StandardResultSetPagination
+from core.pagination import KeysetResultSetPagination
 from core.permissions import UserAccessControl
 from core.renderer import CustomRenderer
+from core.services.delta_sync import UPDATED_SINCE_QUERY_PARAM
 
 from ..models.notification import Notification
 from ..serializers.notification import NotificationSerializer
@@ -18,19 +21,19 @@ logger = getLogger(__name__)
 
 
 @extend_schema(tags=[OpenApiTags.NOTIFICATION])
-class NotificationViews(ListAPIView):
+class NotificationViews(ReplicaReadMixin, ListAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
 
 
-class BaseNotificationListView(ListAPIView):
+class BaseNotificationListView(ReplicaReadMixin, DeltaSyncMixin, ListAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     serializer_class = NotificationSerializer
     renderer_classes = [CustomRenderer]
-    pagination_class = StandardResultSetPagination
+    pagination_class = KeysetResultSetPagination
     notification_type = None
     filter_backends = [SearchFilter]
     search_fields = [
@@ -43,10 +46,25 @@ class BaseNotificationListView(ListAPIView):
         "remaining_time",
     ]
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                UPDATED_SINCE_QUERY_PARAM,
+                OpenApiTypes.DATETIME,
+                OpenApiParameter.QUERY,
+                required=False,
+                description="only the changes since the watermark of the last sync",
+            ),
+        ]
+    )
     def get(self, request, *args, **kwargs):
-        self.pagination_class.page_size = 10
+        # on this request's paginator, the class is shared by the other lists
+        self.paginator.page_size = 10
         return super().get(request, *args, **kwargs)
 
+    def get_delta_model(self):
+        return Notification
+
     def get_queryset(self):
         queryset = Notification.objects.all()
         if self.notification_type:
@@ -55,7 +73,7 @@ class BaseNotificationListView(ListAPIView):
             else:
                 queryset = queryset.filter(notification_type=self.notification_type)
         queryset = queryset.order_by("remaining_time")
-        return queryset
+        return self.filter_updated_since(self.request, queryset)
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -9,12 +9,15 @@ from rest_framework.filters import SearchFilter
 from rest_framework.generics import ListCreateAPIView
 from rest_framework.response import Response
 
+from core.mixins import MinimalUpdateMixin, ReplicaReadMixin
 from core.openapi_metadata.metadata import OpenApiTags
-from core.pagination import StandardResultSetPagination
+from core.pagination import KeysetResultSetPagination
 from core.permissions import UserAccessControl
 from core.renderer import CustomRenderer
+from core.services.cache import model_tag
+from core.services.etags import conditional_response, row_version
 
-from ..models.tender import Participant, Tender
+from ..models.tender import Ministry, Participant, Tender
 from ..serializers.tender import (
     TenderAnalysisViewSerializer,
     TenderPostSubmissionSerializer,
@@ -24,23 +27,41 @@ from ..serializers.tender import (
 from ..utils import parse_json_data
 
 
+class TenderPagination(KeysetResultSetPagination):
+    page_size = 10
+
+
+def tender_version(view, request, *args, **kwargs):
+    """``updated_at`` of the requested tender, the list has no ETag"""
+    id = kwargs.get("id", None)
+    return None if id is None else row_version(Tender, id)
+
+
+def tender_tags(view, request, *args, **kwargs):
+    return [
+        model_tag(Tender, kwargs["id"]),
+        model_tag(Ministry),
+        model_tag(Participant),
+    ]
+
+
 @extend_schema(tags=[OpenApiTags.TMS_TENDER])
-class TenderListCreateView(ListCreateAPIView):
+class TenderListCreateView(ReplicaReadMixin, ListCreateAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     serializer_class = TenderSerializer
     renderer_classes = [
         CustomRenderer,
     ]
-    pagination_class = StandardResultSetPagination
+    pagination_class = TenderPagination
 
     def get_queryset(self):
         queryset = Tender.objects.all().order_by("-created_at")
         return queryset
 
+    @conditional_response(parts=tender_version, tags=tender_tags)
     def get(self, request, *args, **kwargs):
         id = self.kwargs.get("id", None)
-        self.pagination_class.page_size = 10
         if id is not None:
             try:
                 tender = Tender.objects.get(id=id)
@@ -53,7 +74,7 @@ class TenderListCreateView(ListCreateAPIView):
 
 
 @extend_schema(tags=[OpenApiTags.TMS_TENDER])
-class TenderUpdateView(generics.UpdateAPIView):
+class TenderUpdateView(MinimalUpdateMixin, generics.UpdateAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     queryset = Tender.objects.all()
@@ -125,7 +146,7 @@ class TenderUpdateView(generics.UpdateAPIView):
 
 
 @extend_schema(tags=[OpenApiTags.TMS_TENDER])
-class TenderPostSubmission(generics.UpdateAPIView):
+class TenderPostSubmission(MinimalUpdateMixin, generics.UpdateAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     pagination_class = []
@@ -163,7 +184,7 @@ class TenderPostSubmission(generics.UpdateAPIView):
 
 
 @extend_schema(tags=[OpenApiTags.TENDER_ANALYSIS])
-class TenderAnalysisView(generics.UpdateAPIView):
+class TenderAnalysisView(MinimalUpdateMixin, generics.UpdateAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     renderer_classes = [CustomRenderer]
@@ -177,7 +198,7 @@ class TenderAnalysisView(generics.UpdateAPIView):
 
 
 @extend_schema(tags=[OpenApiTags.TMS_TENDER])
-class CompleteTenderListView(generics.ListAPIView):
+class CompleteTenderListView(ReplicaReadMixin, generics.ListAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     renderer_classes = [CustomRenderer]
@@ -190,15 +211,11 @@ class CompleteTenderListView(generics.ListAPIView):
         "kam_name",
         "procuring_entity",
     ]
-    pagination_class = StandardResultSetPagination
-
-    def get(self, request, *args, **kwargs):
-        self.pagination_class.page_size = 10
-        return super().get(request, *args, **kwargs)
+    pagination_class = TenderPagination
 
 
 @extend_schema(tags=[OpenApiTags.TMS_TENDER])
-class OnGoingTenderListView(generics.ListAPIView):
+class OnGoingTenderListView(ReplicaReadMixin, generics.ListAPIView):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [UserAccessControl]
     renderer_classes = [CustomRenderer]
@@ -211,8 +228,4 @@ class OnGoingTenderListView(generics.ListAPIView):
         "kam_name",
         "procuring_entity",
     ]
-    pagination_class = StandardResultSetPagination
-
-    def get(self, request, *args, **kwargs):
-        self.pagination_class.page_size = 10
-        return super().get(request, *args, **kwargs)
+    pagination_class = TenderPagination
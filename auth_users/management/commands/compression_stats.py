@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from core.services import compression
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the compression ratio & time recorded by CompressionMiddleware for "
+        "every endpoint, to tune COMPRESSION_MIN_SIZE and the compression levels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sort",
+            choices=["responses", "avg_size", "ratio", "avg_compress_ms"],
+            default="responses",
+        )
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument(
+            "--reset", action="store_true", help="drop the recorded metrics"
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            compression.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Compression metrics dropped."))
+            return
+
+        stats = compression.get_stats()
+        if not stats:
+            self.stdout.write("No compressed response recorded yet.")
+            return
+
+        rows = sorted(
+            stats.items(), key=lambda row: row[1][options["sort"]], reverse=True
+        )
+        self.stdout.write(
+            f"{'endpoint':<48} {'responses':>10} {'br':>8} {'gzip':>8} "
+            f"{'avg kb':>9} {'ratio':>7} {'avg ms':>8}"
+        )
+        for endpoint, row in rows[: options["limit"]]:
+            self.stdout.write(
+                f"{endpoint:<48} {row['responses']:>10} {row['br_responses']:>8} "
+                f"{row['gzip_responses']:>8} {row['avg_size'] / 1024:>9.1f} "
+                f"{row['ratio']:>7.1f} {row['avg_compress_ms']:>8.2f}"
+            )
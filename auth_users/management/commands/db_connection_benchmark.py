@@ -0,0 +1,104 @@
+import statistics
+import time
+from copy import deepcopy
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# django settings of the primary database for every connection mode
+MODES: Dict[str, Dict[str, Any]] = {
+    "new": {"CONN_MAX_AGE": 0, "pool": None},
+    "persistent": {"CONN_MAX_AGE": 600, "pool": None},
+    "pooled": {"CONN_MAX_AGE": 0, "pool": True},
+}
+QUERY = "SELECT 1 FROM DUAL"
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the connection handling of a request (connect, one query, request "
+        "end) against the primary database with new, persistent & pooled "
+        "connections and report the per request overhead of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument(
+            "--mode", action="append", choices=list(MODES), help="all by default"
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def wrapper(self, database: str, mode: str):
+        """a separate connection to ``database`` configured for ``mode``"""
+        base = connections[database]
+        settings_dict = deepcopy(base.settings_dict)
+        settings_dict["CONN_MAX_AGE"] = MODES[mode]["CONN_MAX_AGE"]
+        settings_dict["OPTIONS"].pop("pool", None)
+        if MODES[mode]["pool"]:
+            pool = base.settings_dict["OPTIONS"].get("pool")
+            settings_dict["OPTIONS"]["pool"] = pool or settings.DB_POOL_OPTIONS
+        return base.__class__(settings_dict, alias=f"{database}_benchmark_{mode}")
+
+    def replay(self, connection, requests: int) -> Dict[str, Any]:
+        connects = 0
+        get_new_connection = connection.get_new_connection
+
+        def _counting(conn_params):
+            nonlocal connects
+            connects += 1
+            return get_new_connection(conn_params)
+
+        connection.get_new_connection = _counting
+        timings: List[float] = []
+        query_timings: List[float] = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                # what django does on request_started & request_finished
+                connection.close_if_unusable_or_obsolete()
+                connection.ensure_connection()
+                query_started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute(QUERY)
+                    cursor.fetchone()
+                query_timings.append(time.perf_counter() - query_started)
+                connection.close_if_unusable_or_obsolete()
+                timings.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+            if hasattr(connection, "close_pool"):
+                connection.close_pool()
+
+        overheads = [
+            (total - query) * 1000 for total, query in zip(timings, query_timings)
+        ]
+        return {
+            "connects": connects,
+            "request_ms": statistics.mean(timings) * 1000,
+            "overhead_ms": statistics.mean(overheads),
+            "overhead_p95_ms": statistics.quantiles(overheads, n=20)[-1],
+        }
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2.")
+
+        self.stdout.write(
+            f"{'mode':<12} {'connects':>9} {'request ms':>11} {'overhead ms':>12} "
+            f"{'overhead p95':>13}"
+        )
+        for mode in options["mode"] or list(MODES):
+            connection = self.wrapper(options["database"], mode)
+            result = self.replay(connection, options["requests"])
+            self.stdout.write(
+                f"{mode:<12} {result['connects']:>9} {result['request_ms']:>11.2f} "
+                f"{result['overhead_ms']:>12.2f} {result['overhead_p95_ms']:>13.2f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "overhead is the time of a request spent outside the query: "
+                "logon or pool checkout, session setup & release."
+            )
+        )
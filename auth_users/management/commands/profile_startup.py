@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SETUP_SCRIPT = (
+    "import time; started = time.perf_counter(); "
+    "import django; django.setup(); "
+    "print((time.perf_counter() - started) * 1000)"
+)
+IMPORT_TIME_PREFIX = "import time:"
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class Command(BaseCommand):
+    help = (
+        "Run django.setup() in a fresh interpreter with `-X importtime` and report "
+        "the slowest imports, failing when the cold start is over --budget-ms."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument(
+            "--sort",
+            choices=["self", "cumulative"],
+            default="cumulative",
+            help="cumulative includes the imports made by the module",
+        )
+        parser.add_argument(
+            "--by-package",
+            action="store_true",
+            help="sum the import time of every top level package",
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            help="fail when django.setup() takes longer than this",
+        )
+
+    @staticmethod
+    def parse(stderr: str) -> List[ImportTime]:
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith(IMPORT_TIME_PREFIX):
+                continue
+            self_us, cumulative_us, module = line[len(IMPORT_TIME_PREFIX) :].split("|")
+            if not self_us.strip().isdigit():
+                # the header line
+                continue
+            imports.append(
+                ImportTime(module.strip(), int(self_us), int(cumulative_us))
+            )
+        return imports
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SETUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(f"django.setup() failed:\n{process.stderr[-2000:]}")
+
+        setup_ms = float(process.stdout.strip().splitlines()[-1])
+        imports = self.parse(process.stderr)
+        imports_ms = sum(item.self_us for item in imports) / 1000
+
+        if options["by_package"]:
+            packages = defaultdict(int)
+            for item in imports:
+                packages[item.module.split(".")[0]] += item.self_us
+            rows = sorted(packages.items(), key=lambda row: row[1], reverse=True)
+            self.stdout.write(f"{'package':<48} {'self ms':>9}")
+            for package, self_us in rows[: options["limit"]]:
+                self.stdout.write(f"{package:<48} {self_us / 1000:>9.1f}")
+        else:
+            key = "self_us" if options["sort"] == "self" else "cumulative_us"
+            rows = sorted(imports, key=lambda item: getattr(item, key), reverse=True)
+            self.stdout.write(f"{'module':<48} {'self ms':>9} {'cumulative ms':>14}")
+            for item in rows[: options["limit"]]:
+                self.stdout.write(
+                    f"{item.module:<48} {item.self_us / 1000:>9.1f} "
+                    f"{item.cumulative_us / 1000:>14.1f}"
+                )
+
+        self.stdout.write(
+            f"\n{len(imports)} modules imported in {imports_ms:.0f}ms, "
+            f"django.setup() took {setup_ms:.0f}ms."
+        )
+        budget = options["budget_ms"]
+        if budget is not None and setup_ms > budget:
+            raise CommandError(
+                f"Cold start of {setup_ms:.0f}ms is over the {budget:.0f}ms budget."
+            )
+        if budget is not None:
+            self.stdout.write(
+                self.style.SUCCESS(f"Within the {budget:.0f}ms budget.")
+            )
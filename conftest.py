@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -40,6 +41,20 @@ def api_client() -> APIClient:
     yield APIClient()
 
 
+@pytest.fixture
+def local_cache(settings):
+    """the shared redis cache swapped for an empty in-memory one"""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tests",
+        }
+    }
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
 @pytest.fixture
 def password() -> str:
     return "Password@123"
@@ -0,0 +1,110 @@
+"""
+Oracle database backend selecting the python-oracledb driver mode before the first
+connection (see ``core.services.oracle_client``), with an optional session pool.
+
+With ``OPTIONS["pool"]`` set (``True`` or the ``oracledb.create_pool`` arguments,
+as with the native pooling of Django 5.2) every connection is acquired from a
+session pool of the current process and released back to it when django closes
+it, so a request costs a pool checkout instead of a full Oracle logon. The pool is
+created lazily, once per process and alias, so gunicorn & celery prefork children
+never share the sessions of their parent.
+"""
+import os
+import threading
+from logging import getLogger
+from typing import Any, Dict
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.oracle import base
+from django.db.backends.oracle.base import Database
+
+from core.services.oracle_client import init_oracle_client
+
+logging = getLogger("core.db.oracle")
+
+POOL_DEFAULTS: Dict[str, Any] = {
+    "min": 1,
+    "max": 4,
+    "increment": 1,
+    # idle seconds after which a session is pinged on checkout
+    "ping_interval": 60,
+    "getmode": Database.POOL_GETMODE_TIMEDWAIT,
+    # milliseconds to wait for a free session
+    "wait_timeout": 10_000,
+}
+
+_pools: Dict[str, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # the child must never reuse the sessions of the parent pools
+    global _pools_lock
+
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def pool_options(self) -> Dict[str, Any] | None:
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if not options:
+            return None
+        if self.settings_dict["CONN_MAX_AGE"]:
+            raise ImproperlyConfigured(
+                "Pooling doesn't support persistent connections, set CONN_MAX_AGE "
+                "to 0 with OPTIONS['pool']."
+            )
+        return {**POOL_DEFAULTS, **(options if isinstance(options, dict) else {})}
+
+    @property
+    def pool(self):
+        """session pool of the current process, ``None`` when pooling is off"""
+        pool_options = self.pool_options
+        if pool_options is None:
+            return None
+
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                init_oracle_client()
+                pool = _pools[self.alias] = Database.create_pool(
+                    user=self.settings_dict["USER"],
+                    password=self.settings_dict["PASSWORD"],
+                    dsn=base.dsn(self.settings_dict),
+                    **self.get_connection_params(),
+                    **pool_options,
+                )
+                logging.info(
+                    f"Database {self.alias!r} session pool created for "
+                    f"PID({os.getpid()}) min={pool.min} max={pool.max}."
+                )
+        return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        init_oracle_client()
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        # closing the connection releases the session back to the pool
+        return pool.acquire()
+
+    def close_pool(self) -> None:
+        """close the pool of this alias in the current process"""
+        with _pools_lock:
+            pool = _pools.pop(self.alias, None)
+        if pool is not None:
+            try:
+                pool.close(force=True)
+            except Database.Error as exc:
+                logging.exception(exc)
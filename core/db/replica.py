@@ -0,0 +1,148 @@
+"""
+Read replica routing of the opted in views (see ``ReplicaReadMixin``).
+
+The reads of a view are only sent to the ``REPLICA_DATABASE_ALIAS`` database when
+it is configured, its lag (measured with ``REPLICA_LAG_QUERY`` at most every
+``REPLICA_LAG_CHECK_INTERVAL`` seconds and shared through the cache) is under
+``REPLICA_MAX_LAG``, and the user did not write anything in the last
+``REPLICA_STICKY_SECONDS``, so users always read their own writes. Anything else
+reads from the primary database.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+from typing import Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logging = getLogger("core.db.replica")
+
+__all__ = [
+    "get_read_alias",
+    "record_write",
+    "has_written",
+    "track_writes",
+    "mark_sticky",
+    "is_sticky",
+    "replica_lag",
+    "is_replica_usable",
+    "read_from_replica",
+    "reading_from",
+]
+
+LAG_CACHE_KEY = "replica:lag"
+STICKY_KEY_PREFIX = "replica:sticky"
+# lag recorded when the replica cannot be reached, never under REPLICA_MAX_LAG
+UNREACHABLE = float("inf")
+
+_read_alias: ContextVar[str | None] = ContextVar("replica_read_alias", default=None)
+_wrote: ContextVar[bool] = ContextVar("replica_wrote", default=False)
+
+
+def get_read_alias() -> str | None:
+    """database the current reads are routed to, ``None`` for the default one"""
+    return _read_alias.get()
+
+
+def record_write() -> None:
+    _wrote.set(True)
+
+
+def has_written() -> bool:
+    return _wrote.get()
+
+
+@contextmanager
+def track_writes() -> Iterator[None]:
+    """records in ``has_written`` whether the block wrote to any database"""
+    token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _wrote.reset(token)
+
+
+def _sticky_key(user_pk) -> str:
+    return f"{STICKY_KEY_PREFIX}:{user_pk}"
+
+
+def mark_sticky(user_pk) -> None:
+    """send the reads of the user to the primary database for a while"""
+    try:
+        cache.set(_sticky_key(user_pk), True, settings.REPLICA_STICKY_SECONDS)
+    except Exception as exc:
+        logging.exception(exc)
+
+
+def is_sticky(user_pk) -> bool:
+    try:
+        return bool(cache.get(_sticky_key(user_pk)))
+    except Exception as exc:
+        # the user may miss their own writes on the replica
+        logging.exception(exc)
+        return True
+
+
+def _measure_lag() -> float:
+    query = settings.REPLICA_LAG_QUERY
+    if not query:
+        return 0
+    try:
+        with connections[settings.REPLICA_DATABASE_ALIAS].cursor() as cursor:
+            cursor.execute(query)
+            row = cursor.fetchone()
+    except DatabaseError as exc:
+        logging.exception(exc)
+        return UNREACHABLE
+    return float(row[0]) if row and row[0] is not None else UNREACHABLE
+
+
+def replica_lag() -> float:
+    """seconds the replica lags behind the primary database"""
+    lag = cache.get(LAG_CACHE_KEY)
+    if lag is None:
+        lag = _measure_lag()
+        cache.set(LAG_CACHE_KEY, lag, settings.REPLICA_LAG_CHECK_INTERVAL)
+        if lag > settings.REPLICA_MAX_LAG:
+            logging.warning(f"Replica lags {lag}s behind, reading from primary.")
+    return lag
+
+
+def is_replica_usable() -> bool:
+    if settings.REPLICA_DATABASE_ALIAS not in settings.DATABASES:
+        return False
+    try:
+        return replica_lag() <= settings.REPLICA_MAX_LAG
+    except Exception as exc:
+        logging.exception(exc)
+        return False
+
+
+@contextmanager
+def read_from_replica(user=None) -> Iterator[bool]:
+    """route the reads of the block to the replica when it is usable and ``user``
+    has no recent write, yields whether it did.
+    """
+    user_pk = getattr(user, "pk", None)
+    use_replica = (user_pk is None or not is_sticky(user_pk)) and is_replica_usable()
+    token = _read_alias.set(
+        settings.REPLICA_DATABASE_ALIAS if use_replica else DEFAULT_DB_ALIAS
+    )
+    try:
+        yield use_replica
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def reading_from(alias: str | None) -> Iterator[None]:
+    """route the reads of the block to ``alias``, for the rows a streamed response
+    reads after its view returned.
+    """
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
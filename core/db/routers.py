@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from . import replica
+
+__all__ = ["ReplicaRouter"]
+
+
+class ReplicaRouter:
+    """writes always go to the primary database, reads go to the replica inside
+    ``replica.read_from_replica`` only (see ``core.db.replica``).
+    """
+
+    def db_for_read(self, model, **hints):
+        return replica.get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        replica.record_write()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same rows as the primary database
+        databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.REPLICA_DATABASE_ALIAS:
+            return False
+        return None
@@ -0,0 +1,16 @@
+import os
+from logging.handlers import RotatingFileHandler
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """rotating file handler opening its file, and creating its folder, on the first
+    record instead of when the logging config is loaded.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        kwargs.setdefault("delay", True)
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
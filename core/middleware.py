@@ -0,0 +1,98 @@
+import time
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from core.db import replica
+from core.services import compression
+
+__all__ = ["CompressionMiddleware", "ReplicaStickinessMiddleware"]
+
+
+class CompressionMiddleware:
+    """brotli or gzip compression of the responses over ``COMPRESSION_MIN_SIZE``
+    bytes, streaming ones included, as negotiated with ``Accept-Encoding``.
+
+    responses already encoded or of an already compressed media type
+    (``COMPRESSION_SKIP_CONTENT_TYPES``) are sent as they are.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def endpoint(request: HttpRequest) -> str:
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unresolved"
+        return match.view_name or match.route
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if (
+            not settings.COMPRESSION_ENABLED
+            or response.has_header("Content-Encoding")
+            or not compression.is_compressible(response.get("Content-Type", ""))
+        ):
+            return response
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compression.choose_encoding(
+            request.headers.get("Accept-Encoding", "")
+        )
+        if encoding is None:
+            return response
+
+        endpoint = self.endpoint(request)
+        if response.streaming:
+            if getattr(response, "is_async", False):
+                response.streaming_content = compression.acompress_stream(
+                    response.streaming_content, encoding, endpoint
+                )
+            else:
+                response.streaming_content = compression.compress_stream(
+                    response.streaming_content, encoding, endpoint
+                )
+            # the length of the compressed stream is unknown
+            del response.headers["Content-Length"]
+        else:
+            started = time.perf_counter()
+            compressed = compression.compress(response.content, encoding)
+            elapsed = time.perf_counter() - started
+            if len(compressed) >= len(response.content):
+                return response
+            compression.record(
+                endpoint, encoding, len(response.content), len(compressed), elapsed
+            )
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # the compressed body is not byte for byte the one the ETag was made for
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """reads of a user who just wrote to the database skip the replica for
+    ``REPLICA_STICKY_SECONDS``, so they always see their own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with replica.track_writes():
+            response = self.get_response(request)
+            # DRF copies the user it authenticated onto the django request
+            user = getattr(request, "user", None)
+            if replica.has_written() and user and user.is_authenticated:
+                replica.mark_sticky(user.pk)
+        return response
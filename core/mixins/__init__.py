@@ -1 +1,3 @@
 from .model_mixins import *  # noqa: I001, F403
+from .serializer_mixins import *  # noqa: I001, F403
+from .view_mixins import *  # noqa: I001, F403
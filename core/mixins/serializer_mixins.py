@@ -0,0 +1,92 @@
+from typing import Any, Dict, FrozenSet
+
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camel_to_underscore
+from rest_framework.serializers import ListSerializer
+
+__all__ = ["SparseFieldsMixin"]
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+SPARSE_REQUEST_CONTEXT_KEY = "sparse_request"
+
+
+class SparseFieldsMixin:
+    """
+    Render only the fields asked with ``?fields=a,b`` and the ``expandable_fields``
+    asked with ``?expand=c,d`` (camelCase or snake_case) on the reads of the top
+    level serializer. Without either parameter every field is rendered, as before.
+
+    The fields left out are dropped before rendering, so their nested serializers
+    and ``SerializerMethodField`` never run. The values ``to_representation``
+    computes itself must be guarded with ``is_requested``.
+
+    The request is read from the ``request`` of the context, or from
+    ``sparse_context(request)`` for the views rendering without the request (the
+    file fields render absolute urls with it).
+    """
+
+    # heavy fields only rendered when asked for, once the client asks for fields
+    expandable_fields: tuple = ()
+    # rendered whatever the client asks for
+    always_included_fields: tuple = ("id",)
+
+    @staticmethod
+    def _parse(value: str | None) -> FrozenSet[str]:
+        if not value:
+            return frozenset()
+        return frozenset(
+            camel_to_underscore(name.strip(), **api_settings.JSON_UNDERSCOREIZE)
+            for name in value.split(",")
+            if name.strip()
+        )
+
+    def _is_root(self) -> bool:
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    @classmethod
+    def requested_fields(cls, request, all_fields) -> FrozenSet[str] | None:
+        """names rendered for ``request``, ``None`` for every field"""
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+        fields = request.query_params.get(FIELDS_QUERY_PARAM)
+        expand = cls._parse(request.query_params.get(EXPAND_QUERY_PARAM))
+        if fields is None and not expand:
+            return None
+        if fields is None:
+            base = frozenset(all_fields) - frozenset(cls.expandable_fields)
+        else:
+            base = cls._parse(fields)
+        return base | expand | frozenset(cls.always_included_fields)
+
+    @staticmethod
+    def sparse_context(request) -> Dict[str, Any]:
+        return {SPARSE_REQUEST_CONTEXT_KEY: request}
+
+    @classmethod
+    def is_requested_by(cls, request, name: str) -> bool:
+        """whether ``name`` is rendered for ``request``, e.g. to skip a prefetch"""
+        requested = cls.requested_fields(request, (name,))
+        return requested is None or name in requested
+
+    def is_requested(self, name: str) -> bool:
+        # the requested names are resolved with the fields
+        self.fields
+        return self._requested is None or name in self._requested
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = None
+        if self._is_root():
+            request = self.context.get(
+                SPARSE_REQUEST_CONTEXT_KEY, self.context.get("request")
+            )
+        self._requested = self.requested_fields(request, fields)
+        if self._requested is None:
+            return fields
+        return {
+            name: field for name, field in fields.items() if name in self._requested
+        }
@@ -0,0 +1,143 @@
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.db.replica import read_from_replica
+from core.services import delta_sync
+from core.services.cache import cache_response, model_tag
+from core.services.etags import conditional_response
+
+__all__ = [
+    "CachedListMixin",
+    "ReplicaReadMixin",
+    "DeltaSyncMixin",
+    "MinimalUpdateMixin",
+    "prefers_minimal_return",
+    "minimal_response",
+]
+
+PREFER_MINIMAL = "return=minimal"
+
+
+def prefers_minimal_return(request: Request) -> bool:
+    """the client sent ``Prefer: return=minimal`` (RFC 7240)"""
+    preferences = request.headers.get("Prefer", "")
+    return any(
+        preference.split(";")[0].strip().lower() == PREFER_MINIMAL
+        for preference in preferences.split(",")
+    )
+
+
+def minimal_response(instance) -> Response:
+    """the id & the modification time of an updated row, nothing is serialized"""
+    data = {"id": instance.pk}
+    if hasattr(instance, "updated_at"):
+        data["updated_at"] = instance.updated_at
+    return Response(data, headers={"Preference-Applied": PREFER_MINIMAL})
+
+
+class CachedListMixin:
+    """
+    Serve ``list`` from the shared cache. The entries are tagged with the viewset
+    model and ``cache_tag_models``, so a write to any of them invalidates the list.
+    The ETag of the list follows the same tags, a client holding the current list
+    gets a 304.
+    """
+
+    cache_timeout = 60 * 60
+    cache_tag_models = ()
+
+    def get_cache_tags(self) -> List[str]:
+        models = (self.queryset.model, *self.cache_tag_models)
+        return [model_tag(model) for model in models]
+
+    @conditional_response(tags=lambda view, *args, **kwargs: view.get_cache_tags())
+    @cache_response(
+        timeout=lambda view: view.cache_timeout,
+        tags=lambda view, *args, **kwargs: view.get_cache_tags(),
+    )
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return super().list(request, *args, **kwargs)
+
+
+class ReplicaReadMixin:
+    """
+    Run the reads of ``replica_actions`` (of every ``GET`` for the views without
+    actions) on the read replica, unless it lags or the user just wrote something.
+    """
+
+    replica_actions = ("list",)
+
+    def use_replica(self, request: Request) -> bool:
+        action = getattr(self, "action", None)
+        if action is not None:
+            return action in self.replica_actions
+        return request.method in ("GET", "HEAD")
+
+    def dispatch(self, request, *args, **kwargs):
+        # the routing of the reads ends with the response, errors included
+        with ExitStack() as self._replica_reads:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        if self.use_replica(request):
+            self._replica_reads.enter_context(read_from_replica(request.user))
+
+
+class MinimalUpdateMixin:
+    """``Prefer: return=minimal`` support of the generic update views"""
+
+    def update(self, request: Request, *args, **kwargs) -> Response:
+        if not prefers_minimal_return(request):
+            return super().update(request, *args, **kwargs)
+
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return minimal_response(serializer.instance)
+
+
+class DeltaSyncMixin:
+    """
+    ``?updated_since=<watermark>`` support of the lists (see core.services.delta_sync).
+    The changed rows are paged with a keyset on ``DELTA_ORDERING``, the first page
+    also carries the ids deleted since the watermark and the ``watermark`` of the
+    next sync, both taken before any page is read.
+    """
+
+    updated_since: datetime | None = None
+    watermark: datetime | None = None
+
+    def get_delta_model(self):
+        return self.queryset.model
+
+    def filter_updated_since(self, request: Request, queryset):
+        """rows of ``queryset`` changed since the watermark of the client"""
+        self.updated_since = delta_sync.parse_updated_since(request)
+        if self.updated_since is None:
+            return queryset
+        self.watermark = delta_sync.issue_watermark()
+        return queryset.filter(updated_at__gt=self.updated_since)
+
+    @property
+    def keyset_ordering(self) -> Sequence[str] | None:
+        """ordering the pagination must page on, a delta is read in update order"""
+        if self.updated_since is None:
+            return None
+        return delta_sync.DELTA_ORDERING
+
+    def get_delta_meta(self, first_page: bool) -> Dict[str, Any]:
+        if self.updated_since is None or not first_page:
+            return {}
+        return {
+            "watermark": self.watermark,
+            "deleted": delta_sync.deleted_since(
+                self.get_delta_model(), self.updated_since
+            ),
+        }
@@ -6,6 +6,7 @@ class OpenApiTags:
     DROPDOWN_REPO = "dropdown-repo"
     DROPDOWN_REPO_PMS = "pms-dropdown"
     DROPDOWN_REPO_PMS_BANK = "pms-bank-branch-dropdown"
+    BATCH = "batch-routes"
 
     # Party
     PARTY = "party-routes"
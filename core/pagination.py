@@ -1,10 +1,87 @@
-from typing import TYPE_CHECKING
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Sequence, Tuple
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
 
+from django.conf import settings
+from django.core.paginator import EmptyPage, InvalidPage, PageNotAnInteger, Paginator
+from django.db.models import Q, QuerySet
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.db import replica
+from core.services import counts
+from core.services.streaming import streaming_page_response
+
+
+class CountedPaginator(Paginator):
+    """paginator taking its count from ``count_func``.
+
+    an ``exact`` count is trusted like django does. otherwise (cached or estimated)
+    the pages are read without it: one extra row tells whether there is a next
+    page, and the last page corrects the count.
+    """
+
+    def __init__(self, object_list, per_page, count_func=None, exact=True, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+        self.exact = exact
+
+    @cached_property
+    def count(self):
+        if self.count_func is None:
+            return super().count
+        return self.count_func()
+
+    def _set_count(self, count: int) -> None:
+        self.count = count
+        self.__dict__.pop("num_pages", None)
+
+    def validate_number(self, number):
+        if self.exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError) as exc:
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from exc
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if self.exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if number > 1 and not rows:
+            raise EmptyPage(self.error_messages["no_results"])
+        if len(rows) > self.per_page:
+            rows = rows[: self.per_page]
+            if self.count <= bottom + self.per_page:
+                self._set_count(bottom + self.per_page + 1)
+        else:
+            # the last page, the actual total is known
+            self._set_count(bottom + len(rows))
+            self.exact = True
+        return self._get_page(rows, number, self)
+
+
+class _StreamedPage:
+    """rows of a page seen while it is streamed"""
+
+    def __init__(self):
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.has_more = False
 
 
 class StandardResultSetPagination(pagination.PageNumberPagination):
@@ -12,20 +89,342 @@ class StandardResultSetPagination(pagination.PageNumberPagination):
     page_query_param = "page"
     page_size = 50
     max_page_size = 5000
+    # how total_objects is counted, views override it with their count_strategy
+    count_strategy = counts.EXACT
+    # not part of the filters the cached counts are kept for
+    count_ignored_params = ("page", "page_size", "cursor")
+    view = None
 
     def set_page_size(self, request: "Request"):
         page_size = request.query_params.get(self.page_size_query_param, self.page_size)
         self.page_size = int(page_size)
 
+    def get_count_strategy(self) -> str:
+        return getattr(self.view, "count_strategy", None) or self.count_strategy
+
+    def count_cache_parts(self, request: "Request") -> List[Any]:
+        filters = sorted(
+            (key, value)
+            for key, value in request.query_params.lists()
+            if key not in self.count_ignored_params
+        )
+        return [request.path, getattr(request.user, "pk", None), filters]
+
+    def django_paginator_class(self, queryset, page_size):
+        strategy = self.get_count_strategy()
+        if strategy == counts.CACHED:
+            return CountedPaginator(
+                queryset,
+                page_size,
+                count_func=lambda: counts.cached_count(
+                    queryset,
+                    self.count_cache_parts(self.request),
+                    settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+                ),
+                exact=False,
+            )
+        if strategy == counts.ESTIMATED:
+            paginator = CountedPaginator(queryset, page_size, exact=False)
+
+            def _estimate():
+                count, estimated = counts.estimated_count(queryset)
+                paginator.exact = not estimated
+                return count
+
+            paginator.count_func = _estimate
+            return paginator
+        return CountedPaginator(queryset, page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_meta(self) -> Dict[str, Any]:
+        """fields of the paginated response but the results"""
+        paginator = self.page.paginator
+        meta = {
+            "page_size": self.page_size,
+            "total_objects": paginator.count,
+            "total_pages": paginator.num_pages,
+            "current_page": self.page.number,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+        if self.get_count_strategy() == counts.ESTIMATED:
+            meta["total_is_estimate"] = not paginator.exact
+        return meta
+
     def get_paginated_response(self, data):
-        return Response(
+        return Response({**self.get_page_meta(), "results": data})
+
+    def stream_rows(
+        self,
+        rows: QuerySet | Iterable[Any],
+        serializer,
+        stream_format: str,
+        get_meta: Callable[[_StreamedPage], Dict[str, Any]],
+    ) -> StreamingHttpResponse:
+        """stream up to ``page_size`` of ``rows`` serialized one by one, a
+        queryset is read ``LIST_STREAM_CHUNK_SIZE`` rows at a time.
+        """
+        # the database the view reads from, the rows are read after it returned
+        alias = replica.get_read_alias()
+        if isinstance(rows, QuerySet):
+            rows = rows.using(rows.db).iterator(
+                chunk_size=settings.LIST_STREAM_CHUNK_SIZE
+            )
+        streamed = _StreamedPage()
+
+        def batches():
+            with replica.reading_from(alias):
+                batch = []
+                for row in rows:
+                    if streamed.count == self.page_size:
+                        # the extra row read to know whether there is a next page
+                        streamed.has_more = True
+                        break
+                    streamed.count += 1
+                    if streamed.first is None:
+                        streamed.first = row
+                    streamed.last = row
+                    batch.append(serializer.to_representation(row))
+                    if len(batch) == settings.LIST_STREAM_CHUNK_SIZE:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+
+        return streaming_page_response(
+            batches(), stream_format, lambda: get_meta(streamed)
+        )
+
+    def get_streaming_response(
+        self,
+        queryset: QuerySet,
+        request: "Request",
+        serializer,
+        stream_format: str,
+        view=None,
+    ) -> StreamingHttpResponse:
+        """the page ``paginate_queryset`` & ``get_paginated_response`` would
+        return, streamed with a flat memory use whatever the page size.
+        """
+        self.request = request
+        self.view = view
+        self.page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, self.page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg) from exc
+        bottom = (number - 1) * self.page_size
+
+        def get_meta(streamed: _StreamedPage) -> Dict[str, Any]:
+            # same correction of a count that is not exact as CountedPaginator.page
+            if not streamed.has_more:
+                paginator._set_count(bottom + streamed.count)
+                paginator.exact = True
+            elif paginator.count <= bottom + self.page_size:
+                paginator._set_count(bottom + self.page_size + 1)
+            self.page = paginator._get_page([], number, paginator)
+            return self.get_page_meta()
+
+        return self.stream_rows(
+            queryset[bottom : bottom + self.page_size + 1],
+            serializer,
+            stream_format,
+            get_meta,
+        )
+
+
+class KeysetResultSetPagination(StandardResultSetPagination):
+    """page number pagination, or keyset pagination when the client asks for it
+    with ``?cursor=`` (empty for the first page).
+
+    a keyset page is read with ``WHERE (created_at, id) < (last seen)`` on the
+    ``ordering`` index instead of an OFFSET scan & a COUNT of the whole result, so
+    every page costs the same however deep it is. the cursors of the ``next`` and
+    ``previous`` links are opaque, the totals & the page number are not sent.
+
+    a view with a ``keyset_ordering`` (e.g. ``DeltaSyncMixin``) is always paged
+    with a keyset, on that ordering.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = _("Invalid cursor")
+    # the last field must be unique, usually backed by an index on these fields
+    ordering: Sequence[str] = ("-created_at", "-id")
+
+    def get_ordering(self) -> Sequence[str]:
+        return getattr(self.view, "keyset_ordering", None) or self.ordering
+
+    def is_keyset(self, request: "Request") -> bool:
+        if getattr(self.view, "keyset_ordering", None):
+            return True
+        return self.cursor_query_param in request.query_params
+
+    def _keyset_queryset(self, queryset, request) -> Tuple[QuerySet, List[Any], bool]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        values, reverse = [], False
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            values, reverse = self.decode_cursor(queryset, encoded)
+
+        ordering = self.get_ordering()
+        if reverse:
+            ordering = [self._flip(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if values:
+            queryset = queryset.filter(self._after(ordering, values))
+        return queryset, values, reverse
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.keyset = self.is_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        queryset, values, reverse = self._keyset_queryset(queryset, request)
+        return self._read_page(queryset, values, reverse)
+
+    def _read_page(self, queryset, values: List[Any], reverse: bool) -> List[Any]:
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(values)
+        self.rows = rows
+        return rows
+
+    @staticmethod
+    def _flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _after(ordering: Sequence[str], values: List[Any]) -> Q:
+        """rows after ``values`` in ``ordering``, without a row value comparison
+        oracle would not use the index for.
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                ordering[previous].lstrip("-"): values[previous]
+                for previous in range(index)
+            }
+            condition |= Q(**equal, **{f"{name}__{lookup}": values[index]})
+        return condition
+
+    def _key(self, row) -> List[Any]:
+        return [getattr(row, field.lstrip("-")) for field in self.get_ordering()]
+
+    def encode_cursor(self, values: List[Any], reverse: bool) -> str:
+        # full precision, DjangoJSONEncoder drops the microseconds
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else str(value)
+            for value in values
+        ]
+        raw = json.dumps({"v": values, "r": reverse})
+        return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, queryset: QuerySet, encoded: str) -> Tuple[List[Any], bool]:
+        try:
+            raw = json.loads(urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+            values, reverse = raw["v"], bool(raw["r"])
+            ordering = self.get_ordering()
+            if len(values) != len(ordering):
+                raise ValueError
+            fields = [
+                queryset.model._meta.get_field(field.lstrip("-")) for field in ordering
+            ]
+            return [
+                field.to_python(value) for field, value in zip(fields, values)
+            ], reverse
+        except Exception as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def _link(self, row, reverse: bool) -> str:
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        cursor = self.encode_cursor(self._key(row), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self._link(self.rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.rows:
+            return None
+        return self._link(self.rows[0], reverse=True)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
             {
-                "page_size": self.page_size,
-                "total_objects": self.page.paginator.count,
-                "total_pages": self.page.paginator.num_pages,
-                "current_page": self.page.number,
-                "next": self.get_next_link(),
-                "previous": self.get_previous_link(),
-                "results": data,
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor, empty for the first page.",
+                "schema": {"type": "string"},
             }
         )
+        return parameters
+
+    def get_page_meta(self) -> Dict[str, Any]:
+        if not self.keyset:
+            return super().get_page_meta()
+        meta = {
+            "page_size": self.page_size,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
+        if hasattr(self.view, "get_delta_meta"):
+            first_page = not self.request.query_params.get(self.cursor_query_param)
+            meta.update(self.view.get_delta_meta(first_page))
+        return meta
+
+    def get_streaming_response(
+        self,
+        queryset: QuerySet,
+        request: "Request",
+        serializer,
+        stream_format: str,
+        view=None,
+    ) -> StreamingHttpResponse:
+        self.view = view
+        self.keyset = self.is_keyset(request)
+        if not self.keyset:
+            return super().get_streaming_response(
+                queryset, request, serializer, stream_format, view
+            )
+        queryset, values, reverse = self._keyset_queryset(queryset, request)
+        if reverse:
+            # a previous page is read whole, its rows come in reverse order
+            rows = self._read_page(queryset, values, reverse)
+            return self.stream_rows(
+                rows, serializer, stream_format, lambda streamed: self.get_page_meta()
+            )
+
+        def get_meta(streamed: _StreamedPage) -> Dict[str, Any]:
+            self.has_next, self.has_previous = streamed.has_more, bool(values)
+            self.rows = [streamed.first, streamed.last] if streamed.count else []
+            return self.get_page_meta()
+
+        return self.stream_rows(
+            queryset[: self.page_size + 1], serializer, stream_format, get_meta
+        )
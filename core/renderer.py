@@ -1,29 +1,55 @@
 from logging import getLogger
 
+from django.conf import settings
 from djangorestframework_camel_case.render import CamelCaseJSONRenderer
 from rest_framework import status
 
+from core.services import fast_json
+
 logging = getLogger("core.renderer")
 
+code_to_msg = {
+    status.HTTP_200_OK: "success",
+    status.HTTP_202_ACCEPTED: "accepted",
+    status.HTTP_201_CREATED: "created",
+    status.HTTP_204_NO_CONTENT: "no_content",
+    status.HTTP_400_BAD_REQUEST: "validation_error",
+    status.HTTP_401_UNAUTHORIZED: "unauthorized",
+    status.HTTP_403_FORBIDDEN: "forbidden",
+    status.HTTP_404_NOT_FOUND: "not_found",
+    status.HTTP_406_NOT_ACCEPTABLE: "not_acceptable",
+    status.HTTP_409_CONFLICT: "conflict",
+    status.HTTP_410_GONE: "gone",
+    status.HTTP_422_UNPROCESSABLE_ENTITY: "unprocessable_entity",
+    status.HTTP_500_INTERNAL_SERVER_ERROR: "server_error",
+}
+
 
 class CustomRenderer(CamelCaseJSONRenderer):
+    # None follows FAST_JSON_RENDERER
+    fast = None
+
+    def use_fast_path(self, accepted_media_type, renderer_context) -> bool:
+        fast = settings.FAST_JSON_RENDERER if self.fast is None else self.fast
+        return (
+            fast
+            and fast_json.is_available()
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render_envelope(self, response, accepted_media_type, renderer_context):
+        if self.use_fast_path(accepted_media_type, renderer_context):
+            rendered = fast_json.render(response)
+            if rendered is not None:
+                return rendered
+        return super().render(response, accepted_media_type, renderer_context)
+
     def render(self, data, accepted_media_type=None, renderer_context=None):
         try:
             status_code = renderer_context["response"].status_code
 
-            code_to_msg = {
-                status.HTTP_200_OK: "success",
-                status.HTTP_202_ACCEPTED: "accepted",
-                status.HTTP_201_CREATED: "created",
-                status.HTTP_204_NO_CONTENT: "no_content",
-                status.HTTP_400_BAD_REQUEST: "validation_error",
-                status.HTTP_401_UNAUTHORIZED: "unauthorized",
-                status.HTTP_403_FORBIDDEN: "forbidden",
-                status.HTTP_404_NOT_FOUND: "not_found",
-                status.HTTP_406_NOT_ACCEPTABLE: "not_acceptable",
-                status.HTTP_500_INTERNAL_SERVER_ERROR: "server_error",
-            }
-
             response = {
                 "status": code_to_msg.get(status_code),
                 "code": status_code,
@@ -45,7 +71,9 @@ class CustomRenderer(CamelCaseJSONRenderer):
                     except (KeyError, TypeError):
                         logging.exception(data)
                         response["message"] = data
-            return super().render(response, accepted_media_type, renderer_context)
+            return self.render_envelope(
+                response, accepted_media_type, renderer_context
+            )
         except Exception as err:
             logging.exception(err)
             return super().render(
@@ -0,0 +1,123 @@
+"""
+Internal ``GET`` sub-requests of the batch endpoint (see core.views.BatchView).
+
+The sub-requests are dispatched straight to the resolved views, skipping the
+middlewares, with the user & the token the batch request was authenticated with,
+so the token is checked once for the whole batch. Every view still runs its own
+permission checks. The independent sub-requests can run on a thread pool, each
+thread closing the database connections it opened.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Any, Dict, List
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.request import Request
+
+from core.renderer import code_to_msg
+
+logging = getLogger("core.services.batch")
+
+__all__ = ["BATCH_URL_NAME", "run_batch", "run_sub_request"]
+
+API_PREFIX = "/api/v1/"
+BATCH_URL_NAME = "batch"
+# request headers the sub-requests do not inherit from the batch request
+DROPPED_META = (
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_ACCEPT_ENCODING",
+)
+
+
+def _envelope(code: int, data: Any = None, message: Any = None) -> Dict[str, Any]:
+    # same shape as the CustomRenderer responses
+    return {
+        "status": code_to_msg.get(code),
+        "code": code,
+        "data": data,
+        "message": message,
+    }
+
+
+def _sub_request(request: Request, path: str, query: str) -> HttpRequest:
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value
+        for key, value in request._request.META.items()
+        if key not in DROPPED_META
+    }
+    sub.META.update(
+        {"REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query}
+    )
+    sub.GET = QueryDict(query)
+    # authenticated once, by the batch request
+    sub.user = request.user
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def run_sub_request(request: Request, url: str) -> Dict[str, Any]:
+    """``GET url`` as ``request.user``, answered in the CustomRenderer envelope"""
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return _envelope(status.HTTP_404_NOT_FOUND, message="Not found.")
+    if not path.startswith(API_PREFIX) or match.url_name == BATCH_URL_NAME:
+        return _envelope(
+            status.HTTP_400_BAD_REQUEST, message=f"{path!r} can not be batched."
+        )
+
+    sub = _sub_request(request, path, parts.query)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception as exc:
+        # the views handle their own errors, this one escaped the handler
+        logging.exception(exc)
+        return _envelope(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            message="an unexpected error happened. Please check log for more details.",
+        )
+
+    code = response.status_code
+    if response.streaming:
+        response.close()
+        return _envelope(
+            status.HTTP_400_BAD_REQUEST,
+            message="Streamed responses can not be batched.",
+        )
+    data = getattr(response, "data", None)
+    if status.is_success(code):
+        return _envelope(code, data=data)
+    if isinstance(data, dict) and "detail" in data:
+        data = data["detail"]
+    return _envelope(code, message=data)
+
+
+def _run_in_thread(request: Request, url: str) -> Dict[str, Any]:
+    try:
+        return run_sub_request(request, url)
+    finally:
+        # the connections of a pool thread are never reused by a request
+        connections.close_all()
+
+
+def run_batch(request: Request, urls: List[str], parallel: bool) -> List[Dict]:
+    """responses of the ``urls``, in their order"""
+    if not parallel or len(urls) < 2:
+        return [run_sub_request(request, url) for url in urls]
+    workers = min(settings.BATCH_MAX_WORKERS, len(urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda url: _run_in_thread(request, url), urls))
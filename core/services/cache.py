@@ -0,0 +1,144 @@
+"""
+Shared (redis) cache helpers with tag based invalidation.
+
+Every cached entry records the version of the tags it depends on inside its key.
+Invalidating a tag bumps its version, so all the entries built on the previous
+version are never read again and simply expire.
+"""
+import time
+from functools import wraps
+from hashlib import md5
+from logging import getLogger
+from typing import Any, Callable, Iterable, List
+
+from django.core.cache import cache
+from django.db.models import Model
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logging = getLogger("core.services.cache")
+
+__all__ = [
+    "model_tag",
+    "get_tag_versions",
+    "invalidate_tags",
+    "make_key",
+    "cache_response",
+]
+
+TAG_KEY_PREFIX = "tag"
+RESPONSE_KEY_PREFIX = "response"
+
+TagsType = Iterable[str] | Callable[..., Iterable[str]]
+
+
+def model_tag(model: type[Model] | Model, pk=None) -> str:
+    """tag of a model (``app_label.model``) or of a single row of it"""
+    label = model._meta.label_lower
+    return label if pk is None else f"{label}:{pk}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def get_tag_versions(tags: Iterable[str]) -> List[int]:
+    """current version of each tag, initializing the missing ones"""
+    keys = [_tag_key(tag) for tag in tags]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            # seeded with the clock so an evicted tag never comes back with an
+            # old version and resurrects stale entries
+            version = time.time_ns()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions.append(version)
+    return versions
+
+
+def invalidate_tags(*tags: str) -> None:
+    """drop every cached entry depending on any of the given tags"""
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+        except Exception as exc:
+            logging.exception(exc)
+    logging.debug(f"Invalidated cache tags {tags!r}.")
+
+
+def make_key(namespace: str, *parts, tags: Iterable[str] = ()) -> str:
+    """namespaced key of the given parts, versioned by the given tags"""
+    versions = get_tag_versions(tags) if tags else []
+    raw = "|".join(str(part) for part in (*parts, *versions))
+    digest = md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def cache_response(
+    timeout: int | Callable[..., int],
+    *,
+    tags: TagsType = (),
+    vary_on_user: bool = False,
+    vary_on: Callable[..., Iterable[Any]] | None = None,
+) -> Callable:
+    """
+    Cache the successful responses of a DRF view method in the shared cache.
+
+    Args:
+        timeout (int | Callable): seconds to keep the response, or a callable
+            receiving the view and returning them.
+        tags (Iterable[str] | Callable): tags the response depends on, or a callable
+            receiving ``(view, request, *args, **kwargs)`` and returning them.
+        vary_on_user (bool): keep a separate entry for every authenticated user.
+        vary_on (Callable): receives ``(view, request, *args, **kwargs)`` and returns
+            the other values, not in the url, the response differs on (e.g. the
+            negotiated format).
+    """
+
+    def decorator(view_method: Callable) -> Callable:
+        @wraps(view_method)
+        def wrapper(view, request: Request, *args, **kwargs) -> Response:
+            view_name = f"{view.__class__.__name__}.{view_method.__name__}"
+            namespace = f"{RESPONSE_KEY_PREFIX}:{view_name}"
+            resolved_tags = (
+                tags(view, request, *args, **kwargs) if callable(tags) else tags
+            )
+            parts = [request.get_full_path()]
+            if vary_on_user:
+                parts.append(getattr(request.user, "pk", None))
+            if vary_on:
+                parts.extend(vary_on(view, request, *args, **kwargs))
+
+            try:
+                key = make_key(namespace, *parts, tags=resolved_tags)
+                cached = cache.get(key)
+            except Exception as exc:
+                # the cache must never take the endpoint down with it
+                logging.exception(exc)
+                return view_method(view, request, *args, **kwargs)
+
+            if cached is not None:
+                data, status_code = cached
+                return Response(data, status=status_code)
+
+            response = view_method(view, request, *args, **kwargs)
+            # streamed responses are never held in memory, so never cached either
+            if response.status_code == status.HTTP_200_OK and not response.streaming:
+                seconds = timeout(view) if callable(timeout) else timeout
+                try:
+                    cache.set(key, (response.data, response.status_code), seconds)
+                except Exception as exc:
+                    logging.exception(exc)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,246 @@
+"""
+Content negotiation, compressors & per endpoint metrics of ``CompressionMiddleware``.
+
+Brotli is used when the client accepts it and the ``brotli`` package is installed,
+gzip otherwise. Every compressed response records its endpoint (the url pattern),
+its size before & after and the time spent compressing in a redis hash, so
+``COMPRESSION_MIN_SIZE`` and the levels can be tuned from real traffic (see the
+``compression_stats`` command).
+"""
+import time
+import zlib
+from logging import getLogger
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator
+
+import redis
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+logging = getLogger("core.services.compression")
+
+__all__ = [
+    "BROTLI",
+    "GZIP",
+    "choose_encoding",
+    "is_compressible",
+    "Compressor",
+    "compress",
+    "compress_stream",
+    "acompress_stream",
+    "record",
+    "get_stats",
+    "reset_stats",
+]
+
+BROTLI = "br"
+GZIP = "gzip"
+STATS_KEY_PREFIX = "compression:stats"
+
+_client: redis.Redis | None = None
+
+
+def _available() -> Dict[str, bool]:
+    return {BROTLI: brotli is not None and settings.COMPRESSION_BROTLI, GZIP: True}
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """best encoding the client accepts, ``None`` to send the response as is"""
+    accepted = _parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    # on a tie the first one wins, brotli compresses json better
+    for encoding, available in _available().items():
+        quality = accepted.get(encoding, wildcard)
+        if available and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return not any(
+        media_type.startswith(skipped)
+        for skipped in settings.COMPRESSION_SKIP_CONTENT_TYPES
+    )
+
+
+class Compressor:
+    """incremental compressor of one response"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._compressor = brotli.Compressor(
+                mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        else:
+            # gzip container
+            self._compressor = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """everything compressed so far, the client can decode it right away"""
+        if self.encoding == BROTLI:
+            return self._compressor.flush()
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    compressor = Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+class _StreamMetrics:
+    def __init__(self, endpoint: str, encoding: str):
+        self.endpoint = endpoint
+        self.encoding = encoding
+        self.size = 0
+        self.compressed_size = 0
+        self.elapsed = 0.0
+
+    def compress(self, compressor: Compressor, chunk: bytes, last: bool) -> bytes:
+        started = time.perf_counter()
+        compressed = compressor.compress(chunk)
+        compressed += compressor.finish() if last else compressor.flush()
+        self.elapsed += time.perf_counter() - started
+        self.size += len(chunk)
+        self.compressed_size += len(compressed)
+        return compressed
+
+    def record(self) -> None:
+        record(
+            self.endpoint, self.encoding, self.size, self.compressed_size, self.elapsed
+        )
+
+
+def compress_stream(
+    chunks: Iterable[bytes], encoding: str, endpoint: str
+) -> Iterator[bytes]:
+    """compress a streaming response chunk by chunk, flushing after each one so
+    the rows reach the client as they are produced.
+    """
+    compressor = Compressor(encoding)
+    metrics = _StreamMetrics(endpoint, encoding)
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield metrics.compress(compressor, chunk, last=False)
+        yield metrics.compress(compressor, b"", last=True)
+    finally:
+        metrics.record()
+
+
+async def acompress_stream(
+    chunks: AsyncIterator[bytes], encoding: str, endpoint: str
+) -> AsyncIterator[bytes]:
+    compressor = Compressor(encoding)
+    metrics = _StreamMetrics(endpoint, encoding)
+    try:
+        async for chunk in chunks:
+            if chunk:
+                yield metrics.compress(compressor, chunk, last=False)
+        yield metrics.compress(compressor, b"", last=True)
+    finally:
+        metrics.record()
+
+
+def _get_client() -> redis.Redis:
+    global _client
+
+    if _client is None:
+        _client = redis.Redis.from_url(settings.COMPRESSION_STATS_REDIS_URL)
+    return _client
+
+
+def _stats_key(endpoint: str) -> str:
+    return f"{STATS_KEY_PREFIX}:{endpoint}"
+
+
+def record(
+    endpoint: str, encoding: str, size: int, compressed_size: int, elapsed: float
+) -> None:
+    """add one compressed response to the metrics of its endpoint"""
+    if not settings.COMPRESSION_STATS_ENABLED:
+        return
+    try:
+        pipe = _get_client().pipeline(transaction=False)
+        key = _stats_key(endpoint)
+        pipe.hincrby(key, "responses", 1)
+        pipe.hincrby(key, f"{encoding}_responses", 1)
+        pipe.hincrby(key, "bytes_in", size)
+        pipe.hincrby(key, "bytes_out", compressed_size)
+        pipe.hincrby(key, "compress_us", int(elapsed * 1_000_000))
+        pipe.expire(key, settings.COMPRESSION_STATS_TTL)
+        pipe.execute()
+    except redis.RedisError as exc:
+        logging.exception(exc)
+
+
+def _endpoints(client: redis.Redis) -> Iterator[str]:
+    prefix = f"{STATS_KEY_PREFIX}:"
+    for key in client.scan_iter(match=f"{prefix}*", count=500):
+        yield key.decode()[len(prefix) :]
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """compression ratio & time of every endpoint, across the cluster"""
+    client = _get_client()
+    stats = {}
+    for endpoint in _endpoints(client):
+        raw = client.hgetall(_stats_key(endpoint))
+        counters = {key.decode(): int(value) for key, value in raw.items()}
+        responses = counters.get("responses", 0)
+        bytes_in = counters.get("bytes_in", 0)
+        bytes_out = counters.get("bytes_out", 0)
+        compress_ms = counters.get("compress_us", 0) / 1000
+        stats[endpoint] = {
+            "responses": responses,
+            "br_responses": counters.get("br_responses", 0),
+            "gzip_responses": counters.get("gzip_responses", 0),
+            "avg_size": bytes_in / max(responses, 1),
+            "ratio": bytes_in / max(bytes_out, 1),
+            "avg_compress_ms": compress_ms / max(responses, 1),
+        }
+    return stats
+
+
+def reset_stats() -> None:
+    client = _get_client()
+    keys = [_stats_key(endpoint) for endpoint in _endpoints(client)]
+    if keys:
+        client.delete(*keys)
+
@@ -0,0 +1,83 @@
+"""
+Row counts of the paginated lists: exact, cached for a while, or estimated by the
+Oracle optimizer.
+
+The estimate is the cardinality of the ``EXPLAIN PLAN`` of the query, so the
+statistics of the tables must be fresh enough. Small estimates, and any database
+but Oracle, are counted exactly since the count is cheap then.
+"""
+from logging import getLogger
+from typing import Iterable
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+
+from core.services.cache import make_key, model_tag
+
+logging = getLogger("core.services.counts")
+
+__all__ = ["EXACT", "CACHED", "ESTIMATED", "cached_count", "estimated_count"]
+
+EXACT = "exact"
+CACHED = "cached"
+ESTIMATED = "estimated"
+COUNT_KEY_PREFIX = "count"
+
+
+def cached_count(queryset: QuerySet, parts: Iterable, timeout: int) -> int:
+    """exact count of ``queryset`` kept ``timeout`` seconds under ``parts``, or
+    until the model of the queryset is invalidated.
+    """
+    try:
+        key = make_key(COUNT_KEY_PREFIX, *parts, tags=[model_tag(queryset.model)])
+        count = cache.get(key)
+    except Exception as exc:
+        logging.exception(exc)
+        return queryset.count()
+
+    if count is None:
+        count = queryset.count()
+        try:
+            cache.set(key, count, timeout)
+        except Exception as exc:
+            logging.exception(exc)
+    return count
+
+
+def _explain_cardinality(queryset: QuerySet) -> int | None:
+    compiler = queryset.order_by().query.get_compiler(using=queryset.db)
+    sql, params = compiler.as_sql()
+    statement_id = uuid4().hex[:30]
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}", params
+        )
+        try:
+            cursor.execute(
+                "SELECT CARDINALITY FROM PLAN_TABLE "
+                "WHERE STATEMENT_ID = %s AND ID = 0",
+                [statement_id],
+            )
+            row = cursor.fetchone()
+        finally:
+            cursor.execute(
+                "DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = %s", [statement_id]
+            )
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def estimated_count(queryset: QuerySet) -> tuple[int, bool]:
+    """optimizer estimate of the count of ``queryset``, and whether it is one"""
+    if connections[queryset.db].vendor != "oracle":
+        return queryset.count(), False
+    try:
+        estimate = _explain_cardinality(queryset)
+    except DatabaseError as exc:
+        logging.exception(exc)
+        estimate = None
+    if estimate is None or estimate < settings.PAGINATION_ESTIMATE_EXACT_BELOW:
+        return queryset.count(), False
+    return estimate, True
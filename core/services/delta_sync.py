@@ -0,0 +1,120 @@
+"""
+Delta sync of the lists: ``?updated_since=<watermark>`` returns the rows changed
+after the watermark, and the ids of the rows deleted since then (their tombstones).
+
+The first page carries the ``watermark`` to send with the next sync. It is taken
+before the rows are read and moved back by ``DELTA_SYNC_OVERLAP`` (and by the lag
+of the replica when the rows are read from it), so the rows committed late are
+sent again rather than missed. Clients must remove the ``deleted`` ids first, then
+upsert the rows they receive.
+
+The tombstones are kept ``DELTA_SYNC_TOMBSTONE_DAYS``, an older watermark gets a
+410 and the client must download the whole list again.
+"""
+from datetime import datetime, timedelta
+from logging import getLogger
+from typing import List
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from core.db import replica
+
+logging = getLogger("core.services.delta_sync")
+
+__all__ = [
+    "UPDATED_SINCE_QUERY_PARAM",
+    "DELTA_ORDERING",
+    "DeltaExpiredException",
+    "parse_updated_since",
+    "issue_watermark",
+    "record_deletion",
+    "deleted_since",
+    "prune_tombstones",
+]
+
+UPDATED_SINCE_QUERY_PARAM = "updated_since"
+# the keyset the changes are paged on, backed by an index on these fields
+DELTA_ORDERING = ("updated_at", "id")
+
+
+class DeltaExpiredException(exceptions.APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = _("The watermark is too old, download the whole list again.")
+    default_code = "delta_expired"
+
+
+def _tombstones():
+    return apps.get_model("pms", "Tombstone").objects
+
+
+def _retention() -> timedelta:
+    return timedelta(days=settings.DELTA_SYNC_TOMBSTONE_DAYS)
+
+
+def parse_updated_since(request: Request) -> datetime | None:
+    """``?updated_since=`` of the request, ``None`` for a full list"""
+    value = request.query_params.get(UPDATED_SINCE_QUERY_PARAM)
+    if not value:
+        return None
+    try:
+        # the + of an offset left unescaped in the url is read as a space
+        since = parse_datetime(value.replace(" ", "+"))
+    except ValueError:
+        since = None
+    if since is None:
+        raise exceptions.ValidationError(
+            {UPDATED_SINCE_QUERY_PARAM: _("Expected an ISO 8601 date time.")}
+        )
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    if since < timezone.now() - _retention():
+        raise DeltaExpiredException
+    return since
+
+
+def issue_watermark() -> datetime:
+    """``updated_since`` of the next sync, taken before the rows are read"""
+    overlap = settings.DELTA_SYNC_OVERLAP
+    if replica.get_read_alias() == settings.REPLICA_DATABASE_ALIAS:
+        # the rows the replica did not receive yet are read on the next sync
+        overlap += replica.replica_lag() + settings.REPLICA_LAG_CHECK_INTERVAL
+    return timezone.now() - timedelta(seconds=overlap)
+
+
+def record_deletion(instance: Model) -> None:
+    """keep a tombstone of ``instance`` for the clients syncing its list"""
+    _tombstones().create(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=str(instance.pk),
+    )
+
+
+def deleted_since(model: type[Model], since: datetime) -> List[str]:
+    """ids of the ``model`` rows deleted after ``since``"""
+    ids = (
+        _tombstones()
+        .filter(
+            content_type=ContentType.objects.get_for_model(model),
+            deleted_at__gt=since,
+        )
+        .order_by("deleted_at")
+        .values_list("object_id", flat=True)
+    )
+    return list(dict.fromkeys(ids))
+
+
+def prune_tombstones() -> int:
+    """drop the tombstones no watermark can ask for anymore"""
+    deleted, _by_model = _tombstones().filter(
+        deleted_at__lt=timezone.now() - _retention()
+    ).delete()
+    logging.info(f"{deleted} tombstones pruned.")
+    return deleted
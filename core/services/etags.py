@@ -0,0 +1,119 @@
+"""
+Conditional GETs (``ETag`` / ``If-None-Match``) of the detail & reference endpoints.
+
+The ETags are made from the version of what a response is built from, never from
+the rendered body: the ``updated_at`` of the row, read with a primary key lookup,
+and the versions of the cache tags (see core.services.cache) bumped on every write
+of the row, of its related rows and of the reference tables it renders. A request
+whose ``If-None-Match`` matches gets a 304 before the serializer runs.
+
+The writes made with ``QuerySet.update`` send no signal, they are only seen when
+they touch the ``updated_at`` of the row.
+"""
+from functools import wraps
+from hashlib import md5
+from logging import getLogger
+from typing import Any, Callable, Iterable, List
+
+from django.db.models import Model
+from django.http import HttpResponseNotModified
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.services.cache import TagsType, get_tag_versions
+
+logging = getLogger("core.services.etags")
+
+__all__ = ["make_etag", "etag_matches", "row_version", "conditional_response"]
+
+PartsType = Callable[..., Iterable[Any] | None]
+
+
+def make_etag(*parts, tags: Iterable[str] = ()) -> str:
+    """strong ETag of the given parts & of the current version of the tags"""
+    versions = get_tag_versions(tags) if tags else []
+    raw = "|".join(str(part) for part in (*parts, *versions))
+    return f'"{md5(raw.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def _opaque(etag: str) -> str:
+    # weak comparison, the compressed responses carry a weak ETag
+    return etag.strip().removeprefix("W/")
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """whether the ``If-None-Match`` of the request matches ``etag``"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(candidate) for candidate in header.split(",")}
+
+
+def row_version(model: type[Model], pk) -> List[Any] | None:
+    """``updated_at`` of a row, ``None`` when it does not exist"""
+    updated_at = model.objects.filter(pk=pk).values_list("updated_at", flat=True)
+    row = list(updated_at[:1])
+    return row or None
+
+
+def conditional_response(
+    *,
+    parts: PartsType | None = None,
+    tags: TagsType = (),
+    vary_on_user: bool = False,
+) -> Callable:
+    """
+    Answer the ``GET`` of a DRF view method with a 304 when the client holds the
+    current version of the response, otherwise send the response with its ETag.
+
+    Args:
+        parts (Callable): receives ``(view, request, *args, **kwargs)`` and returns
+            the values the response is built from (e.g. ``row_version``), or
+            ``None`` to answer without an ETag.
+        tags (Iterable[str] | Callable): cache tags the response depends on, or a
+            callable receiving ``(view, request, *args, **kwargs)`` and returning
+            them.
+        vary_on_user (bool): the response differs for every authenticated user.
+    """
+
+    def _resolve_etag(view, request: Request, *args, **kwargs) -> str | None:
+        version = parts(view, request, *args, **kwargs) if parts else []
+        if version is None:
+            return None
+        resolved_tags = tags(view, request, *args, **kwargs) if callable(tags) else tags
+        # the host & the query string change the rendered urls & fields
+        keys = [request.build_absolute_uri()]
+        if vary_on_user:
+            keys.append(getattr(request.user, "pk", None))
+        return make_etag(*keys, *version, tags=resolved_tags)
+
+    def decorator(view_method: Callable) -> Callable:
+        @wraps(view_method)
+        def wrapper(view, request: Request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_method(view, request, *args, **kwargs)
+            try:
+                etag = _resolve_etag(view, request, *args, **kwargs)
+            except Exception as exc:
+                # a missing ETag must never take the endpoint down with it
+                logging.exception(exc)
+                etag = None
+            if etag is None:
+                return view_method(view, request, *args, **kwargs)
+
+            if etag_matches(request, etag):
+                not_modified = HttpResponseNotModified()
+                not_modified["ETag"] = etag
+                return not_modified
+
+            response: Response = view_method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK and not response.streaming:
+                response["ETag"] = etag
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,146 @@
+"""
+Fast path of ``CustomRenderer``: camelCase translation with a bounded memo of the
+translated keys and serialization with orjson.
+
+The output is byte for byte the one of ``CamelCaseJSONRenderer`` (compact, unicode
+& strict DRF defaults). The values orjson would write differently (floats printed
+with an exponent, non finite floats, integers over 64 bits, decimals, plain enums)
+and anything orjson rejects are left to the stdlib encoder: ``render`` returns
+``None`` and the caller renders the data the usual way.
+"""
+import re
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = ["is_available", "camelize_key", "render"]
+
+KEY_MEMO_SIZE = 4096
+# the range where orjson prints floats like ``repr`` does
+SAFE_FLOAT_MIN = 1e-4
+SAFE_FLOAT_MAX = 1e15
+SAFE_INT_MIN = -(2**63)
+SAFE_INT_MAX = 2**64 - 1
+
+_camelize_re = re.compile(r"[a-z0-9]?_[a-z0-9]")
+_default = JSONEncoder().default
+_options = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+class _NeedsStdlib(Exception):
+    pass
+
+
+def is_available() -> bool:
+    return orjson is not None
+
+
+def _underscore_to_camel(match: re.Match) -> str:
+    group = match.group()
+    if len(group) == 3:
+        return group[0] + group[2].upper()
+    return group[1].upper()
+
+
+@lru_cache(maxsize=KEY_MEMO_SIZE)
+def camelize_key(key: str) -> str:
+    """same translation as ``djangorestframework_camel_case.util.camelize``"""
+    return _camelize_re.sub(_underscore_to_camel, key)
+
+
+def _is_iterable(data: Any) -> bool:
+    try:
+        iter(data)
+    except TypeError:
+        return False
+    return True
+
+
+def _check_scalar(data: Any) -> None:
+    data_type = type(data)
+    if data_type is float:
+        if not (data == 0 or SAFE_FLOAT_MIN <= abs(data) < SAFE_FLOAT_MAX):
+            raise _NeedsStdlib
+    elif data_type is int:
+        if not SAFE_INT_MIN <= data <= SAFE_INT_MAX:
+            raise _NeedsStdlib
+    elif isinstance(data, (float, Decimal)):
+        raise _NeedsStdlib
+    elif isinstance(data, Enum) and not isinstance(data, (str, int)):
+        raise _NeedsStdlib
+
+
+def _check(data: Any) -> None:
+    """scalar checks of a value left as is"""
+    if isinstance(data, dict):
+        for value in data.values():
+            _check(value)
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            _check(item)
+    else:
+        _check_scalar(data)
+
+
+def _camelize(data: Any, ignore_fields: frozenset, ignore_keys: frozenset) -> Any:
+    if isinstance(data, Promise):
+        data = force_str(data)
+    if isinstance(data, dict):
+        new_dict = {}
+        for key, value in data.items():
+            if isinstance(key, Promise):
+                key = force_str(key)
+            if isinstance(key, str) and "_" in key:
+                new_key = camelize_key(key)
+            else:
+                new_key = key
+
+            if key not in ignore_fields and new_key not in ignore_fields:
+                result = _camelize(value, ignore_fields, ignore_keys)
+            else:
+                result = value
+                _check(value)
+            if key in ignore_keys or new_key in ignore_keys:
+                new_dict[key] = result
+            else:
+                new_dict[new_key] = result
+        return new_dict
+    if isinstance(data, str):
+        return data
+    if _is_iterable(data):
+        return [_camelize(item, ignore_fields, ignore_keys) for item in data]
+    _check_scalar(data)
+    return data
+
+
+def render(data: Any) -> bytes | None:
+    """camelized JSON of ``data``, ``None`` when the stdlib encoder is needed"""
+    options = api_settings.JSON_UNDERSCOREIZE
+    try:
+        camelized = _camelize(
+            data,
+            frozenset(options.get("ignore_fields") or ()),
+            frozenset(options.get("ignore_keys") or ()),
+        )
+        rendered = orjson.dumps(camelized, default=_default, option=_options)
+    except (_NeedsStdlib, orjson.JSONEncodeError):
+        return None
+    # escaped by the DRF renderer for the javascript consumers
+    return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+        b"\xe2\x80\xa9", b"\\u2029"
+    )
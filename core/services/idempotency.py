@@ -0,0 +1,154 @@
+"""
+``Idempotency-Key`` support of the expensive create endpoints.
+
+The first request of a key (for a user & an endpoint) claims it in the shared cache
+and runs. Its successful response is kept ``IDEMPOTENCY_TTL`` seconds and replayed
+to every retry of the same key, so a retry never creates the row again nor reruns
+the work its signals start. A retry sent while the first request still runs gets a
+409, a key reused with another payload a 422. A failed request releases its key,
+the client can retry it.
+
+The cache is the shared redis; when it can not be reached the requests run as if
+they had no key.
+"""
+from functools import wraps
+from hashlib import sha256
+from logging import getLogger
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.services.cache import make_key
+
+logging = getLogger("core.services.idempotency")
+
+__all__ = [
+    "IDEMPOTENCY_HEADER",
+    "REPLAYED_HEADER",
+    "IdempotencyKeyInUseException",
+    "IdempotencyKeyReusedException",
+    "idempotent",
+]
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+KEY_PREFIX = "idempotency"
+MAX_KEY_LENGTH = 255
+_IN_PROGRESS = "in_progress"
+_DONE = "done"
+
+
+class IdempotencyKeyInUseException(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _("A request with this Idempotency-Key is still running.")
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyReusedException(exceptions.APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _("This Idempotency-Key was used with another payload.")
+    default_code = "idempotency_key_reused"
+
+
+def _value_fingerprint(value: Any) -> str:
+    if isinstance(value, UploadedFile):
+        return f"file:{value.name}:{value.size}"
+    return repr(value)
+
+
+def _fingerprint(request: Request) -> str:
+    """digest of the payload, the uploaded files by name & size"""
+    data = request.data
+    if hasattr(data, "lists"):
+        items = sorted(
+            (key, [_value_fingerprint(value) for value in values])
+            for key, values in data.lists()
+        )
+    elif isinstance(data, dict):
+        items = sorted((key, _value_fingerprint(value)) for key, value in data.items())
+    else:
+        items = repr(data)
+    return sha256(repr(items).encode()).hexdigest()
+
+
+def _release(key: str) -> None:
+    try:
+        cache.delete(key)
+    except Exception as exc:
+        logging.exception(exc)
+
+
+def idempotent(view_method: Callable) -> Callable:
+    """replay the response of a create view to the retries of its Idempotency-Key"""
+
+    @wraps(view_method)
+    def wrapper(view, request: Request, *args, **kwargs) -> Response:
+        idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            return view_method(view, request, *args, **kwargs)
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            raise exceptions.ValidationError(
+                {IDEMPOTENCY_HEADER: _("At most 255 characters.")}
+            )
+
+        view_name = f"{view.__class__.__name__}.{view_method.__name__}"
+        fingerprint = _fingerprint(request)
+        try:
+            key = make_key(
+                KEY_PREFIX,
+                view_name,
+                getattr(request.user, "pk", None),
+                idempotency_key,
+            )
+            claimed = cache.add(
+                key,
+                (_IN_PROGRESS, fingerprint, None),
+                settings.IDEMPOTENCY_LOCK_TIMEOUT,
+            )
+            stored = None if claimed else cache.get(key)
+        except Exception as exc:
+            # the cache must never take the endpoint down with it
+            logging.exception(exc)
+            return view_method(view, request, *args, **kwargs)
+
+        if stored is not None:
+            state, stored_fingerprint, payload = stored
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyKeyReusedException
+            if state == _IN_PROGRESS:
+                raise IdempotencyKeyInUseException
+            data, status_code = payload
+            logging.info(f"Replayed {view_name} for {IDEMPOTENCY_HEADER} {key!r}.")
+            return Response(
+                data, status=status_code, headers={REPLAYED_HEADER: "true"}
+            )
+        if not claimed:
+            # released between the add & the get, the first request just failed
+            raise IdempotencyKeyInUseException
+
+        try:
+            response = view_method(view, request, *args, **kwargs)
+        except BaseException:
+            _release(key)
+            raise
+
+        if not status.is_success(response.status_code) or response.streaming:
+            _release(key)
+            return response
+        try:
+            cache.set(
+                key,
+                (_DONE, fingerprint, (response.data, response.status_code)),
+                settings.IDEMPOTENCY_TTL,
+            )
+        except Exception as exc:
+            logging.exception(exc)
+        return response
+
+    return wrapper
@@ -0,0 +1,49 @@
+"""
+OIDC signing key of the OAuth2 provider, read (or generated) on first use instead
+of when the settings are imported.
+"""
+import os
+from functools import cache
+from pathlib import Path
+from uuid import uuid4
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import lazy
+
+__all__ = ["get_oidc_private_key", "lazy_oidc_private_key"]
+
+
+def _generate_key(path: Path) -> None:
+    # imported here, cryptography is only needed when the key is missing
+    from .utils import generate_rsa_key, save_key
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}")
+    try:
+        save_key(generate_rsa_key(), tmp_path)
+        # fails when a concurrent process created the key first, its key wins
+        os.link(tmp_path, path)
+    except FileExistsError:
+        pass
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+@cache
+def get_oidc_private_key(path: str | Path) -> str:
+    """PEM of the RSA private key at ``path``, generated when missing"""
+    path = Path(path)
+    if not path.exists():
+        _generate_key(path)
+
+    try:
+        return path.read_bytes().decode()
+    except FileNotFoundError as err:
+        raise ImproperlyConfigured(
+            "RSA Private Key is required for the OAuth2 setup."
+        ) from err
+
+
+def lazy_oidc_private_key(path: str | Path) -> str:
+    """``get_oidc_private_key`` evaluated when the OAuth2 provider first uses it"""
+    return lazy(get_oidc_private_key, str)(path)
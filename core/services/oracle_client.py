@@ -0,0 +1,52 @@
+"""
+Lazy python-oracledb driver mode selection.
+
+The driver runs in thin mode (pure python) unless ``EBS_ORCL_CLIENT_MODE`` is
+"thick", in which case the Oracle Instant Client is loaded on the first Oracle
+connection of the process, EBS or primary database, instead of when the settings
+are imported. The mode is process wide and cannot change once a connection was
+made, hence every Oracle connection goes through ``init_oracle_client`` first.
+"""
+import threading
+from logging import getLogger
+
+import oracledb
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logging = getLogger("core.services.oracle_client")
+
+__all__ = ["THIN", "THICK", "init_oracle_client"]
+
+THIN = "thin"
+THICK = "thick"
+
+_initialized = False
+_lock = threading.Lock()
+
+
+def init_oracle_client() -> None:
+    """load the Instant Client once per process when thick mode is configured"""
+    global _initialized
+
+    if _initialized:
+        return
+
+    with _lock:
+        if _initialized:
+            return
+
+        mode = settings.EBS_ORCL_CLIENT_MODE
+        if mode not in (THIN, THICK):
+            raise ImproperlyConfigured(
+                f"EBS_ORCL_CLIENT_MODE must be {THIN!r} or {THICK!r}, not {mode!r}."
+            )
+        if mode == THICK:
+            oracledb.init_oracle_client(
+                lib_dir=settings.EBS_ORCL_INSTANT_CLIENT_PATH or None
+            )
+            logging.info(
+                f"Oracle Instant Client {oracledb.clientversion()} loaded, "
+                "thick mode enabled."
+            )
+        _initialized = True
@@ -0,0 +1,145 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+Only one caller runs the call of a given key at a time: the other threads of the
+process wait on it in memory, and the other workers wait on its result in the
+shared cache. A follower runs the call itself when the leader fails, dies or takes
+longer than ``SINGLE_FLIGHT_WAIT_TIMEOUT``, so a stuck leader never blocks anybody
+for good.
+"""
+import threading
+import time
+from logging import getLogger
+from typing import Any, Callable, Dict, TypeVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+logging = getLogger("core.services.single_flight")
+
+__all__ = ["coalesce"]
+
+T = TypeVar("T")
+
+KEY_PREFIX = "singleflight"
+_FAILED = "failed"
+_DONE = "done"
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+_calls: Dict[str, _Call] = {}
+_calls_lock = threading.Lock()
+
+
+def _lock_key(key: str) -> str:
+    return f"{KEY_PREFIX}:{key}:lock"
+
+
+def _result_key(key: str, token: str) -> str:
+    return f"{KEY_PREFIX}:{key}:result:{token}"
+
+
+class _CacheUnavailable(Exception):
+    pass
+
+
+def _cache_call(method: str, *args):
+    try:
+        return getattr(cache, method)(*args)
+    except Exception as exc:
+        raise _CacheUnavailable from exc
+
+
+def _lead(key: str, token: str, fn: Callable[[], T]) -> T:
+    state, value = _FAILED, None
+    try:
+        value = fn()
+        state = _DONE
+        return value
+    finally:
+        try:
+            cache.set(
+                _result_key(key, token),
+                (state, value),
+                settings.SINGLE_FLIGHT_RESULT_TTL,
+            )
+            if cache.get(_lock_key(key)) == token:
+                cache.delete(_lock_key(key))
+        except Exception as exc:
+            # the followers time out and run it themselves
+            logging.exception(exc)
+
+
+def _across_workers(key: str, fn: Callable[[], T]) -> T:
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        token = uuid4().hex
+        lock_timeout = settings.SINGLE_FLIGHT_LOCK_TIMEOUT
+        if _cache_call("add", _lock_key(key), token, lock_timeout):
+            return _lead(key, token, fn)
+
+        leader = _cache_call("get", _lock_key(key))
+        delay = 0.02
+        while leader and time.monotonic() < deadline:
+            result = _cache_call("get", _result_key(key, leader))
+            if result is not None:
+                state, value = result
+                if state == _DONE:
+                    logging.debug(f"Coalesced {key!r} with another worker.")
+                    return value
+                # the leader failed, run it ourselves rather than sharing its error
+                return fn()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            if _cache_call("get", _lock_key(key)) != leader:
+                # the leader is gone, its result may have been written just before
+                result = _cache_call("get", _result_key(key, leader))
+                if result is not None and result[0] == _DONE:
+                    return result[1]
+                break
+
+    logging.warning(f"Gave up waiting on the single flight of {key!r}.")
+    return fn()
+
+
+def coalesce(key: str, fn: Callable[[], T]) -> T:
+    """run ``fn`` once for all the concurrent callers of the same ``key``, in this
+    process and in every other worker sharing the cache. ``fn`` must return a
+    picklable value.
+    """
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        if call.done.wait(settings.SINGLE_FLIGHT_WAIT_TIMEOUT):
+            if call.error is not None:
+                raise call.error
+            logging.debug(f"Coalesced {key!r} within the process.")
+            return call.value
+        return fn()
+
+    try:
+        try:
+            call.value = _across_workers(key, fn)
+        except _CacheUnavailable as exc:
+            # the shared cache is unreachable, coalesce within the process only
+            logging.exception(exc)
+            call.value = fn()
+        return call.value
+    except BaseException as exc:
+        call.error = exc
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.done.set()
@@ -0,0 +1,164 @@
+"""
+Streaming JSON responses for the endpoints returning too many rows to be rendered
+in one piece.
+
+The rows are produced in batches and serialized as they come, either as NDJSON (one
+row per line) or as the usual ``CustomRenderer`` envelope written piece by piece,
+so the memory used does not grow with the size of the result.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camelize
+from rest_framework import exceptions, status
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.services import fast_json
+
+__all__ = [
+    "STREAM_QUERY_PARAM",
+    "NDJSON",
+    "JSON",
+    "get_stream_format",
+    "StreamingContentNegotiation",
+    "streaming_response",
+    "streaming_page_response",
+]
+
+STREAM_QUERY_PARAM = "stream"
+NDJSON = "ndjson"
+JSON = "json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+Batches = Iterable[List[Any]]
+
+
+def get_stream_format(request: Request) -> str | None:
+    """streaming format asked with ``?stream=ndjson|json`` or an NDJSON ``Accept``"""
+    stream_format = request.query_params.get(STREAM_QUERY_PARAM)
+    if stream_format in (NDJSON, JSON):
+        return stream_format
+    if NDJSON_CONTENT_TYPE in request.headers.get("Accept", ""):
+        return NDJSON
+    return None
+
+
+class StreamingContentNegotiation(DefaultContentNegotiation):
+    """
+    Content negotiation letting an NDJSON ``Accept`` reach the view: no renderer
+    offers NDJSON, the streams are written by ``streaming_response``. The other
+    responses of the request (errors, views not streaming) use the first renderer.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except exceptions.NotAcceptable:
+            if NDJSON_CONTENT_TYPE not in request.headers.get("Accept", ""):
+                raise
+            return renderers[0], renderers[0].media_type
+
+
+def _dumps(data: Any) -> str:
+    # same output as CustomRenderer: camelized keys, compact & unicode
+    if settings.FAST_JSON_RENDERER and fast_json.is_available():
+        rendered = fast_json.render(data)
+        if rendered is not None:
+            return rendered.decode()
+    return json.dumps(
+        camelize(data, **api_settings.JSON_UNDERSCOREIZE),
+        cls=JSONEncoder,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def _ndjson(batches: Batches) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(f"{_dumps(row)}\n" for row in batch)
+
+
+def _rows(batches: Batches) -> Iterator[str]:
+    separator = ""
+    for batch in batches:
+        if not batch:
+            continue
+        yield separator + ",".join(_dumps(row) for row in batch)
+        separator = ","
+
+
+def _json_envelope(batches: Batches) -> Iterator[str]:
+    yield f'{{"status":"success","code":{status.HTTP_200_OK},"data":['
+    yield from _rows(batches)
+    yield '],"message":null}'
+
+
+def _json_page_envelope(
+    batches: Batches, get_meta: Callable[[], Dict[str, Any]]
+) -> Iterator[str]:
+    yield f'{{"status":"success","code":{status.HTTP_200_OK},"data":{{"results":['
+    yield from _rows(batches)
+    # the other fields of the page once its rows are known, e.g. the next link
+    meta = _dumps(get_meta())
+    yield "]" + (f",{meta[1:]}" if len(meta) > 2 else "}") + ',"message":null}'
+
+
+class _ClosingIterator:
+    """closed by django once the response is sent or the client went away, even
+    when the iteration never started.
+    """
+
+    def __init__(self, iterator: Iterator[str], on_close: Callable[[], None] | None):
+        self._iterator = iterator
+        self._on_close = on_close
+
+    def __iter__(self) -> Iterator[str]:
+        return self._iterator
+
+    def close(self) -> None:
+        try:
+            self._iterator.close()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+def streaming_response(
+    batches: Batches,
+    stream_format: str,
+    on_close: Callable[[], None] | None = None,
+) -> StreamingHttpResponse:
+    """stream the row batches in the given format, ``on_close`` releases the
+    resources the batches are read from.
+    """
+    if stream_format == NDJSON:
+        content, content_type = _ndjson(batches), NDJSON_CONTENT_TYPE
+    else:
+        content, content_type = _json_envelope(batches), "application/json"
+    return StreamingHttpResponse(
+        _ClosingIterator(content, on_close), content_type=content_type
+    )
+
+
+def streaming_page_response(
+    batches: Batches,
+    stream_format: str,
+    get_meta: Callable[[], Dict[str, Any]],
+    on_close: Callable[[], None] | None = None,
+) -> StreamingHttpResponse:
+    """stream a page of a paginated list in the envelope of ``CustomRenderer``,
+    ``results`` first, then the fields returned by ``get_meta`` once the rows are
+    written. NDJSON streams the rows only.
+    """
+    if stream_format == NDJSON:
+        return streaming_response(batches, stream_format, on_close)
+    return StreamingHttpResponse(
+        _ClosingIterator(_json_page_envelope(batches, get_meta), on_close),
+        content_type="application/json",
+    )
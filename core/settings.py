@@ -2,21 +2,19 @@ import os
 from pathlib import Path
 from typing import Optional
 
-import oracledb
+from celery.schedules import crontab
+from corsheaders.defaults import default_headers
 from decouple import config
 
 from core.openapi_metadata import SETTINGS_METADATA as OPENAPI_SETTINGS
+from core.services.oidc import lazy_oidc_private_key
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Define the path to the logs folder
+# Define the path to the logs folder, created with the first log file
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 
-# Check if the logs folder exists, if not, create it
-if not os.path.exists(LOGS_DIR):
-    os.makedirs(LOGS_DIR)
-
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config("SECRET_KEY", default="putyourownkey")
 
@@ -53,6 +51,10 @@ CORS_ALLOW_METHODS = (
     "PUT",
 )
 
+# conditional GETs (see core.services.etags) & idempotent creates of the frontend
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match", "idempotency-key")
+CORS_EXPOSE_HEADERS = ("ETag", "Idempotent-Replayed")
+
 HRMS_API_ENDPOINT = config("EXT_HRMS_API_LINK")
 
 # Application definition
@@ -90,6 +92,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -99,6 +102,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     # custom & third-party middlewares
     "simple_history.middleware.HistoryRequestMiddleware",
+    "core.middleware.ReplicaStickinessMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -123,17 +127,63 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 # ASGI_APPLICATION = "core.asgi.application"
 
+# primary database sessions are either taken from a pool of the process (DB_POOL,
+# see core.db.oracle) or kept open by every thread for DB_CONN_MAX_AGE seconds and
+# health checked before reuse. size the pool to the threads of one gunicorn worker
+# or celery child, not to the whole host.
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+DB_POOL_OPTIONS = {
+    "min": config("DB_POOL_MIN", default=1, cast=int),
+    "max": config("DB_POOL_MAX", default=4, cast=int),
+}
+# pooling doesn't support persistent connections
+DB_CONN_MAX_AGE = 0 if DB_POOL else config("DB_CONN_MAX_AGE", default=600, cast=int)
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.oracle",
+        "ENGINE": "core.db.oracle",
         "NAME": config("DB_SID"),
         "USER": config("DB_USER"),
         "PASSWORD": config("DB_PASSWD"),
         "HOST": config("DB_HOST"),
         "PORT": config("DB_PORT"),
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": DB_POOL_OPTIONS} if DB_POOL else {},
     },
 }
 
+# read replica of the primary database for the views opted in with
+# core.mixins.ReplicaReadMixin (see core.db.replica), off unless DB_REPLICA_HOST
+# is set. point it to the primary database to try the routing locally.
+REPLICA_DATABASE_ALIAS = "replica"
+if DB_REPLICA_HOST := config("DB_REPLICA_HOST", default=""):
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": config("DB_REPLICA_SID", default=DATABASES["default"]["NAME"]),
+        "HOST": DB_REPLICA_HOST,
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+# seconds behind the primary database after which the reads fall back to it
+REPLICA_MAX_LAG = config("DB_REPLICA_MAX_LAG", default=30, cast=int)
+REPLICA_LAG_CHECK_INTERVAL = 10
+# returns the lag in seconds, the default reads the Active Data Guard apply lag.
+# leave it empty to skip the lag check (e.g. two aliases of the same database)
+REPLICA_LAG_QUERY = config(
+    "DB_REPLICA_LAG_QUERY",
+    default="""
+    SELECT EXTRACT(DAY FROM LAG) * 86400 + EXTRACT(HOUR FROM LAG) * 3600
+           + EXTRACT(MINUTE FROM LAG) * 60 + EXTRACT(SECOND FROM LAG)
+      FROM (SELECT TO_DSINTERVAL(VALUE) LAG
+              FROM V$DATAGUARD_STATS
+             WHERE NAME = 'apply lag')
+    """,
+)
+# seconds the reads of a user stay on the primary database after a write
+REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=60, cast=int)
+
 # django restframework configs
 
 REST_FRAMEWORK = {
@@ -143,6 +193,10 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": (
         "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
     ),
+    # the NDJSON streams of the lists (see core.services.streaming)
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS": (
+        "core.services.streaming.StreamingContentNegotiation"
+    ),
     "DEFAULT_PARSER_CLASSES": (
         "djangorestframework_camel_case.parser.CamelCaseMultiPartParser",
         "djangorestframework_camel_case.parser.FormParser",
@@ -163,6 +217,64 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
+# render the CustomRenderer responses with orjson & memoized camelCase keys (see
+# core.services.fast_json), the output is the same as the default renderer
+FAST_JSON_RENDERER = config("FAST_JSON_RENDERER", default=True, cast=bool)
+# total_objects of the paginated lists (see core.services.counts), seconds the
+# cached counts are kept for a user & filters
+PAGINATION_COUNT_CACHE_TIMEOUT = config(
+    "PAGINATION_COUNT_CACHE_TIMEOUT", default=60, cast=int
+)
+# estimated counts under this are counted exactly
+PAGINATION_ESTIMATE_EXACT_BELOW = config(
+    "PAGINATION_ESTIMATE_EXACT_BELOW", default=10_000, cast=int
+)
+# rows fetched & serialized at a time by the streamed list pages (?stream=)
+LIST_STREAM_CHUNK_SIZE = config("LIST_STREAM_CHUNK_SIZE", default=200, cast=int)
+# delta sync of the lists (see core.services.delta_sync), seconds the watermark is
+# moved back by for the rows committed late
+DELTA_SYNC_OVERLAP = config("DELTA_SYNC_OVERLAP", default=5, cast=int)
+# days the tombstones of the deleted rows are kept, older watermarks get a 410
+DELTA_SYNC_TOMBSTONE_DAYS = config("DELTA_SYNC_TOMBSTONE_DAYS", default=30, cast=int)
+# sub-requests of the batch endpoint (see core.services.batch), the threads of a
+# parallel batch each hold a database connection while they run
+BATCH_MAX_REQUESTS = config("BATCH_MAX_REQUESTS", default=20, cast=int)
+BATCH_MAX_WORKERS = config("BATCH_MAX_WORKERS", default=4, cast=int)
+# Idempotency-Key of the create endpoints (see core.services.idempotency), seconds
+# a response is replayed for, and the claim of a running request is held for
+IDEMPOTENCY_TTL = config("IDEMPOTENCY_TTL", default=60 * 60 * 24, cast=int)
+IDEMPOTENCY_LOCK_TIMEOUT = config("IDEMPOTENCY_LOCK_TIMEOUT", default=300, cast=int)
+
+# response compression (see core.middleware.CompressionMiddleware)
+COMPRESSION_ENABLED = config("COMPRESSION_ENABLED", default=True, cast=bool)
+# bytes under which a response is sent as is, streaming ones are always compressed
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+# brotli is preferred when the client accepts it and the package is installed
+COMPRESSION_BROTLI = config("COMPRESSION_BROTLI", default=True, cast=bool)
+COMPRESSION_BROTLI_QUALITY = config("COMPRESSION_BROTLI_QUALITY", default=4, cast=int)
+COMPRESSION_GZIP_LEVEL = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+# media types already compressed, matched on their prefix
+COMPRESSION_SKIP_CONTENT_TYPES = (
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/pdf",
+    "application/octet-stream",
+    "application/vnd.openxmlformats-officedocument",
+    "text/event-stream",
+)
+# per endpoint ratio & time of the compressed responses, see compression_stats
+COMPRESSION_STATS_ENABLED = config(
+    "COMPRESSION_STATS_ENABLED", default=True, cast=bool
+)
+# seconds the metrics of an endpoint are kept after its last compressed response
+COMPRESSION_STATS_TTL = 60 * 60 * 24 * 7
 
 # Oauth2 Settings
 LOGIN_URL = "/admin/login/"
@@ -174,24 +286,8 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 10024
 
 oauth_dir = BASE_DIR / "oauth/oidc.pem"
 
-try:
-    if not oauth_dir.exists():
-        from .services.utils import generate_rsa_key, save_key
-
-        oauth_dir.parent.mkdir(parents=True)
-
-        pem = generate_rsa_key()
-        save_key(pem, oauth_dir)
-except Exception as exc:
-    raise exc
-
-try:
-    with open(oauth_dir, mode="rb") as f:
-        OIDC_RSA_PRIVATE_KEY = f.read().decode()
-except FileNotFoundError as err:
-    raise FileNotFoundError(
-        "RSA Private Key is required for the OAuth2 setup."
-    ) from err
+# read, or generated when missing, the first time the OAuth2 provider signs a token
+OIDC_RSA_PRIVATE_KEY = lazy_oidc_private_key(oauth_dir)
 
 
 def make_seconds(*, day: Optional[int] = None, minute: Optional[int] = None) -> int:
@@ -292,6 +388,45 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_TIMEZONE = "Asia/Dhaka"
 CELERY_RESULT_BACKEND = "django-db"
 CELERY_RESULT_EXTENDED = True
+CELERY_BEAT_SCHEDULE = {
+    "sync_ebs_credit_snapshot": {
+        "task": "sync_ebs_credit_snapshot",
+        # off-hours, before the sales team starts submitting applications
+        "schedule": crontab(
+            hour=config("EBS_SNAPSHOT_HOUR", default=2, cast=int), minute=0
+        ),
+    },
+    "sync_ebs_party_mirror": {
+        "task": "sync_ebs_party_mirror",
+        "schedule": config("EBS_MIRROR_SYNC_INTERVAL", default=60 * 5, cast=int),
+    },
+    # catches the changes of the EBS views without a LAST_UPDATE_DATE (contacts)
+    "full_sync_ebs_party_mirror": {
+        "task": "sync_ebs_party_mirror",
+        "schedule": crontab(hour=3, minute=30, day_of_week="fri"),
+        "kwargs": {"full": True},
+    },
+    "prune_tombstones": {
+        "task": "prune_tombstones",
+        "schedule": crontab(hour=4, minute=0),
+    },
+}
+
+# cache configs, shared by every worker through the same redis as celery
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("CACHE_REDIS_URL", default=CELERY_BROKER_URL),
+        "KEY_PREFIX": config("CACHE_KEY_PREFIX", default="oss"),
+        # bump to drop every cached entry after an incompatible deploy
+        "VERSION": config("CACHE_VERSION", default=1, cast=int),
+        "TIMEOUT": 60 * 5,
+    },
+}
+# redis of the compression metrics
+COMPRESSION_STATS_REDIS_URL = config(
+    "COMPRESSION_STATS_REDIS_URL", default=CACHES["default"]["LOCATION"]
+)
 
 # logging configs
 LOGGING = {
@@ -322,8 +457,8 @@ LOGGING = {
         },
         "production_file": {
             "level": "WARNING",
-            "class": "logging.handlers.RotatingFileHandler",
-            "filename": "logs/main.log",
+            "class": "core.log_handlers.LazyRotatingFileHandler",
+            "filename": os.path.join(LOGS_DIR, "main.log"),
             "maxBytes": 1024 * 1024 * 5,  # 5 MB
             "backupCount": 7,
             "formatter": "main_formatter",
@@ -331,8 +466,8 @@ LOGGING = {
         },
         "debug_file": {
             "level": "DEBUG",
-            "class": "logging.handlers.RotatingFileHandler",
-            "filename": "logs/debug.log",
+            "class": "core.log_handlers.LazyRotatingFileHandler",
+            "filename": os.path.join(LOGS_DIR, "debug.log"),
             "maxBytes": 1024 * 1024 * 5,  # 5 MB
             "backupCount": 7,
             "formatter": "main_formatter",
@@ -349,19 +484,141 @@ LOGGING = {
 
 
 # EBS Oracle Settings
-try:
-    oracledb.init_oracle_client(
-        lib_dir=config("EBS_ORCL_INSTANT_CLIENT_PATH"),
-    )
-    EBS_CONN_PARAMS = oracledb.ConnectParams(
-        user=config("EBS_USERNAME"),
-        password=config("EBS_PASSWD"),
-        host=config("EBS_HOST"),
-        port=config("EBS_PORT"),
-        service_name=config("EBS_SERVICE_NAME"),
-    )
-except Exception as exc:
-    raise exc from exc
+# "thin" or "thick", the Instant Client is only loaded in thick mode, on the first
+# Oracle connection of the process (see core.services.oracle_client). the mode
+# applies to the primary database connections too.
+EBS_ORCL_CLIENT_MODE = config("EBS_ORCL_CLIENT_MODE", default="thick")
+EBS_ORCL_INSTANT_CLIENT_PATH = config("EBS_ORCL_INSTANT_CLIENT_PATH", default="")
+# keyword arguments of oracledb.connect, the driver is only imported on first use
+EBS_CONN_PARAMS = {
+    "user": config("EBS_USERNAME"),
+    "password": config("EBS_PASSWD"),
+    "host": config("EBS_HOST"),
+    "port": config("EBS_PORT"),
+    "service_name": config("EBS_SERVICE_NAME"),
+}
+
+# EBS session pool, created lazily per process (see pms.services.ebs_pool)
+EBS_POOL_MIN = config("EBS_POOL_MIN", default=1, cast=int)
+# one session for each of the concurrent credit limit queries
+EBS_POOL_MAX = config("EBS_POOL_MAX", default=5, cast=int)
+EBS_POOL_INCREMENT = config("EBS_POOL_INCREMENT", default=1, cast=int)
+# seconds a session may stay idle before being pinged on acquire, 0 pings always
+EBS_POOL_PING_INTERVAL = config("EBS_POOL_PING_INTERVAL", default=0, cast=int)
+# milliseconds to wait for a free session before failing
+EBS_POOL_WAIT_TIMEOUT = config("EBS_POOL_WAIT_TIMEOUT", default=5000, cast=int)
+# statements kept parsed by every session, more than the named EBS queries
+EBS_POOL_STMT_CACHE_SIZE = config("EBS_POOL_STMT_CACHE_SIZE", default=50, cast=int)
+
+# EBS cursor fetch profiles (see pms.services.ebs_fetch), tune them with
+# `manage.py ebs_fetch_benchmark`. prefetchrows one past the expected row count
+# saves the round trip detecting the end of the rows.
+EBS_FETCH_PROFILES = {
+    "default": {"arraysize": 100, "prefetchrows": 2},
+    "single_row": {"arraysize": 1, "prefetchrows": 2},
+    "small": {"arraysize": 50, "prefetchrows": 51},
+    "bulk": {"arraysize": 1000, "prefetchrows": 1000},
+    "stream": {"arraysize": 500, "prefetchrows": 501},
+    "scan": {"arraysize": 5000, "prefetchrows": 5000},
+}
+# queries not listed here use the "default" profile
+EBS_QUERY_FETCH_PROFILES = {
+    "party_grading": "single_row",
+    "max_inv_due_count": "single_row",
+    "party_status": "single_row",
+    "party_default_addr": "single_row",
+    "basic_party": "single_row",
+    "party_master": "small",
+    "party_addresses": "small",
+    "party_collections": "bulk",
+    "party_collection_ledger": "bulk",
+    "party_collection_stream": "stream",
+    "party_batch": "bulk",
+    "credit_snapshot": "bulk",
+    "party_mirror": "bulk",
+    "party_mirror_changes": "scan",
+}
+
+# EBS query results cache (see pms.services.ebs_cache), values in seconds
+EBS_RESULT_CACHE_DEFAULT_TTL = 60 * 60
+EBS_RESULT_CACHE_TTL = {
+    "party_grading": 60 * 60 * 6,
+    "party_status": 60 * 60 * 6,
+    "party_default_addr": 60 * 60 * 24,
+    "max_inv_due_count": 60 * 60,
+    "party_collections": 60 * 15,
+}
+# how long an expired result is still served while it is being refreshed
+EBS_RESULT_CACHE_STALE_TTL = config(
+    "EBS_RESULT_CACHE_STALE_TTL", default=60 * 60 * 24 * 3, cast=int
+)
+# how long an unknown WITP code is remembered
+EBS_RESULT_CACHE_NEGATIVE_TTL = config(
+    "EBS_RESULT_CACHE_NEGATIVE_TTL", default=60 * 5, cast=int
+)
+EBS_RESULT_CACHE_REFRESH_LOCK = 60
+
+# credit limit EBS post process
+CREDIT_LIMIT_EBS_TIME_BUDGET = config(
+    "CREDIT_LIMIT_EBS_TIME_BUDGET", default=60, cast=int
+)
+CREDIT_LIMIT_POST_PROCESS_MAX_RETRIES = 8
+# retry countdown is a random value up to min(MAX_BACKOFF, BACKOFF * 2 ** retries)
+CREDIT_LIMIT_POST_PROCESS_BACKOFF = 5
+CREDIT_LIMIT_POST_PROCESS_MAX_BACKOFF = 60 * 10
+
+# seconds a full EBS snapshot or mirror sync may run before its task is killed
+EBS_SYNC_TIME_LIMIT = config("EBS_SYNC_TIME_LIMIT", default=60 * 60 * 4, cast=int)
+
+# nightly EBS credit metrics snapshot (see pms.services.credit_snapshot_services)
+EBS_SNAPSHOT_BATCH_SIZE = config("EBS_SNAPSHOT_BATCH_SIZE", default=500, cast=int)
+# seconds a snapshot is served before falling back to live EBS
+EBS_SNAPSHOT_MAX_AGE = config("EBS_SNAPSHOT_MAX_AGE", default=60 * 60 * 26, cast=int)
+
+# incremental EBS party master mirror (see pms.services.ebs_mirror_services)
+EBS_MIRROR_BATCH_SIZE = config("EBS_MIRROR_BATCH_SIZE", default=500, cast=int)
+# seconds re-read before the watermark for the rows committed late
+EBS_MIRROR_OVERLAP = 60 * 10
+# seconds since the last complete sync before the lookups fall back to live EBS
+EBS_MIRROR_MAX_LAG = config("EBS_MIRROR_MAX_LAG", default=60 * 60, cast=int)
+EBS_MIRROR_SYNC_LOCK = EBS_SYNC_TIME_LIMIT
+
+# coalescing of identical concurrent calls (see core.services.single_flight)
+# seconds the leader holds the call, longer than the slowest EBS query
+SINGLE_FLIGHT_LOCK_TIMEOUT = config("SINGLE_FLIGHT_LOCK_TIMEOUT", default=120, cast=int)
+# seconds the followers wait on the leader before running the call themselves
+SINGLE_FLIGHT_WAIT_TIMEOUT = config("SINGLE_FLIGHT_WAIT_TIMEOUT", default=60, cast=int)
+# seconds the result is kept for the followers of other workers
+SINGLE_FLIGHT_RESULT_TTL = 10
+
+# cluster wide limit of the concurrent EBS queries (see pms.services.ebs_limiter)
+EBS_LIMITER_ENABLED = config("EBS_LIMITER_ENABLED", default=True, cast=bool)
+EBS_LIMITER_REDIS_URL = config(
+    "EBS_LIMITER_REDIS_URL", default=CACHES["default"]["LOCATION"]
+)
+# slots of every query class, shared by all the web and celery workers
+EBS_CONCURRENCY_LIMITS = {
+    "default": config("EBS_CONCURRENCY_LIMIT", default=16, cast=int),
+    "heavy": config("EBS_CONCURRENCY_LIMIT_HEAVY", default=4, cast=int),
+}
+# queries not listed here are "default"
+EBS_QUERY_CLASSES = {
+    "party_status": "heavy",
+    "party_collections": "heavy",
+    "party_collection_ledger": "heavy",
+    "party_collection_stream": "heavy",
+    "credit_snapshot": "heavy",
+    "party_mirror": "heavy",
+}
+# seconds to wait for a slot before answering 503
+EBS_LIMITER_ACQUIRE_TIMEOUT = config(
+    "EBS_LIMITER_ACQUIRE_TIMEOUT", default=5, cast=int
+)
+# seconds the background syncs wait for a slot
+EBS_LIMITER_SYNC_TIMEOUT = 60 * 5
+# seconds after which the slot of a crashed worker is reclaimed, the syncs take
+# a slot per batch
+EBS_LIMITER_LEASE = 60 * 15
 
 # For Menu Work
 HEADER_AUTH_KEY = "Authorization"
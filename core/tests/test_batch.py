@@ -0,0 +1,105 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.views import BatchView
+from dropdown_repository.pms.models import DivisionLov
+
+djangodb = pytest.mark.django_db
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+DIVISIONS_URL = "/api/v1/dr/pms/divisions/"
+
+
+@pytest.fixture
+def user():
+    # left unsaved, saving a user looks the employee up in the hrms
+    return get_user_model()(username="batch")
+
+
+def _batch(user, urls, parallel=False):
+    body = {
+        "requests": [
+            {"id": f"item-{index}", "url": url} for index, url in enumerate(urls)
+        ],
+        "parallel": parallel,
+    }
+    request = APIRequestFactory().post("/api/v1/batch", body, format="json")
+    force_authenticate(request, user=user)
+    return BatchView.as_view()(request)
+
+
+def _codes(response):
+    return [item["code"] for item in response.data["responses"]]
+
+
+@djangodb
+def test_batch_answers_every_item_with_its_own_status(user) -> None:
+    division = DivisionLov.objects.create(name="Dhaka")
+
+    response = _batch(
+        user,
+        [
+            DIVISIONS_URL,
+            f"{DIVISIONS_URL}{division.pk}/",
+            f"{DIVISIONS_URL}0/",
+            "/api/v1/nowhere",
+        ],
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert _codes(response) == [
+        status.HTTP_200_OK,
+        status.HTTP_200_OK,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_404_NOT_FOUND,
+    ]
+    items = response.data["responses"]
+    assert [item["id"] for item in items] == ["item-0", "item-1", "item-2", "item-3"]
+    assert items[0]["status"] == "success"
+    assert items[1]["data"]["name"] == "Dhaka"
+    assert items[2]["status"] == "not_found"
+    assert items[2]["data"] is None
+
+
+@djangodb
+def test_batch_rejects_nested_batches_and_urls_outside_the_api(
+    user,
+) -> None:
+    response = _batch(user, ["/api/v1/batch", "/admin/"])
+
+    assert _codes(response) == [status.HTTP_400_BAD_REQUEST] * 2
+
+
+@djangodb
+def test_batch_runs_the_items_in_parallel_in_their_order(user) -> None:
+    urls = [DIVISIONS_URL, "/api/v1/batch", "/api/v1/nowhere"]
+
+    response = _batch(user, urls, parallel=True)
+
+    assert _codes(response) == [
+        status.HTTP_200_OK,
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_404_NOT_FOUND,
+    ]
+
+
+@djangodb
+def test_batch_limits_the_number_of_items(user, settings) -> None:
+    settings.BATCH_MAX_REQUESTS = 2
+
+    response = _batch(user, [DIVISIONS_URL] * 3)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_batch_needs_an_authenticated_user() -> None:
+    request = APIRequestFactory().post(
+        "/api/v1/batch", {"requests": [{"url": DIVISIONS_URL}]}, format="json"
+    )
+
+    response = BatchView.as_view()(request)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
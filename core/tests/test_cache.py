@@ -0,0 +1,80 @@
+import pytest
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.services.cache import cache_response, invalidate_tags, make_key
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+
+def test_make_key_is_stable_until_a_tag_is_invalidated() -> None:
+    key = make_key("ns", "a", 1, tags=["pms.party"])
+
+    assert make_key("ns", "a", 1, tags=["pms.party"]) == key
+    invalidate_tags("pms.party")
+    assert make_key("ns", "a", 1, tags=["pms.party"]) != key
+
+
+def test_invalidate_tags_leaves_other_tags_keys_alone() -> None:
+    key = make_key("ns", "a", tags=["pms.creditlimit"])
+
+    invalidate_tags("pms.party")
+
+    assert make_key("ns", "a", tags=["pms.creditlimit"]) == key
+
+
+def test_make_key_changes_with_any_of_its_tags() -> None:
+    key = make_key("ns", "a", tags=["pms.party", "pms.party:7"])
+
+    invalidate_tags("pms.party:7")
+
+    assert make_key("ns", "a", tags=["pms.party", "pms.party:7"]) != key
+
+
+class CountingView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    calls = 0
+
+    @cache_response(
+        60,
+        tags=["tests.counting"],
+        vary_on=lambda view, request: [request.headers.get("X-Variant")],
+    )
+    def get(self, request):
+        CountingView.calls += 1
+        return Response({"calls": CountingView.calls})
+
+
+@pytest.fixture
+def counting_view():
+    CountingView.calls = 0
+    return CountingView.as_view()
+
+
+def test_cache_response_serves_the_cached_data(counting_view) -> None:
+    factory = APIRequestFactory()
+
+    first = counting_view(factory.get("/counting"))
+    second = counting_view(factory.get("/counting"))
+
+    assert first.data == second.data == {"calls": 1}
+
+
+def test_cache_response_misses_after_invalidation(counting_view) -> None:
+    factory = APIRequestFactory()
+
+    counting_view(factory.get("/counting"))
+    invalidate_tags("tests.counting")
+
+    assert counting_view(factory.get("/counting")).data == {"calls": 2}
+
+
+def test_cache_response_keeps_an_entry_per_vary_on_value(counting_view) -> None:
+    factory = APIRequestFactory()
+
+    counting_view(factory.get("/counting", HTTP_X_VARIANT="a"))
+    response = counting_view(factory.get("/counting", HTTP_X_VARIANT="b"))
+
+    assert response.data == {"calls": 2}
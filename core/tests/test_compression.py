@@ -0,0 +1,97 @@
+import gzip
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from core.middleware import CompressionMiddleware
+from core.services import compression
+from core.services.compression import BROTLI, GZIP
+
+ROW = b'{"partyName":"Walton"}'
+BODY = b'{"results":[' + b",".join(ROW for _ in range(200)) + b"]}"
+
+
+@pytest.fixture(autouse=True)
+def compression_settings(settings):
+    settings.COMPRESSION_ENABLED = True
+    settings.COMPRESSION_BROTLI = True
+    settings.COMPRESSION_MIN_SIZE = 1024
+    settings.COMPRESSION_STATS_ENABLED = False
+
+
+@pytest.mark.parametrize(
+    ["accept_encoding", "expected"],
+    [
+        ("gzip, deflate, br", BROTLI),
+        ("gzip", GZIP),
+        ("br;q=0.5, gzip;q=1.0", GZIP),
+        ("br;q=1.0, gzip;q=0.5", BROTLI),
+        ("GZIP;Q=0.8", GZIP),
+        ("br;q=0, gzip", GZIP),
+        ("gzip;q=0", None),
+        ("gzip;q=0, br;q=0", None),
+        ("*", BROTLI),
+        ("*;q=0.2, br;q=0", GZIP),
+        ("identity", None),
+        ("deflate", None),
+        ("", None),
+        ("gzip;q=oops, br;q=0.1", BROTLI),
+    ],
+)
+def test_choose_encoding_follows_the_q_values(accept_encoding, expected) -> None:
+    assert compression.choose_encoding(accept_encoding) == expected
+
+
+def test_choose_encoding_falls_back_to_gzip_without_brotli(settings) -> None:
+    settings.COMPRESSION_BROTLI = False
+
+    assert compression.choose_encoding("br, gzip;q=0.1") == GZIP
+    assert compression.choose_encoding("br") is None
+
+
+def _middleware(response):
+    return CompressionMiddleware(lambda request: response)
+
+
+def test_middleware_compresses_with_the_negotiated_encoding() -> None:
+    response = HttpResponse(BODY, content_type="application/json")
+    response["ETag"] = '"abc"'
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="br;q=0.1, gzip")
+
+    compressed = _middleware(response)(request)
+
+    assert compressed["Content-Encoding"] == GZIP
+    assert compressed["Vary"] == "Accept-Encoding"
+    assert compressed["ETag"] == 'W/"abc"'
+    assert gzip.decompress(compressed.content) == BODY
+
+
+def test_middleware_leaves_small_responses_as_they_are() -> None:
+    response = HttpResponse(b'{"ok":true}', content_type="application/json")
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert not _middleware(response)(request).has_header("Content-Encoding")
+
+
+def test_middleware_sends_identity_when_nothing_is_acceptable() -> None:
+    response = HttpResponse(BODY, content_type="application/json")
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip;q=0")
+
+    sent = _middleware(response)(request)
+
+    assert not sent.has_header("Content-Encoding")
+    assert sent["Vary"] == "Accept-Encoding"
+    assert sent.content == BODY
+
+
+def test_middleware_compresses_streaming_responses() -> None:
+    response = StreamingHttpResponse(
+        iter([BODY[:500], BODY[500:]]), content_type="application/x-ndjson"
+    )
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+    compressed = _middleware(response)(request)
+
+    assert compressed["Content-Encoding"] == GZIP
+    assert gzip.decompress(b"".join(compressed.streaming_content)) == BODY
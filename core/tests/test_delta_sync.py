@@ -0,0 +1,136 @@
+from datetime import timedelta
+from urllib.parse import quote
+
+import pytest
+from django.utils import timezone
+from rest_framework import exceptions, serializers, status
+from rest_framework.generics import ListAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.mixins import DeltaSyncMixin
+from core.pagination import KeysetResultSetPagination
+from core.services import delta_sync
+from dropdown_repository.pms.models import DistrictLov, DivisionLov
+from pms.models import Tombstone
+
+djangodb = pytest.mark.django_db
+
+
+def _parse(query: str):
+    return delta_sync.parse_updated_since(Request(APIRequestFactory().get(query)))
+
+
+def test_parse_updated_since_is_none_without_the_param() -> None:
+    assert _parse("/divisions") is None
+
+
+def test_parse_updated_since_reads_an_offset_left_unescaped() -> None:
+    since = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+    # the + of the offset arrives as a space
+    raw = since.isoformat().replace("+", " ")
+
+    assert _parse(f"/divisions?updated_since={raw}") == since
+
+
+def test_parse_updated_since_makes_naive_watermarks_aware() -> None:
+    since = timezone.localtime().replace(microsecond=0, tzinfo=None)
+
+    parsed = _parse(f"/divisions?updated_since={since.isoformat()}")
+
+    assert timezone.is_aware(parsed)
+
+
+def test_parse_updated_since_rejects_what_is_not_a_date_time() -> None:
+    with pytest.raises(exceptions.ValidationError):
+        _parse("/divisions?updated_since=yesterday")
+
+
+def test_parse_updated_since_is_gone_past_the_tombstone_retention(settings) -> None:
+    settings.DELTA_SYNC_TOMBSTONE_DAYS = 30
+    since = timezone.now() - timedelta(days=31)
+
+    with pytest.raises(delta_sync.DeltaExpiredException) as raised:
+        _parse(f"/divisions?updated_since={quote(since.isoformat())}")
+    assert raised.value.status_code == status.HTTP_410_GONE
+
+
+class DivisionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DivisionLov
+        fields = ("id", "name")
+
+
+class DivisionDeltaView(DeltaSyncMixin, ListAPIView):
+    authentication_classes = []
+    permission_classes = []
+    queryset = DivisionLov.objects.all()
+    serializer_class = DivisionSerializer
+    pagination_class = KeysetResultSetPagination
+
+    def get_queryset(self):
+        return self.filter_updated_since(self.request, super().get_queryset())
+
+
+def _sync(since):
+    url = f"/divisions?updated_since={quote(since.isoformat())}"
+    return DivisionDeltaView.as_view()(APIRequestFactory().get(url))
+
+
+@djangodb
+def test_delta_list_answers_410_to_an_expired_watermark() -> None:
+    response = _sync(timezone.now() - timedelta(days=365))
+
+    assert response.status_code == status.HTTP_410_GONE
+
+
+@djangodb
+def test_delta_list_sends_the_changes_the_deletions_and_a_watermark() -> None:
+    DivisionLov.objects.create(name="Dhaka")
+    since = timezone.now()
+    changed = DivisionLov.objects.create(name="Khulna")
+    removed = DivisionLov.objects.create(name="Sylhet")
+    removed_pk = removed.pk
+    removed.delete()
+    # the LOVs have no tombstone receiver of their own
+    delta_sync.record_deletion(DivisionLov(pk=removed_pk))
+
+    response = _sync(since)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["id"] for row in response.data["results"]] == [changed.pk]
+    assert response.data["deleted"] == [str(removed_pk)]
+    assert response.data["watermark"] <= timezone.now()
+
+
+@djangodb
+def test_deleted_since_lists_each_id_once_after_the_watermark() -> None:
+    before = timezone.now() - timedelta(minutes=1)
+    delta_sync.record_deletion(DivisionLov(pk=1))
+    delta_sync.record_deletion(DivisionLov(pk=2))
+    delta_sync.record_deletion(DivisionLov(pk=1))
+
+    assert delta_sync.deleted_since(DivisionLov, before) == ["1", "2"]
+    assert delta_sync.deleted_since(DivisionLov, timezone.now()) == []
+
+
+@djangodb
+def test_deleted_since_keeps_the_tombstones_of_each_model_apart() -> None:
+    before = timezone.now() - timedelta(minutes=1)
+    delta_sync.record_deletion(DistrictLov(pk=1))
+
+    assert delta_sync.deleted_since(DivisionLov, before) == []
+    assert delta_sync.deleted_since(DistrictLov, before) == ["1"]
+
+
+@djangodb
+def test_prune_tombstones_drops_the_ones_past_the_retention(settings) -> None:
+    settings.DELTA_SYNC_TOMBSTONE_DAYS = 30
+    delta_sync.record_deletion(DivisionLov(pk=1))
+    delta_sync.record_deletion(DivisionLov(pk=2))
+    Tombstone.objects.filter(object_id="1").update(
+        deleted_at=timezone.now() - timedelta(days=31)
+    )
+
+    assert delta_sync.prune_tombstones() == 1
+    assert list(Tombstone.objects.values_list("object_id", flat=True)) == ["2"]
@@ -0,0 +1,138 @@
+import uuid
+
+import pytest
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.services.cache import model_tag
+from core.services.etags import conditional_response, etag_matches, make_etag
+from pms.models import Contact, Party
+from tms.models.product import Product, ProductAnalysis
+from tms.views.tender import tender_tags
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+
+class PartyDetailView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    renders = 0
+    version = "2026-10-18T09:30:00"
+
+    @conditional_response(
+        parts=lambda view, request, pk: [PartyDetailView.version],
+        tags=lambda view, request, pk: [model_tag(Party, pk)],
+    )
+    def get(self, request, pk):
+        PartyDetailView.renders += 1
+        if pk == 404:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response({"id": pk})
+
+
+@pytest.fixture
+def party_view():
+    PartyDetailView.renders = 0
+    PartyDetailView.version = "2026-10-18T09:30:00"
+    return PartyDetailView.as_view()
+
+
+def _get(view, pk=7, **headers):
+    return view(APIRequestFactory().get(f"/parties/{pk}", **headers), pk=pk)
+
+
+def test_first_get_sends_the_etag(party_view) -> None:
+    response = _get(party_view)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"].startswith('"')
+
+
+def test_matching_if_none_match_gets_a_304_without_rendering(party_view) -> None:
+    etag = _get(party_view)["ETag"]
+
+    response = _get(party_view, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert PartyDetailView.renders == 1
+
+
+def test_weak_and_listed_etags_match(party_view) -> None:
+    etag = _get(party_view)["ETag"]
+
+    response = _get(party_view, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_a_new_row_version_changes_the_etag(party_view) -> None:
+    etag = _get(party_view)["ETag"]
+    PartyDetailView.version = "2026-10-18T10:00:00"
+
+    response = _get(party_view, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.parametrize("signal", [post_save, post_delete])
+def test_a_related_row_write_changes_the_etag(party_view, signal) -> None:
+    etag = _get(party_view)["ETag"]
+
+    # a contact of the party changes, the party itself is left as it is
+    signal.send(sender=Contact, instance=Contact(party_id=7), created=False)
+
+    response = _get(party_view, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_a_related_row_of_another_party_keeps_the_etag(party_view) -> None:
+    etag = _get(party_view)["ETag"]
+
+    post_save.send(sender=Contact, instance=Contact(party_id=8), created=False)
+
+    response = _get(party_view, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_error_responses_carry_no_etag(party_view) -> None:
+    response = _get(party_view, pk=404)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert not response.has_header("ETag")
+
+
+class TenderDetailView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    @conditional_response(parts=lambda view, request, id: ["v1"], tags=tender_tags)
+    def get(self, request, id):
+        return Response({"id": str(id)})
+
+
+def test_a_product_analysis_edit_changes_the_tender_etag() -> None:
+    view, tender_id = TenderDetailView.as_view(), uuid.uuid4()
+
+    def get(**headers):
+        return view(APIRequestFactory().get("/tenders", **headers), id=tender_id)
+
+    etag = get()["ETag"]
+    # saved on its own, the product and the tender are left as they are
+    analysis = ProductAnalysis(product=Product(tender_id=tender_id), walton_price="9")
+    post_save.send(sender=ProductAnalysis, instance=analysis, created=False)
+
+    response = get(HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_etag_matches_any_etag_with_a_star() -> None:
+    request = APIRequestFactory().get("/", HTTP_IF_NONE_MATCH="*")
+
+    assert etag_matches(request, make_etag("a"))
@@ -0,0 +1,127 @@
+import pytest
+from django.core.cache import cache
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.services.cache import make_key
+from core.services.idempotency import (
+    _IN_PROGRESS,
+    KEY_PREFIX,
+    REPLAYED_HEADER,
+    _fingerprint,
+    idempotent,
+)
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+PAYLOAD = {"partyName": "Walton", "amount": 100}
+
+
+class OrderView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    runs = 0
+
+    @idempotent
+    def post(self, request):
+        OrderView.runs += 1
+        if request.data.get("invalid"):
+            return Response({"amount": ["Invalid."]}, status.HTTP_400_BAD_REQUEST)
+        if request.data.get("raise"):
+            raise exceptions.ValidationError({"amount": ["Invalid."]})
+        return Response({"order": OrderView.runs}, status.HTTP_201_CREATED)
+
+
+@pytest.fixture
+def order_view():
+    OrderView.runs = 0
+    return OrderView.as_view()
+
+
+def _post(view, data=PAYLOAD, key="order-1"):
+    headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+    return view(APIRequestFactory().post("/orders", data, format="json", **headers))
+
+
+def test_a_retry_gets_the_first_response_replayed(order_view) -> None:
+    first = _post(order_view)
+
+    retry = _post(order_view)
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry.data == first.data == {"order": 1}
+    assert retry[REPLAYED_HEADER] == "true"
+    assert not first.has_header(REPLAYED_HEADER)
+    assert OrderView.runs == 1
+
+
+def test_another_key_runs_again(order_view) -> None:
+    _post(order_view)
+
+    response = _post(order_view, key="order-2")
+
+    assert response.data == {"order": 2}
+    assert OrderView.runs == 2
+
+
+def test_requests_without_a_key_run_every_time(order_view) -> None:
+    _post(order_view, key=None)
+    _post(order_view, key=None)
+
+    assert OrderView.runs == 2
+
+
+def test_a_key_reused_with_another_payload_is_a_422(order_view) -> None:
+    _post(order_view)
+
+    response = _post(order_view, data={**PAYLOAD, "amount": 200})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert OrderView.runs == 1
+
+
+def test_a_retry_while_the_first_request_runs_is_a_409(order_view) -> None:
+    request = APIRequestFactory().post("/orders", PAYLOAD, format="json")
+    fingerprint = _fingerprint(OrderView().initialize_request(request))
+    # the first request claimed the key and has not answered yet
+    cache.add(
+        make_key(KEY_PREFIX, "OrderView.post", None, "order-1"),
+        (_IN_PROGRESS, fingerprint, None),
+    )
+
+    response = _post(order_view)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert OrderView.runs == 0
+
+
+@pytest.mark.parametrize("failure", ["invalid", "raise"])
+def test_a_failed_request_releases_its_key(order_view, failure) -> None:
+    failed = _post(order_view, data={**PAYLOAD, failure: True})
+
+    retry = _post(order_view, data={**PAYLOAD, failure: True})
+
+    assert failed.status_code == retry.status_code == status.HTTP_400_BAD_REQUEST
+    assert not retry.has_header(REPLAYED_HEADER)
+    assert OrderView.runs == 2
+
+
+def test_a_key_longer_than_255_characters_is_rejected(order_view) -> None:
+    response = _post(order_view, key="k" * 256)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert OrderView.runs == 0
+
+
+def test_the_request_runs_when_the_cache_is_down(order_view, monkeypatch) -> None:
+    def unreachable(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(cache, "add", unreachable)
+
+    _post(order_view)
+    _post(order_view)
+
+    assert OrderView.runs == 2
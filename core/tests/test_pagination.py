@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+import pytest
+from django.core.paginator import EmptyPage
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.pagination import CountedPaginator, KeysetResultSetPagination
+from dropdown_repository.pms.models import DivisionLov
+from tms.views.tender import OnGoingTenderListView
+
+djangodb = pytest.mark.django_db
+
+DELTA_ORDERING = ("updated_at", "id")
+
+
+class DeltaView:
+    keyset_ordering = DELTA_ORDERING
+
+
+@pytest.fixture
+def divisions():
+    rows = [DivisionLov.objects.create(name=f"Division {index}") for index in range(7)]
+    # two groups of rows sharing the same timestamps, told apart by their id only
+    tied_at = timezone.now() - timedelta(hours=1)
+    DivisionLov.objects.filter(pk__in=[row.pk for row in rows[:4]]).update(
+        created_at=tied_at, updated_at=tied_at
+    )
+    DivisionLov.objects.filter(pk__in=[row.pk for row in rows[4:]]).update(
+        created_at=tied_at + timedelta(seconds=1),
+        updated_at=tied_at + timedelta(seconds=1),
+    )
+    return rows
+
+
+def _read_page(url: str, view=None):
+    paginator = KeysetResultSetPagination()
+    request = Request(APIRequestFactory().get(url))
+    rows = paginator.paginate_queryset(DivisionLov.objects.all(), request, view=view)
+    return [row.pk for row in rows], paginator.get_page_meta()
+
+
+def _walk(url: str, view=None):
+    pages = []
+    while url:
+        ids, meta = _read_page(url, view)
+        pages.append((ids, meta))
+        url = meta["next"]
+    return pages
+
+
+@djangodb
+def test_keyset_pages_cover_every_row_once_despite_ties(divisions) -> None:
+    expected = list(
+        DivisionLov.objects.order_by(*DELTA_ORDERING).values_list("pk", flat=True)
+    )
+
+    pages = _walk("/divisions?page_size=3", view=DeltaView())
+
+    assert [ids for ids, _ in pages] == [expected[:3], expected[3:6], expected[6:]]
+
+
+@djangodb
+def test_keyset_previous_link_returns_the_previous_page(divisions) -> None:
+    pages = _walk("/divisions?page_size=3", view=DeltaView())
+    (first, _), (second, second_meta), (_, last_meta) = pages
+
+    assert _read_page(last_meta["previous"], DeltaView())[0] == second
+    assert _read_page(second_meta["previous"], DeltaView())[0] == first
+    assert pages[0][1]["previous"] is None
+
+
+@djangodb
+def test_keyset_default_ordering_is_newest_first(divisions) -> None:
+    expected = list(
+        DivisionLov.objects.order_by("-created_at", "-id").values_list(
+            "pk", flat=True
+        )
+    )
+
+    pages = _walk("/divisions?cursor=&page_size=2")
+
+    assert [pk for ids, _ in pages for pk in ids] == expected
+    assert "total_objects" not in pages[0][1]
+
+
+@djangodb
+def test_keyset_cursor_keeps_the_microseconds() -> None:
+    paginator = KeysetResultSetPagination()
+    paginator.view = DeltaView()
+    at = timezone.now().replace(microsecond=123456)
+
+    encoded = paginator.encode_cursor([at, 42], reverse=True)
+
+    values, reverse = paginator.decode_cursor(DivisionLov.objects.all(), encoded)
+    assert values == [at, 42]
+    assert reverse is True
+
+
+@pytest.mark.parametrize("encoded", ["not-base64!", "e30", "eyJ2IjpbMV0sInIiOjB9"])
+def test_keyset_rejects_invalid_cursors(encoded) -> None:
+    paginator = KeysetResultSetPagination()
+    paginator.view = DeltaView()
+
+    with pytest.raises(NotFound):
+        paginator.decode_cursor(DivisionLov.objects.all(), encoded)
+
+
+def test_counted_paginator_trusts_an_exact_count() -> None:
+    paginator = CountedPaginator(list(range(25)), 10, count_func=lambda: 25)
+
+    assert paginator.num_pages == 3
+    assert list(paginator.page(3)) == list(range(20, 25))
+
+
+def test_counted_paginator_corrects_an_overcount_on_the_last_page() -> None:
+    paginator = CountedPaginator(
+        list(range(25)), 10, count_func=lambda: 100, exact=False
+    )
+
+    first = paginator.page(1)
+    assert list(first) == list(range(10))
+    assert first.has_next()
+    assert paginator.count == 100
+
+    last = paginator.page(3)
+    assert list(last) == list(range(20, 25))
+    assert not last.has_next()
+    assert paginator.count == 25
+    assert paginator.num_pages == 3
+    assert paginator.exact is True
+
+
+def test_counted_paginator_corrects_an_undercount_with_the_extra_row() -> None:
+    paginator = CountedPaginator(list(range(25)), 10, count_func=lambda: 5, exact=False)
+
+    page = paginator.page(1)
+
+    assert list(page) == list(range(10))
+    assert page.has_next()
+    assert paginator.count == 11
+    assert paginator.num_pages == 2
+
+
+def test_counted_paginator_reads_pages_past_a_stale_count() -> None:
+    paginator = CountedPaginator(list(range(25)), 10, count_func=lambda: 5, exact=False)
+
+    page = paginator.page(2)
+
+    assert list(page) == list(range(10, 20))
+    assert paginator.count == 21
+
+
+def test_counted_paginator_rejects_a_page_past_the_last_row() -> None:
+    paginator = CountedPaginator(
+        list(range(25)), 10, count_func=lambda: 100, exact=False
+    )
+
+    with pytest.raises(EmptyPage):
+        paginator.page(4)
+
+
+def test_tender_page_size_is_kept_off_the_shared_paginator() -> None:
+    assert OnGoingTenderListView().paginator.page_size == 10
+    assert KeysetResultSetPagination().page_size == 50
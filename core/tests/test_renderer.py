@@ -0,0 +1,65 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy as _
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.renderer import CustomRenderer
+from core.services import fast_json
+
+pytestmark = pytest.mark.skipif(
+    not fast_json.is_available(), reason="orjson is not installed"
+)
+
+SAMPLES = [
+    {"party_name": "Walton", "witp_code": "1024", "is_active": True},
+    {"nested_list": [{"credit_limit": 50000, "due_days": None}], "page_2": []},
+    {"unicode_name": "ওয়ালটন", "separators": "line\u2028para\u2029end"},
+    {"created_at": datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)},
+    {"naive_at": datetime(2026, 10, 18, 9, 30), "on": date(2026, 10, 18)},
+    {"at_time": time(9, 30, 15, 500000), "took": timedelta(hours=1, seconds=3)},
+    {"public_id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    {"ratio": 0.25, "big_ratio": 12345.678, "zero": 0.0, "negative": -3},
+    {"other_1": "kept", "other_1_desc": {"inner_key": 1}, "v2_key": "x"},
+    {"lazy_label": _("Not found."), "tuple_value": (1, 2)},
+    [{"row_id": 1}, {"row_id": 2}],
+    {"_private": 1, "trailing_": 2, "double__under": 3},
+]
+FALLBACK_SAMPLES = [
+    {"amount": Decimal("10.50")},
+    {"tiny": 1e-7, "huge": 1e20},
+    {"overflow": 2**70},
+    {"not_a_number": float("nan")},
+    {1: "int key"},
+]
+
+
+@pytest.mark.parametrize("data", SAMPLES)
+def test_fast_json_matches_camel_case_renderer(data) -> None:
+    assert fast_json.render(data) == CamelCaseJSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("data", FALLBACK_SAMPLES)
+def test_fast_json_leaves_the_unsafe_values_to_the_stdlib(data) -> None:
+    assert fast_json.render(data) is None
+
+
+@pytest.mark.parametrize("data", SAMPLES + FALLBACK_SAMPLES)
+def test_custom_renderer_output_is_the_same_on_both_paths(data) -> None:
+    context = {"response": Response(status=status.HTTP_200_OK)}
+    fast, slow = CustomRenderer(), CustomRenderer()
+    fast.fast, slow.fast = True, False
+
+    rendered = fast.render(data, "application/json", context)
+
+    assert rendered == slow.render(data, "application/json", context)
+
+
+def test_camelize_key_translates_like_camel_case_renderer() -> None:
+    assert fast_json.camelize_key("total_objects") == "totalObjects"
+    assert fast_json.camelize_key("page_2_size") == "page2Size"
+    assert fast_json.camelize_key("_private") == "Private"
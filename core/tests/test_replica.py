@@ -0,0 +1,147 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+
+from core.db import replica
+from core.db.routers import ReplicaRouter
+from core.middleware import ReplicaStickinessMiddleware
+from core.mixins import ReplicaReadMixin
+from dropdown_repository.pms.models import DivisionLov
+
+djangodb = pytest.mark.django_db
+
+REPLICA = "replica"
+
+
+@pytest.fixture(autouse=True)
+def replica_database(settings, local_cache, monkeypatch):
+    """a ``replica`` alias mirroring the default database, as settings.py sets it up
+    with ``DB_REPLICA_HOST`` pointed to the primary database
+    """
+    settings.REPLICA_DATABASE_ALIAS = REPLICA
+    settings.REPLICA_LAG_QUERY = ""
+    settings.REPLICA_MAX_LAG = 30
+    monkeypatch.setitem(
+        settings.DATABASES,
+        REPLICA,
+        {**connections.settings[DEFAULT_DB_ALIAS], "TEST": {"MIRROR": "default"}},
+    )
+    connections[REPLICA].creation.set_as_test_mirror(
+        connections[DEFAULT_DB_ALIAS].settings_dict
+    )
+    yield
+    connections[REPLICA].close()
+    del connections[REPLICA]
+
+
+class DivisionViewSet(ReplicaReadMixin, ViewSet):
+    authentication_classes = []
+    permission_classes = []
+
+    def _routed_to(self):
+        return Response({"db": DivisionLov.objects.all().db})
+
+    def list(self, request):
+        return self._routed_to()
+
+    def retrieve(self, request, pk=None):
+        return self._routed_to()
+
+
+class DivisionCreateView(APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    def post(self, request):
+        DivisionLov.objects.create(name=request.data["name"])
+        return Response(status=201)
+
+
+def _user(pk: int):
+    return get_user_model()(pk=pk, username=f"user-{pk}")
+
+
+def _read(action="list", user=None):
+    view = DivisionViewSet.as_view({"get": action})
+    request = APIRequestFactory().get("/divisions")
+    if user is not None:
+        force_authenticate(request, user=user)
+    kwargs = {} if action == "list" else {"pk": 1}
+    return view(request, **kwargs).data["db"]
+
+
+def _write(user):
+    middleware = ReplicaStickinessMiddleware(DivisionCreateView.as_view())
+    request = APIRequestFactory().post("/divisions", {"name": "Dhaka"}, format="json")
+    force_authenticate(request, user=user)
+    return middleware(request)
+
+
+def test_list_reads_go_to_the_replica() -> None:
+    assert _read("list") == REPLICA
+    assert _read("list", user=_user(1)) == REPLICA
+
+
+def test_other_actions_and_plain_queries_read_from_the_primary() -> None:
+    assert _read("retrieve") == DEFAULT_DB_ALIAS
+    assert DivisionLov.objects.all().db == DEFAULT_DB_ALIAS
+
+
+def test_reads_stay_on_the_primary_without_a_replica_alias(settings) -> None:
+    del settings.DATABASES[REPLICA]
+
+    assert _read("list") == DEFAULT_DB_ALIAS
+
+
+@djangodb
+def test_a_write_makes_the_user_sticky_to_the_primary() -> None:
+    writer, reader = _user(1), _user(2)
+
+    assert _write(writer).status_code == 201
+
+    assert replica.is_sticky(writer.pk)
+    assert _read("list", user=writer) == DEFAULT_DB_ALIAS
+    assert _read("list", user=reader) == REPLICA
+
+
+def test_a_lagging_replica_falls_back_to_the_primary(local_cache) -> None:
+    # the lag measured by another worker, shared through the cache
+    local_cache.set(replica.LAG_CACHE_KEY, 31)
+
+    assert _read("list") == DEFAULT_DB_ALIAS
+
+
+def test_an_unreachable_replica_falls_back_to_the_primary(
+    settings, local_cache, monkeypatch
+) -> None:
+    settings.REPLICA_LAG_QUERY = "SELECT 0 FROM DUAL"
+
+    def unreachable():
+        raise OperationalError("ORA-12541: TNS:no listener")
+
+    monkeypatch.setattr(connections[REPLICA], "cursor", unreachable)
+
+    assert _read("list") == DEFAULT_DB_ALIAS
+    assert local_cache.get(replica.LAG_CACHE_KEY) == replica.UNREACHABLE
+
+
+def test_writes_always_go_to_the_primary() -> None:
+    router = ReplicaRouter()
+
+    with replica.track_writes():
+        with replica.read_from_replica() as on_replica:
+            assert on_replica
+            assert router.db_for_read(DivisionLov) == REPLICA
+            assert router.db_for_write(DivisionLov) == DEFAULT_DB_ALIAS
+        assert replica.has_written()
+
+
+def test_the_replica_is_never_migrated() -> None:
+    router = ReplicaRouter()
+
+    assert router.allow_migrate(REPLICA, "pms") is False
+    assert router.allow_migrate(DEFAULT_DB_ALIAS, "pms") is None
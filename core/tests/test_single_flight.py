@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+
+from core.services import single_flight
+
+pytestmark = pytest.mark.usefixtures("local_cache")
+
+
+def test_coalesce_runs_concurrent_identical_calls_once() -> None:
+    calls = []
+    started = threading.Event()
+
+    def slow_query():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"rows": 3}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        leader = executor.submit(single_flight.coalesce, "party:1", slow_query)
+        started.wait(1)
+        followers = [
+            executor.submit(single_flight.coalesce, "party:1", slow_query)
+            for _ in range(4)
+        ]
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert len(calls) == 1
+    assert results == [{"rows": 3}] * 5
+
+
+def test_coalesce_runs_different_keys_separately() -> None:
+    assert single_flight.coalesce("party:1", lambda: 1) == 1
+    assert single_flight.coalesce("party:2", lambda: 2) == 2
+
+
+def test_coalesce_shares_the_leader_error_within_the_process() -> None:
+    started = threading.Event()
+
+    def failing_query():
+        started.set()
+        time.sleep(0.2)
+        raise ValueError("EBS is down")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.coalesce, "party:1", failing_query)
+        started.wait(1)
+        follower = executor.submit(single_flight.coalesce, "party:1", failing_query)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_coalesce_reads_the_result_of_a_leader_in_another_worker() -> None:
+    # another worker holds the lock and already stored its result
+    cache.add(single_flight._lock_key("party:1"), "other-worker", 60)
+    cache.set(
+        single_flight._result_key("party:1", "other-worker"),
+        (single_flight._DONE, {"rows": 3}),
+        60,
+    )
+
+    def query():
+        raise AssertionError("the leader's result must be used")
+
+    assert single_flight.coalesce("party:1", query) == {"rows": 3}
+
+
+def test_coalesce_runs_the_call_when_the_cache_is_unreachable(monkeypatch) -> None:
+    def unreachable(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(single_flight.cache, "add", unreachable)
+
+    assert single_flight.coalesce("party:1", lambda: 42) == 42
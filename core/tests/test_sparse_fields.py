@@ -0,0 +1,190 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.generics import UpdateAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.mixins import MinimalUpdateMixin, SparseFieldsMixin
+from dropdown_repository.pms.models import DivisionLov
+from pms.serializers.party import PartySerializer
+
+djangodb = pytest.mark.django_db
+
+
+class DivisionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    district_names = serializers.SerializerMethodField()
+    computed = 0
+
+    expandable_fields = ("district_names", "extras")
+
+    class Meta:
+        model = DivisionLov
+        fields = (
+            "id",
+            "name",
+            "bn_name",
+            "is_active",
+            "district_names",
+            "updated_at",
+        )
+
+    def get_district_names(self, instance):
+        DivisionSerializer.computed += 1
+        return ["Gazipur"]
+
+    def to_representation(self, instance):
+        response = super().to_representation(instance)
+        if self.is_requested("extras"):
+            response["extras"] = {"population": 100}
+        return response
+
+
+@pytest.fixture
+def division():
+    DivisionSerializer.computed = 0
+    return DivisionLov(id=1, name="Dhaka", bn_name="ঢাকা", is_active=True)
+
+
+def _render(instance, query="", many=False, method="get"):
+    request = Request(getattr(APIRequestFactory(), method)(f"/divisions{query}"))
+    serializer = DivisionSerializer(
+        [instance] if many else instance, many=many, context={"request": request}
+    )
+    return serializer.data[0] if many else serializer.data
+
+
+def test_every_field_is_rendered_without_the_parameters(division) -> None:
+    data = _render(division)
+
+    assert set(data) == {
+        "id",
+        "name",
+        "bn_name",
+        "is_active",
+        "district_names",
+        "updated_at",
+        "extras",
+    }
+
+
+@pytest.mark.parametrize(
+    "query", ["?fields=name,bnName", "?fields=name,bn_name", "?fields=name, bnName,"]
+)
+def test_fields_renders_only_the_asked_ones_and_the_id(division, query) -> None:
+    data = _render(division, query)
+
+    assert set(data) == {"id", "name", "bn_name"}
+    # the expandable fields left out are never computed
+    assert DivisionSerializer.computed == 0
+
+
+def test_expand_adds_the_expandable_fields(division) -> None:
+    data = _render(division, "?fields=name&expand=districtNames,extras", many=True)
+
+    assert set(data) == {"id", "name", "district_names", "extras"}
+    assert DivisionSerializer.computed == 1
+
+
+@pytest.mark.parametrize("query", ["?expand=districtNames", "?expand=district_names"])
+def test_expand_alone_keeps_the_fields_that_are_not_expandable(
+    division, query
+) -> None:
+    data = _render(division, query)
+
+    assert set(data) == {
+        "id",
+        "name",
+        "bn_name",
+        "is_active",
+        "district_names",
+        "updated_at",
+    }
+
+
+def test_always_included_fields_are_rendered_whatever_is_asked(
+    division, monkeypatch
+) -> None:
+    monkeypatch.setattr(
+        DivisionSerializer, "always_included_fields", ("id", "updated_at")
+    )
+
+    data = _render(division, "?fields=isActive")
+
+    assert set(data) == {"id", "is_active", "updated_at"}
+
+
+def test_writes_ignore_the_parameters(division) -> None:
+    data = _render(division, "?fields=name", method="patch")
+
+    assert "district_names" in data
+    assert "extras" in data
+
+
+def test_nested_serializers_render_every_field(division) -> None:
+    class RegionSerializer(serializers.Serializer):
+        division = DivisionSerializer()
+
+    request = Request(APIRequestFactory().get("/regions?fields=division"))
+    data = RegionSerializer({"division": division}, context={"request": request}).data
+
+    assert "district_names" in data["division"]
+
+
+@pytest.mark.parametrize(
+    ["query", "prefetched"],
+    [
+        ("", ["dealing", "contacts", "attachments"]),
+        ("?fields=partyName", []),
+        ("?fields=party_name,contacts", ["contacts"]),
+        ("?expand=contacts", ["contacts"]),
+        ("?fields=partyName&expand=attachments", ["attachments"]),
+    ],
+)
+def test_is_requested_by_skips_the_party_prefetches(query, prefetched) -> None:
+    request = Request(APIRequestFactory().get(f"/parties{query}"))
+
+    assert [
+        lookup
+        for lookup in ("dealing", "contacts", "attachments")
+        if PartySerializer.is_requested_by(request, lookup)
+    ] == prefetched
+
+
+class DivisionUpdateView(MinimalUpdateMixin, UpdateAPIView):
+    authentication_classes = []
+    permission_classes = []
+    queryset = DivisionLov.objects.all()
+    serializer_class = DivisionSerializer
+
+
+def _patch(pk, **headers):
+    request = APIRequestFactory().patch(
+        f"/divisions/{pk}", {"name": "Khulna"}, format="json", **headers
+    )
+    return DivisionUpdateView.as_view()(request, pk=pk)
+
+
+@djangodb
+@pytest.mark.parametrize("prefer", ["return=minimal", "respond-async, return=minimal"])
+def test_prefer_return_minimal_sends_the_id_and_the_modification_time(
+    prefer,
+) -> None:
+    division = DivisionLov.objects.create(name="Dhaka")
+
+    response = _patch(division.pk, HTTP_PREFER=prefer)
+
+    division.refresh_from_db()
+    assert division.name == "Khulna"
+    assert response.data == {"id": division.pk, "updated_at": division.updated_at}
+    assert response["Preference-Applied"] == "return=minimal"
+
+
+@djangodb
+def test_an_update_without_the_preference_sends_the_row() -> None:
+    division = DivisionLov.objects.create(name="Dhaka")
+
+    response = _patch(division.pk, HTTP_PREFER="return=representation")
+
+    assert response.data["name"] == "Khulna"
+    assert response.data["district_names"] == ["Gazipur"]
+    assert not response.has_header("Preference-Applied")
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.renderer import CustomRenderer
+from core.services.streaming import (
+    NDJSON_CONTENT_TYPE,
+    get_stream_format,
+    streaming_response,
+)
+
+
+class RowsView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    renderer_classes = (CustomRenderer,)
+
+    def get(self, request):
+        rows = [{"party_name": "Walton"}, {"party_name": "Marcel"}]
+        if stream_format := get_stream_format(request):
+            return streaming_response([rows], stream_format)
+        return Response(rows)
+
+
+@pytest.fixture
+def rows_view():
+    return RowsView.as_view()
+
+
+def test_ndjson_accept_header_streams_the_rows(rows_view) -> None:
+    request = APIRequestFactory().get("/rows", HTTP_ACCEPT=NDJSON_CONTENT_TYPE)
+
+    response = rows_view(request)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == NDJSON_CONTENT_TYPE
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"partyName": "Walton"},
+        {"partyName": "Marcel"},
+    ]
+
+
+def test_stream_query_param_streams_the_envelope(rows_view) -> None:
+    response = rows_view(APIRequestFactory().get("/rows?stream=json"))
+
+    body = json.loads(b"".join(response.streaming_content))
+    assert body["data"] == [{"partyName": "Walton"}, {"partyName": "Marcel"}]
+
+
+def test_json_accept_header_gets_the_rendered_envelope(rows_view) -> None:
+    request = APIRequestFactory().get("/rows", HTTP_ACCEPT="application/json")
+
+    response = rows_view(request)
+
+    assert not response.streaming
+    assert response.data == [{"party_name": "Walton"}, {"party_name": "Marcel"}]
+
+
+def test_other_unacceptable_media_types_are_still_refused(rows_view) -> None:
+    request = APIRequestFactory().get("/rows", HTTP_ACCEPT="text/csv")
+
+    response = rows_view(request)
+
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
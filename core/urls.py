@@ -9,12 +9,17 @@ from drf_spectacular.views import (
 )
 from rest_framework.settings import api_settings
 
+from core.services.batch import BATCH_URL_NAME
+from core.views import BatchView
+
 api_v1 = "api/v1"
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     # oauth2 urls
     path("oauth2/", include("oauth2_provider.urls", namespace="oauth2_provider")),
+    # sub-requests batched in one call
+    path(f"{api_v1}/batch", BatchView.as_view(), name=BATCH_URL_NAME),
     # auth-users urls
     path(f"{api_v1}/auth/", include("auth_users.urls")),
     # Open API & Swagger UI
@@ -0,0 +1,65 @@
+from django.conf import settings
+from drf_spectacular.utils import extend_schema
+from oauth2_provider.contrib.rest_framework.authentication import OAuth2Authentication
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.openapi_metadata.metadata import OpenApiTags
+from core.renderer import CustomRenderer
+from core.services import batch
+
+__all__ = ["BatchView"]
+
+
+class BatchItemSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, help_text="echoed in the response")
+    url = serializers.CharField(help_text="path & query string, e.g. /api/v1/...")
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(
+        default=False, help_text="run the sub-requests at the same time"
+    )
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"At most {settings.BATCH_MAX_REQUESTS} requests can be batched."
+            )
+        return value
+
+
+@extend_schema(tags=[OpenApiTags.BATCH])
+class BatchView(APIView):
+    """
+    Run a list of ``GET`` sub-requests in one call, authenticated once. Every
+    sub-response is returned in the usual envelope, in the order of the requests.
+    """
+
+    authentication_classes = [OAuth2Authentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = (CustomRenderer,)
+
+    @extend_schema(request=BatchSerializer)
+    def post(self, request: Request) -> Response:
+        serialized = BatchSerializer(data=request.data)
+        serialized.is_valid(raise_exception=True)
+        items = serialized.validated_data["requests"]
+
+        responses = batch.run_batch(
+            request,
+            [item["url"] for item in items],
+            serialized.validated_data["parallel"],
+        )
+        return Response(
+            {
+                "responses": [
+                    {"id": item.get("id", str(index)), **response}
+                    for index, (item, response) in enumerate(zip(items, responses))
+                ]
+            }
+        )
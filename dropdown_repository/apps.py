@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DropdownRepositoryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dropdown_repository"
+
+    def ready(self) -> None:
+        import dropdown_repository.signals  # noqa: F401
@@ -11,6 +11,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from core.mixins import CachedListMixin, ReplicaReadMixin
 from core.openapi_metadata.metadata import OpenApiTags
 from core.renderer import CustomRenderer
 
@@ -27,7 +28,7 @@ __all__ = [
 
 
 @extend_schema(tags=[OpenApiTags.DROPDOWN_REPO_PMS, OpenApiTags.DROPDOWN_REPO_PMS_BANK])
-class BankIssuerView(ModelViewSet):
+class BankIssuerView(ReplicaReadMixin, CachedListMixin, ModelViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = BankIssuerLov.objects.filter(is_active=True).order_by("-created_at")
@@ -45,7 +46,7 @@ class BankIssuerView(ModelViewSet):
 
 
 @extend_schema(tags=[OpenApiTags.DROPDOWN_REPO_PMS, OpenApiTags.DROPDOWN_REPO_PMS_BANK])
-class BranchIssuerView(ModelViewSet):
+class BranchIssuerView(ReplicaReadMixin, CachedListMixin, ModelViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = BranchIssuerBankLov.objects.filter(is_active=True).order_by(
@@ -6,6 +6,7 @@ from oauth2_provider.contrib.rest_framework.permissions import (
 from rest_framework.permissions import IsAdminUser
 from rest_framework.viewsets import ModelViewSet
 
+from core.mixins import CachedListMixin, ReplicaReadMixin
 from core.openapi_metadata.metadata import OpenApiTags
 from core.renderer import CustomRenderer
 
@@ -18,7 +19,7 @@ __all__ = [
 
 
 @extend_schema(tags=[OpenApiTags.DROPDOWN_REPO_PMS])
-class DistrictViewSet(ModelViewSet):
+class DistrictViewSet(ReplicaReadMixin, CachedListMixin, ModelViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = DistrictLov.objects.filter(is_active=True).order_by("-created_at")
@@ -11,6 +11,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from core.mixins import CachedListMixin, ReplicaReadMixin
 from core.openapi_metadata.metadata import OpenApiTags
 from core.renderer import CustomRenderer
 from dropdown_repository.pms.serializers.district import DistrictSerializer
@@ -24,7 +25,7 @@ __all__ = [
 
 
 @extend_schema(tags=[OpenApiTags.DROPDOWN_REPO_PMS])
-class DivisionViewSet(ModelViewSet):
+class DivisionViewSet(ReplicaReadMixin, CachedListMixin, ModelViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = DivisionLov.objects.filter(is_active=True).order_by("-created_at")
@@ -6,6 +6,7 @@ from oauth2_provider.contrib.rest_framework.permissions import (
 from rest_framework.permissions import IsAdminUser
 from rest_framework.viewsets import ModelViewSet
 
+from core.mixins import CachedListMixin, ReplicaReadMixin
 from core.openapi_metadata.metadata import OpenApiTags
 from core.renderer import CustomRenderer
 
@@ -19,7 +20,7 @@ __all__ = [
 
 
 @extend_schema(tags=[OpenApiTags.DROPDOWN_REPO_PMS])
-class PartyCategoryView(ModelViewSet):
+class PartyCategoryView(ReplicaReadMixin, CachedListMixin, ModelViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = PartyCategoryLov.objects.filter(is_active=True).order_by("-created_at")
@@ -37,11 +38,12 @@ class PartyCategoryView(ModelViewSet):
 
 
 @extend_schema(tags=[OpenApiTags.DROPDOWN_REPO_PMS])
-class BusinessTypeView(ModelViewSet):
+class BusinessTypeView(ReplicaReadMixin, CachedListMixin, ModelViewSet):
     authentication_classes = [OAuth2Authentication]
     permission_classes = [IsAuthenticatedOrTokenHasScope]
     queryset = BusinessTypeLov.objects.filter(is_active=True).order_by("-created_at")
     serializer_class = BusinessTypeSerializer
+    cache_tag_models = (PartyCategoryLov,)
     required_scopes = ["read"]
     renderer_classes = (CustomRenderer,)
 
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.services.cache import invalidate_tags, model_tag
+
+from .pms.models import repository as lov_models
+
+
+def invalidate_lov_cache(sender, **kwargs):
+    invalidate_tags(model_tag(sender))
+
+
+for _lov_model_name in lov_models.__all__:
+    _lov_model = getattr(lov_models, _lov_model_name)
+    post_save.connect(invalidate_lov_cache, sender=_lov_model)
+    post_delete.connect(invalidate_lov_cache, sender=_lov_model)
@@ -0,0 +1,22 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from auth_users.models import Role, User
+from core.services.cache import invalidate_tags, model_tag
+
+from .models import Menu
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_menu_cache(sender, **kwargs):
+    invalidate_tags(model_tag(Menu))
+
+
+@receiver(m2m_changed, sender=Menu.roles.through)
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_menu_cache_on_roles_change(sender, action: str, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_tags(model_tag(Menu))
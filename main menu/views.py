@@ -1,7 +1,3 @@
-from django.conf import settings
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_headers
 from drf_spectacular.utils import extend_schema
 from oauth2_provider.contrib.rest_framework import OAuth2Authentication
 from rest_framework.permissions import IsAuthenticated
@@ -12,11 +8,13 @@ from rest_framework.viewsets import ViewSet
 from auth_users.models import User
 from core.openapi_metadata.metadata import OpenApiTags
 from core.renderer import CustomRenderer
+from core.services.cache import cache_response, model_tag
+from core.services.etags import conditional_response
 
 from .models import Menu
 from .serializers import MenuSerializer
 
-CACHING_TIME = 30  # 30 Seconds
+CACHING_TIME = 60 * 60  # 1 Hour, invalidated on menu & role writes
 
 
 @extend_schema(tags=[OpenApiTags.MENU_ROUTES])
@@ -44,8 +42,8 @@ class MenuViewSet(ViewSet):
             parent_menu__isnull=True, is_active=True, roles__in=current_user.roles.all()
         )
 
-    @method_decorator(cache_page(CACHING_TIME))
-    @method_decorator(vary_on_headers(settings.HEADER_AUTH_KEY))
+    @conditional_response(tags=[model_tag(Menu)], vary_on_user=True)
+    @cache_response(CACHING_TIME, tags=[model_tag(Menu)], vary_on_user=True)
     def list(self, request: Request):
         current_user: User = request.user
         serialized = self.serializer_class(